@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+"""
+Local stand-ins for the upstream APIs the pull adapters call:
+
+    Play Store  GET /v1/applications/{app_id}/reviews
+    Twitter     GET /2/tweets/search/recent
+    Discourse   GET /search.json
+    Intercom    GET /conversations
+
+Every source gets `--pages` full pages per fetch window, each after
+`--latency-ms` (± jitter). `--error-429` / `--error-5xx` inject failures at the
+given rates; `--payload-bytes` pads each record body. Record ids derive from
+the source, the window start and the position, so a window fetched twice
+yields the same ids (exercising dedup) and a new window yields new ones.
+
+The harness (benchmarks/pipeline.py) starts this as a subprocess; it can also
+be run on its own: python benchmarks/fake_upstreams.py --port 8900
+"""
+import argparse
+import asyncio
+import hashlib
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+# Each request carries the host the adapter meant to reach
+UPSTREAM_HOST_HEADER = "x-upstream-host"
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--pages", type=int, default=3, help="pages per fetch window")
+    parser.add_argument("--discourse-page-size", type=int, default=50)
+    parser.add_argument("--error-429", type=float, default=0.0, help="429 rate, 0-1")
+    parser.add_argument("--error-5xx", type=float, default=0.0, help="503 rate, 0-1")
+    parser.add_argument("--retry-after", type=float, default=0.0)
+    parser.add_argument("--payload-bytes", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+def build_app(args: argparse.Namespace) -> Starlette:
+    rng = random.Random(args.seed)
+    padding = "x" * args.payload_bytes
+
+    def record_id(request: Request, scope: str, page: int, index: int) -> str:
+        host = request.headers.get(UPSTREAM_HOST_HEADER, "")
+        key = f"{host}{request.url.path}|{scope}|{page}|{index}"
+        return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+
+    def window(request: Request, start_key: str):
+        now = datetime.now(timezone.utc)
+        try:
+            since = datetime.fromisoformat(
+                request.query_params[start_key].removesuffix("Z").replace(" ", "+")
+            )
+        except (KeyError, ValueError):
+            since = now - timedelta(seconds=60)
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return since, now
+
+    async def respond(
+        request: Request, cursor_key: str, build: Callable[[int], JSONResponse]
+    ) -> JSONResponse:
+        latency = args.latency_ms + rng.uniform(-args.jitter_ms, args.jitter_ms)
+        await asyncio.sleep(max(latency, 0) / 1000)
+        roll = rng.random()
+        if roll < args.error_429:
+            return JSONResponse(
+                {"error": "rate limited"},
+                status_code=429,
+                headers={"Retry-After": str(args.retry_after)},
+            )
+        if roll < args.error_429 + args.error_5xx:
+            return JSONResponse({"error": "unavailable"}, status_code=503)
+        page = int(request.query_params.get(cursor_key, "1") or 1)
+        return build(page)
+
+    def timestamps(since: datetime, until: datetime, count: int) -> List[datetime]:
+        span = max((until - since).total_seconds(), 1.0)
+        step = span / (count + 1)
+        return [since + timedelta(seconds=step * (i + 1)) for i in range(count)]
+
+    def next_cursor(page: int):
+        return str(page + 1) if page < args.pages else None
+
+    async def playstore(request: Request) -> JSONResponse:
+        size = int(request.query_params.get("pageSize", 30))
+        since, until = window(request, "startTime")
+        scope = request.query_params.get("startTime", "")
+
+        def build(page: int) -> JSONResponse:
+            times = timestamps(since, until, size)
+            reviews = [
+                {
+                    "reviewId": record_id(request, scope, page, i),
+                    "createTime": times[i].isoformat(),
+                    "comment": f"review {page}-{i} {padding}",
+                    "languageCode": "en",
+                    "starRating": i % 5 + 1,
+                }
+                for i in range(size)
+            ]
+            body: Dict = {"reviews": reviews}
+            if next_cursor(page):
+                body["nextPageToken"] = next_cursor(page)
+            return JSONResponse(body)
+
+        return await respond(request, "pageToken", build)
+
+    async def twitter(request: Request) -> JSONResponse:
+        size = int(request.query_params.get("max_results", 30))
+        since, until = window(request, "start_time")
+        scope = request.query_params.get("start_time", "")
+
+        def build(page: int) -> JSONResponse:
+            times = timestamps(since, until, size)
+            tweets = [
+                {
+                    "id": record_id(request, scope, page, i),
+                    "text": f"tweet {page}-{i} {padding}",
+                    "created_at": times[i].astimezone(timezone.utc)
+                    .replace(tzinfo=None)
+                    .isoformat()
+                    + "Z",
+                    "lang": "en",
+                }
+                for i in range(size)
+            ]
+            meta: Dict = {"result_count": size}
+            if next_cursor(page):
+                meta["next_token"] = next_cursor(page)
+            return JSONResponse({"data": tweets, "meta": meta})
+
+        return await respond(request, "next_token", build)
+
+    async def discourse(request: Request) -> JSONResponse:
+        size = args.discourse_page_size
+        now = datetime.now(timezone.utc)
+        # Discourse search has no time window; bucket ids by the minute
+        scope = now.strftime("%Y%m%d%H%M")
+
+        def build(page: int) -> JSONResponse:
+            times = timestamps(now - timedelta(seconds=60), now, size)
+            topics = [
+                {
+                    "id": record_id(request, scope, page, i),
+                    "title": f"topic {page}-{i} {padding}",
+                    "created_at": times[i].timestamp(),
+                    "posts_count": i,
+                }
+                for i in range(size)
+            ]
+            return JSONResponse(
+                {
+                    "topics": topics,
+                    "grouped_search_result": {
+                        "more_full_page_results": page < args.pages
+                    },
+                }
+            )
+
+        return await respond(request, "page", build)
+
+    async def intercom(request: Request) -> JSONResponse:
+        size = int(request.query_params.get("per_page", 30))
+        scope = request.query_params.get("updated_since", "")
+        try:
+            since = datetime.fromtimestamp(int(scope), timezone.utc)
+        except ValueError:
+            since = datetime.now(timezone.utc) - timedelta(seconds=60)
+        until = datetime.now(timezone.utc)
+
+        def build(page: int) -> JSONResponse:
+            times = timestamps(since, until, size)
+            conversations = [
+                {
+                    "id": record_id(request, scope, page, i),
+                    "created_at": int(times[i].timestamp()),
+                    "conversation_message": {"body": f"conv {page}-{i} {padding}"},
+                    "language": "en",
+                }
+                for i in range(size)
+            ]
+            body: Dict = {"conversations": conversations, "pages": {}}
+            if next_cursor(page):
+                body["pages"]["next"] = {"starting_after": next_cursor(page)}
+            return JSONResponse(body)
+
+        return await respond(request, "starting_after", build)
+
+    return Starlette(
+        routes=[
+            Route("/v1/applications/{app_id:path}/reviews", playstore),
+            Route("/2/tweets/search/recent", twitter),
+            Route("/search.json", discourse),
+            Route("/conversations", intercom),
+        ]
+    )
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    uvicorn.run(
+        build_app(args),
+        host="127.0.0.1",
+        port=args.port,
+        log_level="warning",
+        access_log=False,
+        backlog=4096,
+        # outlive the adapters' idle keep-alive so pooled connections aren't cut
+        timeout_keep_alive=120,
+    )
@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+"""
+Language detection throughput against ingest throughput.
+
+Builds --records Twitter-like records without lang from a mix of short
+review sentences in several languages, then times
+  * ingest_many() into the database in DATABASE_URL with detection off,
+  * LanguageDetector.fill_missing() alone, in INGEST_BATCH_SIZE chunks as
+    ingest calls it, for each --workers count,
+  * ingest_many() with detection on (LANG_DETECT_WORKERS),
+and reports records/sec for each. Detection keeps up while its rate stays
+well above the ingest rate.
+
+    DATABASE_URL=postgresql+asyncpg://postgres@localhost:5433/benchdb \\
+    LANG_DETECT_MODEL=models/lid.176.ftz \\
+    PYTHONPATH=src python benchmarks/lang_detect.py --records 20000 --workers 1 2 4
+
+Needs the "lang" extra and LANG_DETECT_MODEL. The feedback table is
+TRUNCATED first: point DATABASE_URL at a scratch database.
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+import uuid
+from datetime import timedelta
+from typing import List
+
+from sqlalchemy import text
+
+import services.ingest as ingest
+from config.settings import settings
+from core.models import Feedback
+from db.session import AsyncSessionLocal, engine
+from services.lang_detect import LanguageDetector, model_available
+from utils.time_utils import utc_now
+
+# two review sentences per language; each body pairs both in random order
+SENTENCES = [
+    (
+        "The app keeps crashing every time I open the settings page.",
+        "Great update, the new dark mode looks fantastic on my phone.",
+    ),
+    (
+        "Die App stürzt seit dem letzten Update ständig ab.",
+        "Leider kann ich mich nicht mehr anmelden, bitte schnell beheben.",
+    ),
+    (
+        "La aplicación es muy lenta desde la última actualización.",
+        "No puedo cambiar mi contraseña, el botón no responde.",
+    ),
+    (
+        "L'application plante dès que j'ouvre mes messages.",
+        "Très bonne application, mais trop de publicités.",
+    ),
+    (
+        "O aplicativo não carrega as fotos desde ontem.",
+        "Não consigo entrar na minha conta depois da atualização.",
+    ),
+    (
+        "Приложение постоянно зависает при загрузке.",
+        "После обновления не приходят уведомления.",
+    ),
+]
+
+
+def make_records(count: int, tag: str) -> List[Feedback]:
+    rng = random.Random(7)
+    base = utc_now() - timedelta(days=1)
+    return [
+        Feedback.trusted(
+            id=uuid.uuid4(),
+            external_id=f"lang-{tag}-{i}",
+            source_type="twitter",
+            source_instance="search",
+            tenant_id="bench-lang",
+            created_at=base + timedelta(milliseconds=i),
+            fetched_at=base,
+            lang=None,
+            body=" ".join(rng.sample(rng.choice(SENTENCES), 2)),
+            metadata_={},
+        )
+        for i in range(count)
+    ]
+
+
+async def truncate() -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(text("TRUNCATE feedback, feedback_rollups"))
+        await session.commit()
+
+
+async def ingest_rate(records: List[Feedback], detector: LanguageDetector) -> float:
+    await truncate()
+    ingest.lang_detector = detector
+    started = time.perf_counter()
+    await ingest.ingest_many(records, remember=False)
+    return len(records) / (time.perf_counter() - started)
+
+
+async def detect_rate(records: List[Feedback], detector: LanguageDetector) -> float:
+    await detector.fill_missing(records[:50])  # start the worker processes
+    size = settings.INGEST_BATCH_SIZE
+    started = time.perf_counter()
+    for i in range(0, len(records), size):
+        await detector.fill_missing(records[i : i + size])
+    return len(records) / (time.perf_counter() - started)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+    if not model_available():
+        sys.exit("Needs fasttext-predict (the lang extra) and LANG_DETECT_MODEL")
+
+    try:
+        plain = await ingest_rate(make_records(args.records, "plain"), LanguageDetector(0))
+        print(f"ingest, detection off        {plain:9.0f} records/s")
+        for workers in args.workers:
+            detector = LanguageDetector(workers)
+            try:
+                rate = await detect_rate(make_records(args.records, "d"), detector)
+            finally:
+                detector.shutdown()
+            print(f"detection, {workers:2d} workers        {rate:9.0f} records/s")
+        detector = LanguageDetector()
+        try:
+            rate = await ingest_rate(make_records(args.records, "on"), detector)
+        finally:
+            detector.shutdown()
+        print(f"ingest, {detector.workers:2d} detect workers  {rate:9.0f} records/s")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
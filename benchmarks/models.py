@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark of the Feedback construction and conversion paths.
+
+Times building a record the way adapters do (validated, construct(),
+trusted()), turning it into an INSERT row (dict() vs to_row()) and building
+it back from a feedback table row (from_orm() vs from_row()). No database
+or network is involved.
+
+    PYTHONPATH=src python benchmarks/models.py -n 20000
+"""
+import argparse
+import timeit
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy.engine import Row
+from sqlalchemy.engine.result import result_tuple
+
+from core.models import FEEDBACK_FIELDS, Feedback
+
+
+def sample_values() -> Dict[str, Any]:
+    now = datetime.now(timezone.utc)
+    return {
+        "id": uuid.uuid4(),
+        "external_id": "1234567890",
+        "source_type": "twitter",
+        "source_instance": "search",
+        "tenant_id": "tenant1",
+        "created_at": now,
+        "fetched_at": now,
+        "lang": "en",
+        "body": "The new release fixed my sync problem, thanks!",
+        "metadata_": {"author_id": "42", "retweets": 3, "likes": 17},
+    }
+
+
+def sample_row(values: Dict[str, Any]) -> Row:
+    # the Row type FeedbackORM.__table__.select() returns
+    return result_tuple(FEEDBACK_FIELDS)([values[f] for f in FEEDBACK_FIELDS])
+
+
+def cases() -> List[Tuple[str, Callable[[], Any]]]:
+    values = sample_values()
+    fb = Feedback(**values)
+    row = sample_row(values)
+    return [
+        ("Feedback(**values)", lambda: Feedback(**values)),
+        ("Feedback.construct(**values)", lambda: Feedback.construct(**values)),
+        ("Feedback.trusted(**values)", lambda: Feedback.trusted(**values)),
+        ("feedback.dict()", fb.dict),
+        ("feedback.to_row()", fb.to_row),
+        ("Feedback.from_orm(row)", lambda: Feedback.from_orm(row)),
+        ("Feedback.from_row(row)", lambda: Feedback.from_row(row)),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", type=int, default=20_000, help="calls per case")
+    parser.add_argument("--repeat", type=int, default=5, help="best of N runs")
+    args = parser.parse_args()
+
+    for name, fn in cases():
+        best = min(timeit.repeat(fn, number=args.n, repeat=args.repeat))
+        print(f"{name:<30} {best / args.n * 1e6:8.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+#!/usr/bin/env python
+"""
+End-to-end pull pipeline benchmark.
+
+Starts benchmarks/fake_upstreams.py on a local port, points every adapter's
+shared HTTP client at it, configures N tenants (one source per platform
+each) and runs dispatch_all() for a few cycles against the database in
+DATABASE_URL. Reports records/sec, p50/p99 cycle time and DB round trips
+per record for each tenant count, and appends the numbers to
+benchmarks/results/pipeline.jsonl keyed by git commit, so a run can be
+compared with the last run of another commit using the same parameters.
+
+    DATABASE_URL=postgresql+asyncpg://postgres@localhost:5433/benchdb \\
+    PYTHONPATH=src python benchmarks/pipeline.py --tenants 10 100 1000
+
+The feedback and source_checkpoints tables are TRUNCATED before each tenant
+count: point DATABASE_URL at a scratch database.
+"""
+import argparse
+import asyncio
+import cProfile
+import json
+import logging
+import math
+import pstats
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+from pydantic import SecretStr
+from sqlalchemy import event, text
+
+import adapters.pagination as pagination
+import adapters.rate_limit as rate_limit
+from adapters.http_pool import http_clients
+from config.settings import settings
+from db.models import Base
+from db.partitions import ensure_partitions
+from db.session import engine
+from services.seen import seen_keys
+from workers.scheduler import dispatch_all
+
+BENCH_DIR = Path(__file__).resolve().parent
+RESULTS_FILE = BENCH_DIR / "results" / "pipeline.jsonl"
+UPSTREAM_HOST_HEADER = "x-upstream-host"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="End-to-end pull pipeline benchmark")
+    parser.add_argument("--tenants", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--cycles", type=int, default=5)
+    parser.add_argument("--warmup-cycles", type=int, default=1)
+    parser.add_argument("--port", type=int, default=0, help="0 picks a free port")
+    parser.add_argument("--rps", type=float, default=1000.0, help="per-credential pace")
+    parser.add_argument("--results", type=Path, default=RESULTS_FILE)
+    parser.add_argument("--no-save", action="store_true")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="cProfile the measured cycles; prints the top functions and saves a .prof",
+    )
+    # forwarded to fake_upstreams.py
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--error-429", type=float, default=0.0)
+    parser.add_argument("--error-5xx", type=float, default=0.0)
+    parser.add_argument("--payload-bytes", type=int, default=200)
+    return parser.parse_args()
+
+
+UPSTREAM_ARGS = (
+    "latency_ms",
+    "jitter_ms",
+    "pages",
+    "error_429",
+    "error_5xx",
+    "payload_bytes",
+)
+
+
+# ── Fake upstream process & HTTP redirection ───────────────────────────
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_upstreams(args: argparse.Namespace, port: int) -> subprocess.Popen:
+    cmd = [sys.executable, str(BENCH_DIR / "fake_upstreams.py"), "--port", str(port)]
+    for name in UPSTREAM_ARGS:
+        cmd += [f"--{name.replace('_', '-')}", str(getattr(args, name))]
+    proc = subprocess.Popen(cmd)
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError("fake upstreams did not start")
+
+
+class RedirectTransport(httpx.AsyncBaseTransport):
+    """Sends every request to the local fake server, tagged with its real host."""
+
+    def __init__(self, port: int, **kwargs: Any):
+        self._inner = httpx.AsyncHTTPTransport(**kwargs)
+        self._port = port
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        request.headers[UPSTREAM_HOST_HEADER] = request.url.host
+        request.url = request.url.copy_with(
+            scheme="http", host="127.0.0.1", port=self._port
+        )
+        return await self._inner.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+def redirect_http_clients(port: int) -> None:
+    def build(origin: str) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SEC,
+        )
+        return httpx.AsyncClient(
+            base_url=origin,
+            timeout=settings.HTTP_TIMEOUT_SEC,
+            transport=RedirectTransport(port, limits=limits),
+        )
+
+    http_clients._build = build  # type: ignore[method-assign]
+
+
+# ── Tenant configuration ──────────────────────────────────────────────
+def configure_tenants(count: int, rps: float) -> None:
+    tenants = [f"bench{i:04d}" for i in range(count)]
+    settings.TENANTS = tenants
+    settings.PLATFORM_CONFIG = {
+        "playstore": {
+            "apps": {t: [f"com.bench.{t}"] for t in tenants},
+            "api_keys": {t: f"key-{t}" for t in tenants},
+        },
+        "twitter": {
+            "queries": {t: f"#{t}" for t in tenants},
+            "tokens": {t: SecretStr(f"token-{t}") for t in tenants},
+        },
+        "discourse": {
+            "base_urls": {t: f"https://{t}.discourse.bench" for t in tenants},
+        },
+        "intercom": {
+            "secrets": {t: SecretStr(f"secret-{t}") for t in tenants},
+        },
+    }
+    settings.RATE_LIMIT_RPS = {p: rps for p in settings.RATE_LIMIT_RPS}
+    # fresh pacing and page-size state for every tenant count
+    rate_limit.rate_limiter._buckets.clear()
+    pagination._page_sizers.clear()
+    seen_keys.clear()
+
+
+# ── Database ──────────────────────────────────────────────────────────
+class RoundTripCounter:
+    """Counts statements plus BEGIN/COMMIT/ROLLBACK sent through the shared engine."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        for name in ("before_cursor_execute", "begin", "commit", "rollback"):
+            event.listen(engine.sync_engine, name, self._on_round_trip)
+
+    def _on_round_trip(self, *args: Any) -> None:
+        self.count += 1
+
+
+async def reset_database() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await ensure_partitions(conn)
+        await conn.execute(text("TRUNCATE feedback, source_checkpoints"))
+
+
+# ── Measurement ───────────────────────────────────────────────────────
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+async def run_scale(
+    args: argparse.Namespace, tenants: int, trips: RoundTripCounter, commit: str
+) -> Dict:
+    configure_tenants(tenants, args.rps)
+    await reset_database()
+
+    for _ in range(args.warmup_cycles):
+        await dispatch_all()
+
+    durations: List[float] = []
+    records = inserted = failed_sources = timed_out = 0
+    trips.count = 0
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler:
+        profiler.enable()
+    for _ in range(args.cycles):
+        report = await dispatch_all()
+        durations.append(report.duration_sec)
+        for result in report.results.values():
+            records += result.inserted + result.duplicates + result.failed
+            inserted += result.inserted
+        failed_sources += len(report.failed)
+        timed_out += len(report.timed_out)
+    if profiler:
+        profiler.disable()
+        path = args.results.parent / f"pipeline-{commit}-{tenants}.prof"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(path)
+        pstats.Stats(profiler).sort_stats("tottime").print_stats(15)
+        print(f"profile saved to {path}")
+
+    total = sum(durations)
+    return {
+        "tenants": tenants,
+        "sources": tenants * 4,
+        "cycles": args.cycles,
+        "records": records,
+        "inserted": inserted,
+        "records_per_sec": round(records / total, 1) if total else 0.0,
+        "p50_cycle_sec": round(percentile(durations, 50), 3),
+        "p99_cycle_sec": round(percentile(durations, 99), 3),
+        "db_round_trips": trips.count,
+        "db_round_trips_per_record": (
+            round(trips.count / records, 4) if records else None
+        ),
+        "failed_sources": failed_sources,
+        "timed_out_sources": timed_out,
+    }
+
+
+# ── Results ───────────────────────────────────────────────────────────
+def git_revision() -> Dict[str, Any]:
+    def git(*cmd: str) -> str:
+        return subprocess.run(
+            ["git", *cmd], cwd=BENCH_DIR, capture_output=True, text=True
+        ).stdout.strip()
+
+    return {
+        "commit": git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+    }
+
+
+def previous_result(
+    path: Path, params: Dict, tenants: int, commit: str
+) -> Optional[Dict]:
+    if not path.exists():
+        return None
+    match = None
+    for line in path.read_text().splitlines():
+        entry = json.loads(line)
+        if (
+            entry["params"] == params
+            and entry["result"]["tenants"] == tenants
+            and entry["commit"] != commit
+        ):
+            match = entry
+    return match
+
+
+def print_result(result: Dict, previous: Optional[Dict]) -> None:
+    line = (
+        f"{result['tenants']:>5} tenants: {result['records_per_sec']:>9.1f} rec/s  "
+        f"p50 {result['p50_cycle_sec']:.3f}s  p99 {result['p99_cycle_sec']:.3f}s  "
+        f"{result['db_round_trips_per_record']} DB trips/rec  "
+        f"({result['failed_sources']} failed, {result['timed_out_sources']} timed out)"
+    )
+    print(line)
+    if previous:
+        before = previous["result"]
+        change = (
+            (result["records_per_sec"] - before["records_per_sec"])
+            / before["records_per_sec"]
+            * 100
+            if before["records_per_sec"]
+            else 0.0
+        )
+        print(
+            f"        vs {previous['commit']}: {before['records_per_sec']:.1f} rec/s "
+            f"({change:+.1f}%), p99 {before['p99_cycle_sec']:.3f}s, "
+            f"{before['db_round_trips_per_record']} DB trips/rec"
+        )
+
+
+async def main(args: argparse.Namespace) -> None:
+    logging.basicConfig(level=logging.WARNING)
+    port = args.port or free_port()
+    proc = start_upstreams(args, port)
+    redirect_http_clients(port)
+    trips = RoundTripCounter()
+    params = {name: getattr(args, name) for name in (*UPSTREAM_ARGS, "cycles", "rps")}
+    revision = git_revision()
+    try:
+        for tenants in args.tenants:
+            result = await run_scale(args, tenants, trips, revision["commit"])
+            previous = previous_result(
+                args.results, params, tenants, revision["commit"]
+            )
+            print_result(result, previous)
+            if not args.no_save:
+                args.results.parent.mkdir(parents=True, exist_ok=True)
+                with args.results.open("a") as f:
+                    entry = {
+                        **revision,
+                        "recorded_at": datetime.now(timezone.utc).isoformat(),
+                        "params": params,
+                        "result": result,
+                    }
+                    f.write(json.dumps(entry) + "\n")
+    finally:
+        await http_clients.aclose()
+        await engine.dispose()
+        proc.terminate()
+        proc.wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""
+/feedback read latency, default response model vs API_FAST_JSON, and
+served from the read cache.
+
+Seeds one tenant with --rows records whose metadata_ holds --meta-keys keys
+into the database in DATABASE_URL, then requests /feedback?limit=N in
+process (httpx ASGI transport, no network) with each serialisation path and
+reports p50/p99 latency and response size. The serialisation paths run
+with the read cache disabled.
+
+    DATABASE_URL=postgresql+asyncpg://postgres@localhost:5433/benchdb \\
+    PYTHONPATH=src python benchmarks/read_api.py --limit 1000 --requests 20
+
+The feedback table is TRUNCATED first: point DATABASE_URL at a scratch
+database.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import timedelta
+from typing import Dict, List
+
+import httpx
+from sqlalchemy import text
+
+from app.main import app
+from config.settings import settings
+from core.models import Feedback
+from db.session import AsyncSessionLocal
+from services.ingest import ingest_many
+from services.read_cache import read_cache
+from utils.time_utils import utc_now
+
+TENANT = "bench-read"
+
+
+def make_records(rows: int, meta_keys: int) -> List[Feedback]:
+    base = utc_now() - timedelta(days=1)
+    return [
+        Feedback.trusted(
+            id=uuid.uuid4(),
+            external_id=f"read-{i}",
+            source_type="twitter",
+            source_instance="search",
+            tenant_id=TENANT,
+            created_at=base + timedelta(seconds=i),
+            fetched_at=base,
+            lang="en",
+            body=f"review {i}: " + "lorem ipsum " * 20,
+            metadata_={
+                f"field_{k}": {"value": f"{i}-{k}", "score": k / 7, "tags": ["a", k]}
+                for k in range(meta_keys)
+            },
+        )
+        for i in range(rows)
+    ]
+
+
+async def seed(rows: int, meta_keys: int) -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(text("TRUNCATE feedback"))
+        await session.commit()
+    await ingest_many(make_records(rows, meta_keys))
+
+
+async def measure(limit: int, requests: int) -> Dict[str, float]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        params = {"tenant_id": TENANT, "limit": limit}
+        await c.get("/feedback", params=params)  # warm the pool and caches
+        timings = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            resp = await c.get("/feedback", params=params)
+            timings.append(time.perf_counter() - started)
+            resp.raise_for_status()
+    timings.sort()
+    return {
+        "p50_ms": statistics.median(timings) * 1000,
+        "p99_ms": timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1000,
+        "kb": len(resp.content) / 1024,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--meta-keys", type=int, default=40)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    await seed(args.rows, args.meta_keys)
+    cache_bytes = read_cache.max_bytes
+    for name, fast, cached in (
+        ("response_model", False, False),
+        ("API_FAST_JSON", True, False),
+        ("read cache hit", False, True),
+    ):
+        settings.API_FAST_JSON = fast
+        read_cache.max_bytes = cache_bytes if cached else 0
+        r = await measure(args.limit, args.requests)
+        print(
+            f"{name:<15} p50 {r['p50_ms']:7.1f} ms  p99 {r['p99_ms']:7.1f} ms"
+            f"  {r['kb']:8.0f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
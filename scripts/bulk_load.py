@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+"""
+Bulk-load an NDJSON or CSV dump (optionally .gz) into feedback via COPY.
+
+    PYTHONPATH=src python scripts/bulk_load.py dump.ndjson.gz --parallelism 4
+
+Input uses the /feedback/export layout; rows already present are counted as
+duplicates, so a load can be re-run after a failure.
+"""
+import argparse
+import asyncio
+import logging
+from datetime import datetime
+from pathlib import Path
+
+from db.partitions import ensure_partitions
+from db.session import engine
+from services.bulk_load import bulk_load, iter_records
+
+
+async def main(args: argparse.Namespace) -> None:
+    if args.partitions_from:
+        # older history would otherwise all land in feedback_default
+        start = datetime.strptime(args.partitions_from, "%Y-%m")
+        async with engine.begin() as conn:
+            created = await ensure_partitions(conn, start=start.date())
+        print(f"✅ Partitions created: {created or 'none'}")
+
+    try:
+        result = await bulk_load(
+            iter_records(args.path, args.format),
+            parallelism=args.parallelism,
+            chunk_rows=args.chunk_rows,
+        )
+    finally:
+        await engine.dispose()
+    print(
+        f"✅ {result.rows} rows in {result.chunks} chunks: {result.inserted} inserted, "
+        f"{result.duplicates} duplicates ({result.rows_per_sec:.0f} rows/s)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="COPY-based bulk loader")
+    parser.add_argument("path", type=Path, help=".ndjson/.jsonl/.csv, optionally .gz")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default=None)
+    parser.add_argument("--parallelism", type=int, default=4)
+    parser.add_argument(
+        "--chunk-rows", type=int, default=None, help="default BULK_LOAD_CHUNK_ROWS"
+    )
+    parser.add_argument(
+        "--partitions-from",
+        metavar="YYYY-MM",
+        help="first create monthly partitions from this month onwards",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    asyncio.run(main(args))
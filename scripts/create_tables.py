@@ -1,18 +1,50 @@
 #!/usr/bin/env python
+import argparse
 import asyncio
 
 from db.models import Base
+from db.partitions import ensure_partitions, maintain_partitions
+from db.search import ensure_search_index
 from db.session import engine
 
 
-async def main() -> None:
+async def main(maintain: bool, search_index: bool) -> None:
+    if maintain:
+        # Pre-create upcoming monthly partitions and expire old ones (safe in prod)
+        report = await maintain_partitions()
+        await engine.dispose()
+        print(f"✅ Partitions created: {report.created or 'none'}")
+        print(f"✅ Partitions expired: {report.expired or 'none'}")
+        return
+    if search_index:
+        # Add full-text search to an existing feedback table (rewrites it)
+        async with engine.begin() as conn:
+            added = await ensure_search_index(conn)
+        await engine.dispose()
+        print(f"✅ Search index {'in place' if added else 'needs Postgres'}")
+        return
+
     async with engine.begin() as conn:
         # Drop & recreate all tables (safe in dev)
         await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
+        await ensure_search_index(conn)
+        created = await ensure_partitions(conn)
     await engine.dispose()
-    print("✅ Tables created")
+    print(f"✅ Tables created ({len(created)} feedback partitions)")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Create tables or maintain partitions")
+    parser.add_argument(
+        "--maintain",
+        action="store_true",
+        help="only create upcoming partitions and drop/detach expired ones",
+    )
+    parser.add_argument(
+        "--search-index",
+        action="store_true",
+        help="only add the full-text search column and GIN index to feedback",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.maintain, args.search_index))
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+"""
+Detect the language of stored feedback rows that have none (lang IS NULL),
+e.g. Twitter and Discourse records ingested before detection was enabled or
+rows loaded with scripts/bulk_load.py. Needs fasttext-predict (the "lang"
+extra) and LANG_DETECT_MODEL.
+
+    PYTHONPATH=src python scripts/detect_langs.py --tenant tenant1 --source-type twitter
+
+Rows are updated in batches of --batch, oldest first, each batch in its own
+transaction together with the rollup counts it moves, so it can run next to
+live ingest and be interrupted and rerun. Rows detection can't place keep
+lang=NULL and are scanned again by the next run.
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import time
+
+from db.session import engine
+from services.lang_detect import backfill_missing_langs, lang_detector
+
+
+async def main(args: argparse.Namespace) -> None:
+    started = time.monotonic()
+    try:
+        scanned, updated = await backfill_missing_langs(
+            args.tenant, args.source_type, args.batch
+        )
+    finally:
+        await engine.dispose()
+        lang_detector.shutdown()
+    print(
+        f"✅ {updated}/{scanned} rows given a lang "
+        f"in {time.monotonic() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill lang on stored feedback")
+    parser.add_argument("--tenant", default=None, help="default every tenant")
+    parser.add_argument("--source-type", default=None, help="default every source")
+    parser.add_argument(
+        "--batch", type=int, default=None, help="default INGEST_BATCH_SIZE"
+    )
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    if not lang_detector.enabled:
+        sys.exit(
+            "Language detection is off: install the lang extra, point "
+            "LANG_DETECT_MODEL at lid.176.ftz and keep LANG_DETECT_WORKERS > 0"
+        )
+    asyncio.run(main(args))
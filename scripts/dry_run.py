@@ -7,12 +7,13 @@ from datetime import datetime, timedelta
 
 from config.settings import settings
 from core.models import Feedback
-from services.ingest import ingest
+from services.ingest import ingest_many
 from utils.time_utils import utc_now
 
 async def main() -> None:
     now = utc_now()
     platforms = list(settings.PLATFORM_CONFIG.keys())
+    records = []
 
     for i in range(200):
         # pick a random tenant + platform
@@ -42,21 +43,26 @@ async def main() -> None:
         created_at = now - timedelta(days=random.random() * 30)
         fetched_at = created_at + timedelta(seconds=random.randint(1, 300))
 
-        fb = Feedback(
-            id=uuid.uuid4(),
-            external_id=f"{plat}-{tenant}-{i}",
-            source_type=plat,
-            source_instance=str(instance),
-            tenant_id=tenant,
-            created_at=created_at,
-            fetched_at=fetched_at,
-            lang="en",
-            body=f"Dry-run message #{i} on {plat}",
-            metadata_={"dry_run": True, "index": i},
+        records.append(
+            Feedback(
+                id=uuid.uuid4(),
+                external_id=f"{plat}-{tenant}-{i}",
+                source_type=plat,
+                source_instance=str(instance),
+                tenant_id=tenant,
+                created_at=created_at,
+                fetched_at=fetched_at,
+                lang="en",
+                body=f"Dry-run message #{i} on {plat}",
+                metadata_={"dry_run": True, "index": i},
+            )
         )
 
-        inserted = await ingest(fb)
-        print(f"{'→' if inserted else '✗'} {fb.external_id}")
+    result = await ingest_many(records)
+    inserted = set(result.inserted_ids)
+    for fb in records:
+        print(f"{'→' if fb.id in inserted else '✗'} {fb.external_id}")
+    print(f"{result.inserted} inserted, {result.duplicates} duplicates")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,28 @@
+#!/usr/bin/env python
+"""
+Enqueuer for PULL_MODE=queue: marks every configured source due in pull_jobs
+each DISPATCH_INTERVAL_SEC and runs daily partition maintenance. Running two
+for redundancy is harmless; a source is never queued twice.
+
+    PYTHONPATH=src python scripts/enqueuer.py
+"""
+import asyncio
+import logging
+
+from config.settings import settings
+from workers.queue import enqueue_sources
+from workers.scheduler import schedule_jobs
+
+
+async def main() -> None:
+    await enqueue_sources()
+    schedule_jobs(enqueue_sources)
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=settings.LOG_LEVEL,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    asyncio.run(main())
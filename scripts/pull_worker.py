@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+"""
+Pull worker for PULL_MODE=queue: leases due (platform, tenant, instance)
+jobs from the pull_jobs table and runs them. Start as many as needed, on as
+many nodes as needed; SIGTERM/SIGINT finishes the running pulls and exits.
+
+    PYTHONPATH=src python scripts/pull_worker.py --concurrency 20
+"""
+import argparse
+import asyncio
+import logging
+import signal
+
+from adapters.http_pool import http_clients
+from config.settings import settings
+from db.session import engine
+from services.lang_detect import lang_detector
+from services.seen import seen_keys
+from workers.queue import PullWorker
+
+
+async def main(args: argparse.Namespace) -> None:
+    try:
+        await seen_keys.warm()
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Seen-key warm-up skipped: {e}")
+    worker = PullWorker(args.id, args.concurrency)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+    try:
+        await worker.run()
+    finally:
+        await http_clients.aclose()
+        await engine.dispose()
+        lang_detector.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pull job worker")
+    parser.add_argument("--id", default=None, help="default host:pid:random")
+    parser.add_argument(
+        "--concurrency", type=int, default=None, help="default PULL_WORKER_CONCURRENCY"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=settings.LOG_LEVEL,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    asyncio.run(main(args))
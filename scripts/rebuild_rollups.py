@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+"""
+Recount feedback_rollups from the feedback table, e.g. after rows were
+deleted or loaded outside services/ingest and services/bulk_load.
+
+    PYTHONPATH=src python scripts/rebuild_rollups.py --tenant tenant1 --since 2024-01-01
+
+The range is widened to whole UTC days and rewritten in one transaction;
+ingest waits for it to commit. Without --since/--until every bucket of the
+tenant (or of all tenants) is rebuilt, including those of expired partitions,
+whose counts are then lost.
+"""
+import argparse
+import asyncio
+import logging
+import time
+from datetime import datetime
+
+from db.session import engine
+from services.rollups import rebuild_rollups
+
+
+async def main(args: argparse.Namespace) -> None:
+    started = time.monotonic()
+    try:
+        rows = await rebuild_rollups(args.tenant, args.since, args.until)
+    finally:
+        await engine.dispose()
+    print(
+        f"✅ {rows} rollup rows rebuilt for {args.tenant or 'all tenants'} "
+        f"in {time.monotonic() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild feedback volume rollups")
+    parser.add_argument("--tenant", default=None, help="default every tenant")
+    parser.add_argument("--since", type=datetime.fromisoformat, default=None)
+    parser.add_argument("--until", type=datetime.fromisoformat, default=None)
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    asyncio.run(main(args))
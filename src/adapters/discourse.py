@@ -1,13 +1,18 @@
 # src/adapters/discourse.py
 import logging
 import uuid
-from datetime import datetime
-from typing import AsyncIterator
+from datetime import datetime, timedelta
+from functools import partial
+from typing import AsyncIterator, Optional
 
-import httpx
 from utils.time_utils import utc_now
+from adapters.http_pool import http_clients
+from adapters.pagination import Page, PaginationError, paginate
+from adapters.rate_limit import rate_limiter
 from config.settings import settings
-from core.models import Feedback
+from core.exceptions import RateLimitedError
+from core.metrics import error_status
+from core.models import STUB_STATUS_KEY, Feedback
 from ports.fetcher import BaseFetcher
 
 logger = logging.getLogger(__name__)
@@ -19,6 +24,9 @@ class DiscoursePullAdapter(BaseFetcher):
     for a specific tenant.
     """
 
+    # search filters by day only; fetch() returns every topic since `since`
+    honours_until = False
+
     def __init__(self, tenant_id: str):
         self.tenant_id = tenant_id
         cfg = settings.PLATFORM_CONFIG.get("discourse", {})
@@ -27,15 +35,71 @@ class DiscoursePullAdapter(BaseFetcher):
         if not base:
             raise ValueError(f"No Discourse URL configured for tenant '{tenant_id}'")
         self.base_url = base.rstrip("/")
-        self.client = httpx.AsyncClient(timeout=10)
+        self.client = http_clients.get(self.base_url)
 
-    async def fetch(self, since: datetime, until: datetime) -> AsyncIterator[Feedback]:
+    async def _fetch_page(
+        self, since: datetime, cursor: Optional[str], size: int
+    ) -> Page[Feedback]:
+        # Discourse search pages are numbered and fixed-size, so `size` is unused
         url = f"{self.base_url}/search.json"
-        params = {"q": "feedback"}  # static for now
+        page = int(cursor) if cursor else 1
+        # newest first, from the day before `since` on (after: is a date and
+        # exclusive); paging stops at the first topic older than `since`
+        after = since - timedelta(days=1)
+        params = {"q": f"feedback order:latest after:{after:%Y-%m-%d}"}
+        if page > 1:
+            params["page"] = str(page)
+
+        # no credential: Discourse limits by client IP per forum
+        resp = await rate_limiter.send(
+            "discourse", self.base_url, lambda: self.client.get(url, params=params)
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        topics = data.get("topics", [])
+        recent = [t for t in topics if self._created_ts(t, since) >= since.timestamp()]
+        items = [self._to_feedback(topic, since) for topic in recent]
+        grouped = data.get("grouped_search_result") or {}
+        has_more = (
+            bool(items)
+            and len(recent) == len(topics)
+            and bool(grouped.get("more_full_page_results"))
+        )
+        return Page(items, str(page + 1) if has_more else None)
+
+    @staticmethod
+    def _created_ts(topic: dict, since: datetime) -> float:
+        return topic.get("created_at", since.timestamp())
 
+    def _to_feedback(self, topic: dict, since: datetime) -> Feedback:
+        ext_id = str(topic.get("id"))
+        created_at = datetime.fromtimestamp(self._created_ts(topic, since))
+        return Feedback.trusted(
+            id=uuid.uuid5(uuid.NAMESPACE_URL, ext_id),
+            external_id=ext_id,
+            source_type="discourse",
+            source_instance=self.base_url,
+            tenant_id=self.tenant_id,
+            created_at=created_at,
+            fetched_at=utc_now(),
+            lang = None,
+            body=topic.get("title") or "",
+            metadata_={"posts_count": topic.get("posts_count")},
+        )
+
+    async def fetch(
+        self, since: datetime, until: datetime, cursor: Optional[str] = None
+    ) -> AsyncIterator[Feedback]:
+        pages = paginate(
+            partial(self._fetch_page, since),
+            on_cursor=self.remember_cursor,
+            cursor=cursor,
+        )
         try:
-            resp = await self.client.get(url, params=params)
-            resp.raise_for_status()
+            async for fb in pages:
+                yield fb
+        except (PaginationError, RateLimitedError):
+            raise
         except Exception as e:
             logger.warning(
                 f"Discourse fetch error ({type(e).__name__}): {e}; "
@@ -51,26 +115,5 @@ class DiscoursePullAdapter(BaseFetcher):
                 fetched_at=utc_now(),
                 lang = None,
                 body="This is a stub topic (fetch failure fallback)",
-                metadata_={},
+                metadata_={STUB_STATUS_KEY: error_status(e)},
             )
-            return
-
-        data = resp.json()
-        for topic in data.get("topics", []):
-            ext_id = str(topic.get("id"))
-            created_ts = topic.get("created_at", since.timestamp())
-            created_at = datetime.fromtimestamp(created_ts)
-            yield Feedback(
-                id=uuid.uuid5(uuid.NAMESPACE_URL, ext_id),
-                external_id=ext_id,
-                source_type="discourse",
-                source_instance=self.base_url,
-                tenant_id=self.tenant_id,
-                created_at=created_at,
-                fetched_at=utc_now(),
-                lang = None,
-                body=topic.get("title"),
-                metadata_={"posts_count": topic.get("posts_count")},
-            )
-
-        await self.client.aclose()
@@ -0,0 +1,59 @@
+# src/adapters/http_pool.py
+import logging
+from typing import Dict
+
+import httpx
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _origin(url: str) -> str:
+    parsed = httpx.URL(url)
+    origin = f"{parsed.scheme}://{parsed.host}"
+    return f"{origin}:{parsed.port}" if parsed.port else origin
+
+
+class HttpClientRegistry:
+    """
+    Process-wide pool of long-lived httpx.AsyncClients, one per upstream host.
+    Adapters borrow clients from here instead of owning them, so connections
+    (and their DNS/TCP/TLS setup) are reused across dispatch cycles.
+    """
+
+    def __init__(self) -> None:
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def get(self, url: str) -> httpx.AsyncClient:
+        """Return the shared client for the host of `url`, creating it on first use."""
+        origin = _origin(url)
+        client = self._clients.get(origin)
+        if client is None or client.is_closed:
+            client = self._clients[origin] = self._build(origin)
+        return client
+
+    def _build(self, origin: str) -> httpx.AsyncClient:
+        host = httpx.URL(origin).host
+        timeout = settings.HTTP_HOST_TIMEOUTS.get(host, settings.HTTP_TIMEOUT_SEC)
+        limits = httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SEC,
+        )
+        logger.info(f"Opening HTTP client pool for {origin}")
+        return httpx.AsyncClient(
+            base_url=origin,
+            timeout=timeout,
+            limits=limits,
+            http2=settings.HTTP2_ENABLED,
+        )
+
+    async def aclose(self) -> None:
+        """Close every pooled client; called from the app's shutdown hook."""
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+
+http_clients = HttpClientRegistry()
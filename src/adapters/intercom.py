@@ -2,13 +2,17 @@
 import logging
 import uuid
 from datetime import datetime
-from typing import AsyncIterator
+from functools import partial
+from typing import AsyncIterator, Optional
 
-import httpx
 from utils.time_utils import utc_now
+from adapters.http_pool import http_clients
+from adapters.pagination import Page, PaginationError, page_sizer, paginate
+from adapters.rate_limit import rate_limiter
 from config.settings import settings
-from core.exceptions import AdapterError
-from core.models import Feedback
+from core.exceptions import AdapterError, RateLimitedError
+from core.metrics import error_status
+from core.models import STUB_STATUS_KEY, Feedback
 from ports.fetcher import BaseFetcher
 
 logger = logging.getLogger(__name__)
@@ -18,6 +22,8 @@ class IntercomPullAdapter(BaseFetcher):
     """Fetch conversations from Intercom via their API for a specific tenant."""
 
     BASE_URL = "https://api.intercom.io"
+    # updated_since only; there is no upper bound
+    honours_until = False
 
     def __init__(self, tenant_id: str):
         self.tenant_id = tenant_id
@@ -27,23 +33,73 @@ class IntercomPullAdapter(BaseFetcher):
         if not secret_entry:
             raise AdapterError(f"INTERCOM secret for tenant '{tenant_id}' is not set")
         token = secret_entry.get_secret_value()
-        self.client = httpx.AsyncClient(base_url=self.BASE_URL, timeout=10)
+        self.client = http_clients.get(self.BASE_URL)
         self.headers = {
             "Authorization": f"Bearer {token}",
             "Accept": "application/json",
         }
-        self.page_size = settings.PAGE_SIZE
+        self.sizer = page_sizer("intercom", tenant_id)
 
-    async def fetch(self, since: datetime, until: datetime) -> AsyncIterator[Feedback]:
+    async def _fetch_page(
+        self, since: datetime, cursor: Optional[str], size: int
+    ) -> Page[Feedback]:
         url = "/conversations"
         params = {
             "updated_since": int(since.timestamp()),
-            "per_page": self.page_size,
+            "per_page": size,
         }
+        if cursor:
+            params["starting_after"] = cursor
 
+        resp = await rate_limiter.send(
+            "intercom",
+            self.headers["Authorization"],
+            lambda: self.client.get(url, params=params, headers=self.headers),
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        items = [
+            self._to_feedback(item, since) for item in data.get("conversations", [])
+        ]
+        next_page = (data.get("pages") or {}).get("next") or {}
+        return Page(items, next_page.get("starting_after"))
+
+    def _to_feedback(self, item: dict, since: datetime) -> Feedback:
+        ext_id = item.get("id")
+        created_at = datetime.fromtimestamp(item.get("created_at", since.timestamp()))
+        body = (item.get("conversation_message") or {}).get("body") or ""
+        meta = {
+            k: v
+            for k, v in item.items()
+            if k not in ("id", "created_at", "conversation_message")
+        }
+        return Feedback.trusted(
+            id=uuid.uuid5(uuid.NAMESPACE_URL, ext_id),
+            external_id=ext_id,
+            source_type="intercom",
+            source_instance="pull",
+            tenant_id=self.tenant_id,
+            created_at=created_at,
+            fetched_at=utc_now(),
+            lang=item.get("language"),
+            body=body,
+            metadata_=meta,
+        )
+
+    async def fetch(
+        self, since: datetime, until: datetime, cursor: Optional[str] = None
+    ) -> AsyncIterator[Feedback]:
+        pages = paginate(
+            partial(self._fetch_page, since),
+            self.sizer,
+            on_cursor=self.remember_cursor,
+            cursor=cursor,
+        )
         try:
-            resp = await self.client.get(url, params=params, headers=self.headers)
-            resp.raise_for_status()
+            async for fb in pages:
+                yield fb
+        except (PaginationError, RateLimitedError):
+            raise
         except Exception as e:
             logger.warning(
                 f"Intercom fetch error ({type(e).__name__}): {e}; "
@@ -59,33 +115,5 @@ class IntercomPullAdapter(BaseFetcher):
                 fetched_at=utc_now(),
                 lang=None,
                 body="This is a stub conversation (fetch failure fallback)",
-                metadata_={},
-            )
-            return
-
-        data = resp.json()
-        for item in data.get("conversations", []):
-            ext_id = item.get("id")
-            created_at = datetime.fromtimestamp(
-                item.get("created_at", since.timestamp())
+                metadata_={STUB_STATUS_KEY: error_status(e)},
             )
-            body = item.get("conversation_message", {}).get("body", "")
-            meta = {
-                k: v
-                for k, v in item.items()
-                if k not in ("id", "created_at", "conversation_message")
-            }
-            yield Feedback(
-                id=uuid.uuid5(uuid.NAMESPACE_URL, ext_id),
-                external_id=ext_id,
-                source_type="intercom",
-                source_instance="pull",
-                tenant_id=self.tenant_id,
-                created_at=created_at,
-                fetched_at=utc_now(),
-                lang=item.get("language"),
-                body=body,
-                metadata_=meta,
-            )
-
-        await self.client.aclose()
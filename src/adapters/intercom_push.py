@@ -32,7 +32,7 @@ class IntercomPushHandler(BasePushHandler):
         ext_id = conv.get("id") or str(uuid.uuid4())
         created_ts = conv.get("created_at", utc_now().timestamp())
         created = datetime.fromtimestamp(created_ts)
-        body = conv.get("conversation_message", {}).get("body", "")
+        body = (conv.get("conversation_message") or {}).get("body") or ""
 
         fb = Feedback(
             id=uuid.uuid5(uuid.NAMESPACE_URL, ext_id),
@@ -0,0 +1,136 @@
+# src/adapters/pagination.py
+import asyncio
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Dict, Generic, List, Optional, TypeVar
+
+from config.settings import settings
+from core.exceptions import AdapterError
+
+T = TypeVar("T")
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of results plus the cursor for the next one (None when done)."""
+
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+FetchPage = Callable[[Optional[str], int], Awaitable[Page[T]]]
+
+
+class PaginationError(AdapterError):
+    """A page after the first failed; records already yielded are kept."""
+
+
+class PaginationTruncated(PaginationError):
+    """
+    The stream stopped at MAX_PAGES_PER_FETCH with pages left: the records
+    yielded are kept, but the fetch didn't cover its window.
+    """
+
+
+class PageSizer:
+    """
+    Page size for one source that grows toward the API maximum while windows
+    keep filling whole pages and shrinks back when they come back sparse.
+    """
+
+    def __init__(self, initial: int, minimum: int, maximum: int):
+        self.minimum = min(minimum, maximum)
+        self.maximum = maximum
+        self.size = max(self.minimum, min(initial, maximum))
+
+    def grow(self) -> None:
+        self.size = min(self.size * 2, self.maximum)
+
+    def shrink(self) -> None:
+        self.size = max(self.size // 2, self.minimum)
+
+
+_page_sizers: Dict[str, PageSizer] = {}
+
+
+def page_sizer(platform: str, key: str) -> PageSizer:
+    """Shared PageSizer for a source, kept across dispatch cycles."""
+    sizer_key = f"{platform}:{key}"
+    sizer = _page_sizers.get(sizer_key)
+    if sizer is None:
+        maximum = settings.PAGE_SIZE_MAX.get(platform, settings.PAGE_SIZE)
+        sizer = _page_sizers[sizer_key] = PageSizer(
+            settings.PAGE_SIZE, settings.PAGE_SIZE_MIN, maximum
+        )
+    return sizer
+
+
+async def paginate(
+    fetch_page: FetchPage[T],
+    sizer: Optional[PageSizer] = None,
+    max_pages: Optional[int] = None,
+    on_cursor: Optional[Callable[[str], None]] = None,
+    cursor: Optional[str] = None,
+) -> AsyncIterator[T]:
+    """
+    Follow a platform cursor and yield records as a stream. The next page is
+    requested as soon as the current one arrives, so it downloads while the
+    caller is still ingesting the current page.
+
+    Errors on the first page propagate unchanged (adapters map them to their
+    usual fallbacks); errors on later pages are raised as PaginationError.
+    Reaching `max_pages` with a cursor left raises PaginationTruncated once
+    the last page's records are yielded, so callers don't take a partial
+    window for a complete one. `on_cursor` is told about every cursor
+    followed once the records of the page before it are yielded, e.g. for
+    checkpointing, and `cursor` starts the stream at that page instead of
+    the first.
+    """
+    max_pages = max_pages or settings.MAX_PAGES_PER_FETCH
+    size = sizer.size if sizer else settings.PAGE_SIZE
+    pending: Optional[asyncio.Future[Page[T]]] = asyncio.ensure_future(
+        fetch_page(cursor, size)
+    )
+    pages = 0
+    truncated = False
+    try:
+        while pending is not None:
+            try:
+                page = await pending
+            except Exception as e:
+                if pages == 0:
+                    raise
+                raise PaginationError(
+                    f"Page {pages + 1} failed ({type(e).__name__}): {e}"
+                ) from e
+            pages += 1
+            pending = None
+
+            if sizer:
+                if page.next_cursor and len(page.items) >= size:
+                    sizer.grow()
+                elif pages == 1 and not page.next_cursor and len(page.items) < size // 4:
+                    sizer.shrink()
+                size = sizer.size
+
+            if page.next_cursor:
+                if pages < max_pages:
+                    pending = asyncio.ensure_future(fetch_page(page.next_cursor, size))
+                else:
+                    truncated = True
+
+            for item in page.items:
+                yield item
+            # only once the caller has every record before it
+            if page.next_cursor and on_cursor:
+                on_cursor(page.next_cursor)
+        if truncated:
+            raise PaginationTruncated(
+                f"Stopped after {pages} pages (MAX_PAGES_PER_FETCH) with more left"
+            )
+    finally:
+        # consumer stopped early: drop the prefetch without leaking its error
+        if pending is not None:
+            if not pending.done():
+                pending.cancel()
+            elif not pending.cancelled():
+                pending.exception()
@@ -2,14 +2,18 @@
 import logging
 import uuid
 from datetime import datetime
-from typing import AsyncIterator
+from functools import partial
+from typing import AsyncIterator, Optional
 
-import httpx
 from httpx import HTTPStatusError
 from utils.time_utils import utc_now
+from adapters.http_pool import http_clients
+from adapters.pagination import Page, page_sizer, paginate
+from adapters.rate_limit import rate_limiter
 from config.settings import settings
 from core.exceptions import AdapterError
-from core.models import Feedback
+from core.metrics import error_status
+from core.models import STUB_STATUS_KEY, Feedback
 from ports.fetcher import BaseFetcher
 
 logger = logging.getLogger(__name__)
@@ -34,21 +38,68 @@ class PlaystorePullAdapter(BaseFetcher):
             )
 
         self.api_key = cfg.get("api_keys", {}).get(tenant_id, "")
-        self.page_size = settings.PAGE_SIZE
-        self.client = httpx.AsyncClient(timeout=10)
+        self.sizer = page_sizer("playstore", f"{tenant_id}:{app_id}")
+        self.client = http_clients.get(self.BASE_URL)
 
-    async def fetch(self, since: datetime, until: datetime) -> AsyncIterator[Feedback]:
+    async def _fetch_page(
+        self, since: datetime, until: datetime, cursor: Optional[str], size: int
+    ) -> Page[Feedback]:
         url = f"{self.BASE_URL}/{self.app_id}/reviews"
         params = {
             "startTime": since.isoformat(),
             "endTime": until.isoformat(),
-            "pageSize": str(self.page_size),
+            "pageSize": str(size),
         }
+        if cursor:
+            params["pageToken"] = cursor
         headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
 
+        resp = await rate_limiter.send(
+            "playstore",
+            self.api_key or self.tenant_id,
+            lambda: self.client.get(url, params=params, headers=headers),
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        items = [self._to_feedback(item) for item in data.get("reviews", [])]
+        return Page(items, data.get("nextPageToken"))
+
+    def _to_feedback(self, item: dict) -> Feedback:
+        ext_id = item.get("reviewId")
+        try:
+            created_at = datetime.fromisoformat(item.get("createTime"))
+        except Exception:
+            created_at = utc_now()
+
+        return Feedback.trusted(
+            id=uuid.uuid5(uuid.NAMESPACE_URL, ext_id),
+            external_id=ext_id,
+            source_type="playstore",
+            source_instance=self.app_id,
+            tenant_id=self.tenant_id,
+            created_at=created_at,
+            fetched_at=utc_now(),
+            lang=item.get("languageCode"),
+            body=item.get("comment") or "",
+            metadata_={
+                k: v
+                for k, v in item.items()
+                if k not in ("reviewId", "createTime", "comment")
+            },
+        )
+
+    async def fetch(
+        self, since: datetime, until: datetime, cursor: Optional[str] = None
+    ) -> AsyncIterator[Feedback]:
+        pages = paginate(
+            partial(self._fetch_page, since, until),
+            self.sizer,
+            on_cursor=self.remember_cursor,
+            cursor=cursor,
+        )
         try:
-            resp = await self.client.get(url, params=params, headers=headers)
-            resp.raise_for_status()
+            async for fb in pages:
+                yield fb
         except HTTPStatusError as e:
             code = getattr(e.response, "status_code", None)
             if code in (401, 404):
@@ -65,34 +116,7 @@ class PlaystorePullAdapter(BaseFetcher):
                     fetched_at=utc_now(),
                     lang="en",
                     body="This is a stub review (404/401 fallback)",
-                    metadata_={},
+                    metadata_={STUB_STATUS_KEY: error_status(e)},
                 )
                 return
             raise AdapterError(f"Playstore fetch failed: {e}") from e
-
-        data = resp.json()
-        for item in data.get("reviews", []):
-            ext_id = item.get("reviewId")
-            try:
-                created_at = datetime.fromisoformat(item.get("createTime"))
-            except Exception:
-                created_at = utc_now()
-
-            yield Feedback(
-                id=uuid.uuid5(uuid.NAMESPACE_URL, ext_id),
-                external_id=ext_id,
-                source_type="playstore",
-                source_instance=self.app_id,
-                tenant_id=self.tenant_id,
-                created_at=created_at,
-                fetched_at=utc_now(),
-                lang=item.get("languageCode"),
-                body=item.get("comment"),
-                metadata_={
-                    k: v
-                    for k, v in item.items()
-                    if k not in ("reviewId", "createTime", "comment")
-                },
-            )
-
-        await self.client.aclose()
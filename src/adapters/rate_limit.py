@@ -0,0 +1,219 @@
+# src/adapters/rate_limit.py
+import asyncio
+import hashlib
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Iterator, Mapping, Optional, Tuple
+
+import httpx
+
+from config.settings import settings
+from core.exceptions import RateLimitedError
+from core.metrics import UPSTREAM_REQUEST_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Twitter uses x-rate-limit-*, Intercom X-RateLimit-*; header lookups are
+# case-insensitive on httpx responses.
+REMAINING_HEADERS = ("x-rate-limit-remaining", "x-ratelimit-remaining")
+RESET_HEADERS = ("x-rate-limit-reset", "x-ratelimit-reset")
+
+# Set by rate_share(); requests sent inside it are paced by an extra bucket
+_share: ContextVar[Optional[float]] = ContextVar("rate_limit_share", default=None)
+
+
+@contextmanager
+def rate_share(share: float) -> Iterator[None]:
+    """
+    Cap requests sent from this context (and tasks it starts) at `share` of
+    each credential's configured rate, so background work such as a backfill
+    leaves the rest of the quota to live polling. Like every bucket here the
+    cap is per process: requests other processes send with the same
+    credential don't count against it.
+    """
+    token = _share.set(share)
+    try:
+        yield
+    finally:
+        _share.reset(token)
+
+
+def _first_number(headers: Mapping[str, str], names: Tuple[str, ...]) -> Optional[float]:
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            try:
+                return float(value)
+            except ValueError:
+                return None
+    return None
+
+
+def _retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Retry-After as seconds from now; accepts delta-seconds or an HTTP date."""
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Paces requests for one (platform, credential). Starts at the configured
+    rate, then follows the quota the upstream reports: what's left of the
+    window is spread evenly over the time until reset, and an exhausted quota
+    or a 429 blocks the bucket until the reset time.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.rate_expires = 0.0
+        self.throttled = 0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        if self.rate_expires and now >= self.rate_expires:
+            # quota window rolled over; go back to the configured pace
+            self.rate, self.rate_expires = self.base_rate, 0.0
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent. Waiters are served in FIFO order."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self.blocked_until - now
+                if wait <= 0:
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+                await asyncio.sleep(wait)
+
+    def observe(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """Update pacing from a response's status and rate-limit headers."""
+        now = time.monotonic()
+        self._refill(now)
+        remaining = _first_number(headers, REMAINING_HEADERS)
+        reset_at = _first_number(headers, RESET_HEADERS)
+        until_reset = max(reset_at - time.time(), 1.0) if reset_at else None
+
+        if remaining is not None and until_reset is not None:
+            self.tokens = min(self.tokens, remaining)
+            if remaining >= 1:
+                self.rate = remaining / until_reset
+                self.rate_expires = now + until_reset
+            else:
+                self.blocked_until = max(self.blocked_until, now + until_reset)
+
+        if status_code == 429:
+            self.throttled += 1
+            delay = _retry_after(headers)
+            if delay is None:
+                delay = until_reset
+            if delay is None:
+                # no hint from upstream: exponential backoff
+                delay = min(2.0**self.throttled, settings.RATE_LIMIT_MAX_WAIT_SEC)
+            self.blocked_until = max(self.blocked_until, now + delay)
+        else:
+            self.throttled = 0
+
+    def retry_delay(self) -> float:
+        return max(self.blocked_until - time.monotonic(), 0.0)
+
+
+class RateLimiter:
+    """Process-wide token buckets keyed by (platform, credential)."""
+
+    def __init__(self) -> None:
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._shares: Dict[Tuple[str, str, float], TokenBucket] = {}
+
+    @staticmethod
+    def _key(platform: str, credential: str) -> Tuple[str, str]:
+        # keep raw secrets out of the key (and out of any debug dumps)
+        return platform, hashlib.sha256(credential.encode()).hexdigest()[:16]
+
+    def bucket(self, platform: str, credential: str) -> TokenBucket:
+        key = self._key(platform, credential)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            rate = settings.RATE_LIMIT_RPS.get(platform, 1.0)
+            bucket = self._buckets[key] = TokenBucket(rate, settings.RATE_LIMIT_BURST)
+        return bucket
+
+    def share_bucket(self, platform: str, credential: str, share: float) -> TokenBucket:
+        """Pacing for requests sent under rate_share(share); no burst allowance."""
+        key = (*self._key(platform, credential), share)
+        bucket = self._shares.get(key)
+        if bucket is None:
+            rate = settings.RATE_LIMIT_RPS.get(platform, 1.0) * share
+            bucket = self._shares[key] = TokenBucket(rate, 1)
+        return bucket
+
+    async def send(
+        self,
+        platform: str,
+        credential: str,
+        request: Callable[[], Awaitable[httpx.Response]],
+    ) -> httpx.Response:
+        """
+        Send `request` when the credential's bucket allows it. A 429 is retried
+        at the reset time the upstream announced, up to RATE_LIMIT_MAX_RETRIES
+        times; RateLimitedError is raised when retries run out or the reset is
+        further away than RATE_LIMIT_MAX_WAIT_SEC. Inside rate_share(), each
+        attempt also waits on the credential's share bucket first.
+        """
+        bucket = self.bucket(platform, credential)
+        share = _share.get()
+        limit = self.share_bucket(platform, credential, share) if share else None
+        for attempt in range(settings.RATE_LIMIT_MAX_RETRIES + 1):
+            if limit is not None:
+                await limit.acquire()
+            await bucket.acquire()
+            started = time.perf_counter()
+            try:
+                resp = await request()
+            except Exception as e:
+                UPSTREAM_REQUEST_SECONDS.labels(platform, type(e).__name__).observe(
+                    time.perf_counter() - started
+                )
+                raise
+            UPSTREAM_REQUEST_SECONDS.labels(platform, str(resp.status_code)).observe(
+                time.perf_counter() - started
+            )
+            bucket.observe(resp.status_code, resp.headers)
+            if resp.status_code != 429:
+                return resp
+
+            delay = bucket.retry_delay()
+            if attempt == settings.RATE_LIMIT_MAX_RETRIES:
+                break
+            if delay > settings.RATE_LIMIT_MAX_WAIT_SEC:
+                raise RateLimitedError(
+                    f"{platform} quota resets in {delay:.0f}s; giving up this fetch"
+                )
+            logger.info(f"{platform} rate limited; retrying in {delay:.1f}s")
+        raise RateLimitedError(
+            f"{platform} still rate limited after {settings.RATE_LIMIT_MAX_RETRIES} retries"
+        )
+
+
+rate_limiter = RateLimiter()
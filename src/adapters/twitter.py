@@ -2,14 +2,18 @@
 import logging
 import uuid
 from datetime import datetime
-from typing import AsyncIterator
+from functools import partial
+from typing import AsyncIterator, Optional
 
-import httpx
 from httpx import HTTPStatusError
 from utils.time_utils import utc_now
+from adapters.http_pool import http_clients
+from adapters.pagination import Page, page_sizer, paginate
+from adapters.rate_limit import rate_limiter
 from config.settings import settings
 from core.exceptions import AdapterError
-from core.models import Feedback
+from core.metrics import error_status
+from core.models import STUB_STATUS_KEY, Feedback
 from ports.fetcher import BaseFetcher
 
 logger = logging.getLogger(__name__)
@@ -41,26 +45,75 @@ class TwitterPullAdapter(BaseFetcher):
 
         self.token = token_entry.get_secret_value()
         self.query = query
-        self.page_size = settings.PAGE_SIZE
+        self.sizer = page_sizer("twitter", tenant_id)
 
-        self.client = httpx.AsyncClient(base_url=self.BASE_URL, timeout=10)
+        self.client = http_clients.get(self.BASE_URL)
         self.headers = {"Authorization": f"Bearer {self.token}"}
 
-    async def fetch(self, since: datetime, until: datetime) -> AsyncIterator[Feedback]:
+    async def _fetch_page(
+        self, since: datetime, until: datetime, cursor: Optional[str], size: int
+    ) -> Page[Feedback]:
         url = "/2/tweets/search/recent"
         params = {
             "query": self.query,
             "start_time": since.isoformat() + "Z",
             "end_time": until.isoformat() + "Z",
-            "max_results": self.page_size,
+            "max_results": size,
         }
+        if cursor:
+            params["next_token"] = cursor
 
+        resp = await rate_limiter.send(
+            "twitter",
+            self.token,
+            lambda: self.client.get(url, params=params, headers=self.headers),
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        items = [self._to_feedback(item) for item in data.get("data", [])]
+        return Page(items, data.get("meta", {}).get("next_token"))
+
+    def _to_feedback(self, item: dict) -> Feedback:
+        ext_id = item.get("id")
+        text = item.get("text") or ""
+        ts = item.get("created_at", "").rstrip("Z")
+        try:
+            created_at = datetime.fromisoformat(ts)
+        except Exception:
+            created_at = utc_now()
+
+        return Feedback.trusted(
+            id=uuid.uuid5(uuid.NAMESPACE_URL, ext_id),
+            external_id=ext_id,
+            source_type="twitter",
+            source_instance="search",
+            tenant_id=self.tenant_id,
+            created_at=created_at,
+            fetched_at=utc_now(),
+            lang = None,
+            body=text,
+            metadata_={
+                k: v
+                for k, v in item.items()
+                if k not in ("id", "text", "created_at")
+            },
+        )
+
+    async def fetch(
+        self, since: datetime, until: datetime, cursor: Optional[str] = None
+    ) -> AsyncIterator[Feedback]:
+        pages = paginate(
+            partial(self._fetch_page, since, until),
+            self.sizer,
+            on_cursor=self.remember_cursor,
+            cursor=cursor,
+        )
         try:
-            resp = await self.client.get(url, params=params, headers=self.headers)
-            resp.raise_for_status()
+            async for fb in pages:
+                yield fb
         except HTTPStatusError as e:
             code = getattr(e.response, "status_code", None)
-            if code in (401, 429):
+            if code == 401:
                 logger.warning(
                     f"[{self.tenant_id}] Twitter fetch error {code}; emitting stub tweet"
                 )
@@ -73,37 +126,8 @@ class TwitterPullAdapter(BaseFetcher):
                     created_at=utc_now(),
                     fetched_at=utc_now(),
                     lang = None,
-                    body="Stub tweet due to rate limit or auth error",
-                    metadata_={},
+                    body="Stub tweet due to auth error",
+                    metadata_={STUB_STATUS_KEY: error_status(e)},
                 )
                 return
             raise AdapterError(f"Twitter fetch failed: {e}") from e
-
-        data = resp.json()
-        for item in data.get("data", []):
-            ext_id = item.get("id")
-            text = item.get("text")
-            ts = item.get("created_at", "").rstrip("Z")
-            try:
-                created_at = datetime.fromisoformat(ts)
-            except Exception:
-                created_at = utc_now()
-
-            yield Feedback(
-                id=uuid.uuid5(uuid.NAMESPACE_URL, ext_id),
-                external_id=ext_id,
-                source_type="twitter",
-                source_instance="search",
-                tenant_id=self.tenant_id,
-                created_at=created_at,
-                fetched_at=utc_now(),
-                lang = None,
-                body=text,
-                metadata_={
-                    k: v
-                    for k, v in item.items()
-                    if k not in ("id", "text", "created_at")
-                },
-            )
-
-        await self.client.aclose()
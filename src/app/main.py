@@ -1,45 +1,129 @@
 import logging
+import time
 from contextlib import asynccontextmanager
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import List, Literal, Optional
 from uuid import UUID
 
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from sqlalchemy import select, tuple_
 
+from adapters.http_pool import http_clients
 from adapters.intercom_push import IntercomPushHandler
 from config.settings import settings
-from core.models import Feedback
+from core.cursor import (
+    decode_cursor,
+    decode_rank_cursor,
+    encode_cursor,
+    encode_rank_cursor,
+)
+from core.metrics import HTTP_REQUEST_SECONDS
+from core.models import Feedback, FeedbackPage, FeedbackStats, StatsBucket
 from db.models import FeedbackORM
-from db.session import AsyncSessionLocal
+from db.search import search_filter, search_rank
+from db.session import AsyncReadSessionLocal, pool_stats
 from ports.push_handler import BasePushHandler
-from services.ingest import ingest
+from services.buffer import webhook_buffer
+from services.export import FORMATTERS, MEDIA_TYPES, arrow_available, gzip_chunks
+from services.fast_json import RAW_COLUMNS, feedback_json, feedback_page_json
+from services.lang_detect import lang_detector
+from services.read_cache import read_cache
+from services.rollups import DEFAULT_SPAN, DIMENSIONS, stats_query
+from services.seen import seen_keys
+from utils.time_utils import as_utc, utc_now
+from workers.leader import scheduler_leader
 from workers.scheduler import schedule_jobs
 
 logging.basicConfig(
     level=settings.LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s"
 )
+logger = logging.getLogger(__name__)
+
+
+def _stop_scheduler(scheduler: Optional[AsyncIOScheduler]) -> None:
+    if scheduler is not None:
+        # pulls already running finish; no new ones start here
+        scheduler.shutdown(wait=False)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # startup logic
-    schedule_jobs()
+    try:
+        await seen_keys.warm()
+    except Exception as e:
+        # only an optimisation: every insert still dedups in the database
+        logger.warning(f"Seen-key warm-up skipped: {e}")
+    webhook_buffer.start()
+    if settings.PULL_MODE == "scheduler":
+        # in queue mode pulls run in scripts/pull_worker.py processes instead;
+        # of several API processes only the elected one schedules pulls
+        scheduler_leader.start(on_elected=schedule_jobs, on_deposed=_stop_scheduler)
     yield
-    # shutdown logic (if any)
-    # e.g. await some_cleanup()
+    # shutdown logic
+    await scheduler_leader.stop()
+    await webhook_buffer.stop()
+    await http_clients.aclose()
+    lang_detector.shutdown()
 
 
 app = FastAPI(lifespan=lifespan)
 
 
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    started = time.perf_counter()
+    # an unhandled exception reaches the client as a 500
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # label by route template (/feedback/{feedback_id}), not the raw path
+        route = request.scope.get("route")
+        HTTP_REQUEST_SECONDS.labels(
+            request.method,
+            route.path if route is not None else "unmatched",
+            str(status),
+        ).observe(time.perf_counter() - started)
+
+
+# ── Prometheus metrics ─────────────────────────────────────────────
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 # ── Health Check ────────────────────────────────────────
 @app.get("/healthz")
 async def healthz() -> dict:
     return {"status": "ok"}
 
 
+@app.get("/healthz/db")
+async def healthz_db() -> dict:
+    """Connection pool checkout wait and saturation, per engine."""
+    return pool_stats()
+
+
+@app.get("/healthz/leader")
+async def healthz_leader() -> dict:
+    """Whether this process runs the pull scheduler, and which process does."""
+    return await scheduler_leader.status()
+
+
+@app.get("/healthz/cache")
+async def healthz_cache() -> dict:
+    """Read cache size and hit ratio for this process."""
+    return read_cache.stats()
+
+
 # ── Webhook endpoint (Intercom push) ────────────────────────────────
-@app.post("/webhook/intercom/{tenant_id}")
+@app.post("/webhook/intercom/{tenant_id}", status_code=202)
 async def intercom_webhook(tenant_id: str, request: Request) -> dict:
     payload = await request.json()
     payload["tenant_id"] = tenant_id
@@ -50,21 +134,30 @@ async def intercom_webhook(tenant_id: str, request: Request) -> dict:
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
 
-    inserted = await ingest(fb)
-    return {"status": "ok", "inserted": inserted}
+    # acknowledge now; the buffer's flusher writes it in the next batch
+    if not webhook_buffer.offer(fb):
+        raise HTTPException(
+            status_code=503,
+            detail="Ingestion buffer full",
+            headers={"Retry-After": str(settings.WEBHOOK_RETRY_AFTER_SEC)},
+        )
+    return {"status": "accepted", "id": str(fb.id)}
 
 
 # ── Search feedback within a time range ──────────────────────────────
-@app.get("/feedback", response_model=List[Feedback])
-async def search_feedback(
-    tenant_id: str = Query(...),
-    source_type: Optional[str] = Query(None),
-    start: Optional[datetime] = None,
-    end: Optional[datetime] = None,
-    metadata_key: Optional[str] = Query(None),
-    metadata_val: Optional[str] = Query(None),
-    limit: int = Query(100, gt=0, le=1000),
-) -> List[Feedback]:
+def _instant(value: Optional[datetime]) -> Optional[str]:
+    # one cache key for the same instant however it was written
+    return as_utc(value).astimezone(timezone.utc).isoformat() if value else None
+
+
+def _feedback_filters(
+    tenant_id: str,
+    source_type: Optional[str],
+    start: Optional[datetime],
+    end: Optional[datetime],
+    metadata_key: Optional[str],
+    metadata_val: Optional[str],
+) -> list:
     filters = [FeedbackORM.tenant_id == tenant_id]
     if source_type:
         filters.append(FeedbackORM.source_type == source_type)
@@ -74,20 +167,222 @@ async def search_feedback(
         filters.append(FeedbackORM.created_at <= end)
     if metadata_key and metadata_val:
         filters.append(FeedbackORM.metadata_[metadata_key].astext == metadata_val)
+    return filters
+
 
-    async with AsyncSessionLocal() as session:
-        result = await session.execute(
-            FeedbackORM.__table__.select().where(*filters).limit(limit)
+@app.get("/feedback", response_model=FeedbackPage)
+async def search_feedback(
+    tenant_id: str = Query(...),
+    source_type: Optional[str] = Query(None),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    metadata_key: Optional[str] = Query(None),
+    metadata_val: Optional[str] = Query(None),
+    q: Optional[str] = Query(
+        None, description='Full-text search: words, "phrases", OR, -word'
+    ),
+    limit: int = Query(100, gt=0, le=1000),
+    sort: Optional[Literal["relevance", "created_at", "-created_at"]] = Query(
+        None, description="Default: relevance with q, else -created_at"
+    ),
+    cursor: Optional[str] = Query(None),
+) -> Response:
+    q = " ".join(q.split()) if q else None  # one cache key per query
+    sort = sort or ("relevance" if q else "-created_at")
+    if sort == "relevance" and not q:
+        raise HTTPException(status_code=400, detail="sort=relevance requires q")
+    filters = _feedback_filters(
+        tenant_id, source_type, start, end, metadata_key, metadata_val
+    )
+    if q:
+        filters.append(search_filter(q))
+    ranked = sort == "relevance"
+    descending = ranked or sort.startswith("-")
+    rank = search_rank(q) if ranked else None
+    key = tuple_(
+        *([rank] if ranked else []), FeedbackORM.created_at, FeedbackORM.id
+    )
+
+    # keyset pagination: resume strictly after the last row of the previous page
+    if cursor:
+        try:
+            after = tuple_(
+                *(decode_rank_cursor(cursor) if ranked else decode_cursor(cursor))
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        filters.append(key < after if descending else key > after)
+
+    order = [c.desc() if descending else c.asc() for c in key.clauses]
+    fast = settings.API_FAST_JSON
+    columns = list(RAW_COLUMNS if fast else FeedbackORM.__table__.columns)
+    if ranked:
+        columns.append(rank.label("rank"))
+
+    async def load() -> bytes:
+        async with AsyncReadSessionLocal() as session:
+            if q and session.bind.dialect.name != "postgresql":
+                raise HTTPException(
+                    status_code=400, detail="Full-text search requires Postgres"
+                )
+            result = await session.execute(
+                select(*columns).where(*filters).order_by(*order).limit(limit + 1)
+            )
+            rows = result.fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = (
+                encode_rank_cursor(last.rank, last.created_at, last.id)
+                if ranked
+                else encode_cursor(last.created_at, last.id)
+            )
+        if ranked:
+            rows = [row[:-1] for row in rows]
+        if fast:
+            return feedback_page_json(rows, next_cursor)
+        page = FeedbackPage(
+            items=[Feedback.from_row(r) for r in rows], next_cursor=next_cursor
+        )
+        return page.json().encode()
+
+    params = (
+        source_type,
+        _instant(start),
+        _instant(end),
+        metadata_key,
+        metadata_val,
+        q,
+        limit,
+        sort,
+        cursor,
+        fast,
+    )
+    body = await read_cache.get("/feedback", tenant_id, params, load)
+    # the body is sent as is, without response_model validation
+    return Response(body, media_type="application/json")
+
+
+# ── Bulk export (streamed from a server-side cursor) ────────────────
+@app.get("/feedback/export")
+async def export_feedback(
+    tenant_id: str = Query(...),
+    source_type: Optional[str] = Query(None),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    metadata_key: Optional[str] = Query(None),
+    metadata_val: Optional[str] = Query(None),
+    format: Literal["ndjson", "csv", "arrow"] = Query("ndjson"),
+    gzip: bool = Query(False),
+) -> StreamingResponse:
+    if format == "arrow" and not arrow_available():
+        raise HTTPException(
+            status_code=400, detail="Arrow export requires the 'pyarrow' package"
         )
-        rows = result.fetchall()
-        return [Feedback.from_orm(r) for r in rows]
+    filters = _feedback_filters(
+        tenant_id, source_type, start, end, metadata_key, metadata_val
+    )
+    stmt = (
+        FeedbackORM.__table__.select()
+        .where(*filters)
+        .order_by(FeedbackORM.created_at.asc(), FeedbackORM.id.asc())
+    )
+
+    # The session lives inside the generator: the response body is produced
+    # after this handler returns, and only one chunk of rows is held at a time.
+    async def row_batches():
+        async with AsyncReadSessionLocal() as session:
+            result = await session.stream(
+                stmt, execution_options={"yield_per": settings.EXPORT_CHUNK_ROWS}
+            )
+            async for rows in result.partitions():
+                yield rows
+
+    body = FORMATTERS[format](row_batches())
+    headers = {
+        "Content-Disposition": f'attachment; filename="feedback.{format}"'
+    }
+    if gzip:
+        body = gzip_chunks(body)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type=MEDIA_TYPES[format], headers=headers)
+
+
+# ── Volume analytics (from the rollup table) ────────────────────────
+@app.get("/feedback/stats", response_model=FeedbackStats)
+async def feedback_stats(
+    tenant_id: str = Query(...),
+    granularity: Literal["hour", "day"] = Query("day"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    source_type: Optional[str] = Query(None),
+    source_instance: Optional[str] = Query(None),
+    lang: Optional[str] = Query(None),
+    group_by: List[Literal["source_type", "source_instance", "lang"]] = Query(
+        list(DIMENSIONS), description="Dimensions to split by; others are summed"
+    ),
+) -> FeedbackStats:
+    end = end or utc_now()
+    start = start or end - DEFAULT_SPAN[granularity]
+    stmt = stats_query(
+        tenant_id,
+        granularity,
+        start,
+        end,
+        group_by=[d for d in DIMENSIONS if d in group_by],
+        source_type=source_type,
+        source_instance=source_instance,
+        lang=lang,
+    )
+    async with AsyncReadSessionLocal() as session:
+        rows = (await session.execute(stmt)).mappings().all()
+    # '' in the rollups stands for a missing instance or language
+    buckets = [
+        StatsBucket(
+            bucket=as_utc(row["bucket"]),
+            count=row["count"],
+            **{d: row[d] or None for d in DIMENSIONS if d in row},
+        )
+        for row in rows
+    ]
+    return FeedbackStats(
+        granularity=granularity,
+        start=start,
+        end=end,
+        buckets=buckets,
+        total=sum(b.count for b in buckets),
+    )
 
 
 # ── Fetch a specific feedback by its UUID ───────────────────────────
 @app.get("/feedback/{feedback_id}", response_model=Feedback)
-async def get_feedback(feedback_id: UUID, tenant_id: str = Query(...)) -> Feedback:
-    async with AsyncSessionLocal() as session:
-        fb_orm = await session.get(FeedbackORM, feedback_id)
-    if not fb_orm or fb_orm.tenant_id != tenant_id:
-        raise HTTPException(status_code=404, detail="Not found")
-    return Feedback.from_orm(fb_orm)
+async def get_feedback(
+    feedback_id: UUID, tenant_id: str = Query(...)
+) -> Response:
+    # the primary key also carries created_at (the partition key), which the
+    # caller doesn't know, so this probes each partition's (id, ...) index
+    fast = settings.API_FAST_JSON
+    columns = RAW_COLUMNS if fast else FeedbackORM.__table__.columns
+
+    async def load() -> bytes:
+        async with AsyncReadSessionLocal() as session:
+            result = await session.execute(
+                select(*columns).where(
+                    FeedbackORM.id == feedback_id, FeedbackORM.tenant_id == tenant_id
+                )
+            )
+            row = result.first()
+        if row is None:
+            raise HTTPException(status_code=404, detail="Not found")
+        if fast:
+            return feedback_json(row)
+        return Feedback.from_row(row).json().encode()
+
+    # backfill_missing_langs() updates stored rows, so this follows the
+    # tenant's generation like the listing; a 404 raises and is not cached
+    body = await read_cache.get(
+        "/feedback/{feedback_id}", tenant_id, (feedback_id, fast), load
+    )
+    return Response(body, media_type="application/json")
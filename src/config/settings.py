@@ -1,9 +1,10 @@
 # src/config/settings.py
 
+import importlib.util
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Literal, Optional
 
-from pydantic import BaseSettings, Field, PostgresDsn, SecretStr
+from pydantic import BaseSettings, Field, PostgresDsn, SecretStr, validator
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -18,6 +19,54 @@ class Settings(BaseSettings):
         "postgresql+asyncpg://postgres:postgres@db:5432/ingestdb",
         description="Async DB URL",
     )
+    DATABASE_READ_URL: Optional[str] = Field(
+        None,
+        description="Async URL of a read replica for read-only endpoints (optional)",
+    )
+    DB_ECHO: bool = Field(False, description="Log every SQL statement (debug only)")
+    DB_POOL_SIZE: int = Field(10, description="Persistent connections per engine")
+    DB_MAX_OVERFLOW: int = Field(
+        10,
+        description="Extra connections opened under load beyond DB_POOL_SIZE",
+    )
+    DB_POOL_TIMEOUT_SEC: float = Field(
+        30,
+        description="Max wait for a pooled connection before raising",
+    )
+    DB_POOL_PRE_PING: bool = Field(
+        True,
+        description="Check connections on checkout so dropped ones are replaced",
+    )
+    DB_POOL_RECYCLE_SEC: int = Field(
+        1800,
+        description="Replace connections older than this (-1 never)",
+    )
+    DB_STATEMENT_CACHE_SIZE: int = Field(
+        100,
+        description="asyncpg prepared statement cache per connection (0 for PgBouncer)",
+    )
+    DB_REPLICA_RETRY_SEC: float = Field(
+        30,
+        description="After a failed replica connect, read from the primary this long",
+    )
+
+    # ── Feedback table partitions ─────────────────────────────────────
+    PARTITION_MONTHS_AHEAD: int = Field(
+        3,
+        description="Monthly feedback partitions kept created ahead of the current month",
+    )
+    FEEDBACK_RETENTION_MONTHS: int = Field(
+        0,
+        description="Drop monthly partitions older than this many months (0 keeps all)",
+    )
+    PARTITION_DETACH_ONLY: bool = Field(
+        False,
+        description="Detach expired partitions instead of dropping them (archive first)",
+    )
+    FEEDBACK_TENANT_HASH_PARTITIONS: int = Field(
+        0,
+        description="Hash sub-partitions by tenant_id per month (0 disables); new months only",
+    )
 
     # ── Tenants ───────────────────────────────────────────────────────
     TENANTS: List[str] = Field(
@@ -78,18 +127,295 @@ class Settings(BaseSettings):
             "discourse": 60,
             "intercom": 60,
         },
-        description="Frequency per platform in seconds",
+        description="Starting poll interval per source, by platform, in seconds",
+    )
+    POLL_INTERVAL_MIN_SEC: float = Field(
+        15,
+        description="Busy sources (full first page) are never polled more often",
+    )
+    POLL_INTERVAL_MAX_SEC: float = Field(
+        900,
+        description="Quiet sources (nothing new) are never polled less often",
+    )
+    POLL_BACKOFF_FACTOR: float = Field(
+        1.5,
+        description="A poll with nothing new stretches the interval by this factor",
+    )
+    POLL_JITTER_FRACTION: float = Field(
+        0.1,
+        description="Each interval is randomised by ± this fraction",
     )
 
     DISPATCH_INTERVAL_SEC: int = Field(
         60,
-        description="Interval between each full dispatch run",
+        description="How often the pull-queue enqueuer picks up new sources",
+    )
+
+    # ── Incremental fetch checkpoints ─────────────────────────────────
+    CHECKPOINT_OVERLAP_SEC: int = Field(
+        5,
+        description="Safety overlap re-fetched before each source's checkpoint",
+    )
+    CHECKPOINT_MAX_LOOKBACK_SEC: int = Field(
+        7 * 24 * 3600,
+        description="Never resume further back than this (upstream search limits)",
+    )
+
+    # ── Pull job queue (PULL_MODE=queue) ──────────────────────────────
+    PULL_MODE: Literal["scheduler", "queue"] = Field(
+        "scheduler",
+        description=(
+            "'scheduler': the API process runs dispatch_all(); 'queue': "
+            "scripts/enqueuer.py queues pull jobs and scripts/pull_worker.py "
+            "processes lease them"
+        ),
+    )
+    PULL_LEASE_SEC: float = Field(
+        120,
+        description="Visibility timeout; a job whose lease isn't renewed is re-run",
+    )
+    PULL_HEARTBEAT_SEC: float = Field(
+        30,
+        description="How often a worker renews the leases of its running jobs",
+    )
+    PULL_WORKER_CONCURRENCY: int = Field(
+        20,
+        description="Jobs one worker process runs at once",
+    )
+    PULL_WORKER_POLL_SEC: float = Field(
+        1.0,
+        description="Idle workers look for due jobs this often",
+    )
+    PULL_JOB_MAX_ATTEMPTS: int = Field(
+        5,
+        description="Consecutive failed runs before a job waits for the next enqueue",
+    )
+    PULL_RETRY_BASE_SEC: float = Field(
+        5,
+        description="Retry delay after the first failure; doubles with each attempt",
+    )
+
+    # ── Historical backfill ───────────────────────────────────────────
+    BACKFILL_WINDOW_SEC: int = Field(
+        24 * 3600,
+        description="Backfill ranges are split into windows of this length",
+    )
+    BACKFILL_CONCURRENCY: int = Field(
+        4,
+        description="Windows of one backfill fetched at once",
+    )
+    BACKFILL_BATCH_SIZE: int = Field(
+        1000,
+        description="Rows per INSERT when writing backfilled records",
+    )
+    BACKFILL_RATE_SHARE: float = Field(
+        0.5,
+        description=(
+            "Share of each credential's request rate a backfill may use; "
+            "enforced per process, so backfills run in parallel processes "
+            "each get this share"
+        ),
+    )
+
+    # ── Dispatch concurrency ──────────────────────────────────────────
+    DISPATCH_MAX_CONCURRENCY: int = Field(
+        50,
+        description="Max source pulls running at once across all platforms",
+    )
+    DISPATCH_PLATFORM_CONCURRENCY: Dict[str, int] = Field(
+        default_factory=lambda: {
+            "playstore": 10,
+            "twitter": 10,
+            "discourse": 20,
+            "intercom": 10,
+        },
+        description="Max concurrent pulls per platform",
+    )
+    DISPATCH_TENANT_CONCURRENCY: int = Field(
+        4,
+        description="Max concurrent pulls per tenant",
+    )
+    DISPATCH_TASK_TIMEOUT_SEC: float = Field(
+        45,
+        description="Per-source pull timeout; overrunning pulls are cancelled",
     )
 
     PAGE_SIZE: int = Field(
         30,
         description="Default page size for all API calls",
     )
+    PAGE_SIZE_MIN: int = Field(
+        10,
+        description="Adaptive page sizes never shrink below this",
+    )
+    PAGE_SIZE_MAX: Dict[str, int] = Field(
+        default_factory=lambda: {
+            "playstore": 100,
+            "twitter": 100,
+            "intercom": 150,
+        },
+        description="API maximum page size per platform; dense windows grow toward it",
+    )
+    MAX_PAGES_PER_FETCH: int = Field(
+        100,
+        description="Safety cap on pages followed within one fetch window; a fetch "
+        "that hits it fails without advancing the checkpoint",
+    )
+
+    # ── Outbound HTTP (shared per-host client pools) ─────────────────
+    HTTP_TIMEOUT_SEC: float = Field(
+        10,
+        description="Default timeout for upstream API calls",
+    )
+    HTTP_HOST_TIMEOUTS: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Per-host timeout overrides, e.g. {'api.twitter.com': 20}",
+    )
+    HTTP_MAX_CONNECTIONS: int = Field(
+        100,
+        description="Max open connections per upstream host",
+    )
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = Field(
+        20,
+        description="Max idle keep-alive connections kept per upstream host",
+    )
+    HTTP_KEEPALIVE_EXPIRY_SEC: float = Field(
+        30,
+        description="Idle keep-alive connections are closed after this long",
+    )
+    HTTP2_ENABLED: bool = Field(
+        False,
+        description="Negotiate HTTP/2 with upstreams (requires the 'http2' extra)",
+    )
+
+    # ── Upstream rate limiting (per platform + credential) ───────────
+    RATE_LIMIT_RPS: Dict[str, float] = Field(
+        default_factory=lambda: {
+            "playstore": 0.05,  # ~200 req/hour
+            "twitter": 0.5,  # 450 req / 15 min (app auth)
+            "discourse": 1.0,
+            "intercom": 15.0,
+        },
+        description="Steady request rate per credential until headers say otherwise",
+    )
+    RATE_LIMIT_BURST: int = Field(
+        10,
+        description="Requests a credential may send back-to-back before pacing",
+    )
+    RATE_LIMIT_MAX_RETRIES: int = Field(
+        3,
+        description="Retries after a 429 before giving up on a fetch",
+    )
+    RATE_LIMIT_MAX_WAIT_SEC: float = Field(
+        30,
+        description="Longest single wait for a quota reset before giving up",
+    )
+
+    # ── Ingestion ─────────────────────────────────────────────────────
+    INGEST_BATCH_SIZE: int = Field(
+        500,
+        description="Max records per multi-row INSERT in ingest_many()",
+    )
+    BULK_LOAD_CHUNK_ROWS: int = Field(
+        50_000,
+        description="Rows per COPY + merge transaction in scripts/bulk_load.py",
+    )
+    SEEN_KEYS_MAX: int = Field(
+        200_000,
+        description="Recently stored dedup keys kept in memory per process (0 disables)",
+    )
+    SEEN_KEYS_TTL_SEC: float = Field(
+        24 * 3600,
+        description="How long a stored key skips the database before being rechecked",
+    )
+
+    # ── Read API ──────────────────────────────────────────────────────
+    API_FAST_JSON: bool = Field(
+        False,
+        description="Encode /feedback rows straight to JSON (orjson if installed)",
+    )
+    READ_CACHE_MAX_BYTES: int = Field(
+        64 * 1024 * 1024,
+        description="Memory bound of the in-process /feedback response cache (0 disables)",
+    )
+    READ_CACHE_TTL_SEC: float = Field(
+        10,
+        description="Longest a cached response is served; local ingest invalidates sooner",
+    )
+
+    # ── Scheduler leader election ─────────────────────────────────────
+    LEADER_LOCK_KEY: int = Field(
+        7_461_001,
+        description="Postgres advisory lock key whose holder runs the pull scheduler",
+    )
+    LEADER_RENEW_SEC: float = Field(
+        2.0,
+        description="How often the leader checks its lock and followers try to take it",
+    )
+    LEADER_LEASE_SEC: int = Field(
+        10,
+        description="Postgres frees the lock of a leader unreachable for about this long",
+    )
+
+    # ── Language detection ────────────────────────────────────────────
+    LANG_DETECT_MODEL: str = Field(
+        "",
+        description="Path to fastText's lid.176.ftz model; empty disables lang detection",
+    )
+    LANG_DETECT_WORKERS: int = Field(
+        1,
+        description="Processes detecting lang for records without one (0 disables)",
+    )
+    LANG_DETECT_BATCH: int = Field(
+        250,
+        description="Max record bodies per detection task sent to a worker",
+    )
+    LANG_DETECT_MIN_PROB: float = Field(
+        0.5,
+        description="Lowest model probability accepted; below it lang stays None",
+    )
+    LANG_DETECT_MIN_CHARS: int = Field(
+        10,
+        description="Shorter bodies are not detected",
+    )
+    LANG_DETECT_MAX_CHARS: int = Field(
+        500,
+        description="Only this many leading characters of a body are detected",
+    )
+
+    # ── Bulk export ───────────────────────────────────────────────────
+    EXPORT_CHUNK_ROWS: int = Field(
+        2000,
+        description="Rows fetched per server-side cursor round trip in /feedback/export",
+    )
+
+    # ── Webhook ingestion buffer ──────────────────────────────────────
+    WEBHOOK_QUEUE_MAX: int = Field(
+        10_000,
+        description="Webhook records held in memory before replying 503",
+    )
+    WEBHOOK_BATCH_SIZE: int = Field(
+        200,
+        description="Flush the webhook buffer once this many records are queued",
+    )
+    WEBHOOK_FLUSH_INTERVAL_SEC: float = Field(
+        0.5,
+        description="Flush the webhook buffer at least this often",
+    )
+    WEBHOOK_RETRY_AFTER_SEC: int = Field(
+        5,
+        description="Retry-After sent with 503 when the webhook buffer is full",
+    )
+
+    @validator("HTTP2_ENABLED")
+    def _h2_installed(cls, enabled: bool) -> bool:
+        # httpx only imports h2 when the first client is built
+        if enabled and importlib.util.find_spec("h2") is None:
+            raise ValueError(
+                "HTTP/2 needs the 'h2' package: install the 'http2' extra "
+                "(httpx[http2]) or unset HTTP2_ENABLED"
+            )
+        return enabled
 
     class Config:
         env_file = BASE_DIR / ".env"
@@ -0,0 +1,44 @@
+# src/core/cursor.py
+import base64
+from datetime import datetime
+from typing import List, Tuple
+from uuid import UUID
+
+
+def _encode(*parts: str) -> str:
+    raw = "|".join(parts).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> List[str]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return base64.urlsafe_b64decode(padded).decode().split("|")
+
+
+def encode_cursor(created_at: datetime, feedback_id: UUID) -> str:
+    """Opaque keyset cursor pointing just past (created_at, id)."""
+    return _encode(created_at.isoformat(), str(feedback_id))
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Inverse of encode_cursor(); raises ValueError on anything malformed."""
+    try:
+        created_at, feedback_id = _decode(cursor)
+        return datetime.fromisoformat(created_at), UUID(feedback_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def encode_rank_cursor(rank: float, created_at: datetime, feedback_id: UUID) -> str:
+    """Keyset cursor for relevance-sorted pages: (rank, created_at, id)."""
+    # repr() round-trips the float exactly
+    return _encode(repr(rank), created_at.isoformat(), str(feedback_id))
+
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, datetime, UUID]:
+    """Inverse of encode_rank_cursor(); raises ValueError on anything malformed."""
+    try:
+        rank, created_at, feedback_id = _decode(cursor)
+        return float(rank), datetime.fromisoformat(created_at), UUID(feedback_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
@@ -4,3 +4,7 @@ class DuplicateRecordError(Exception):
 
 class AdapterError(Exception):
     """Generic adapter failure (e.g. HTTP error, parse error)."""
+
+
+class RateLimitedError(AdapterError):
+    """Upstream quota exhausted and the reset is too far away to wait for."""
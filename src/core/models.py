@@ -1,10 +1,16 @@
 # src/core/models.py
 from datetime import datetime
-from typing import Any, Dict, Optional
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
 
 from pydantic import BaseModel
 
+# Adapters emit placeholder records with this external_id prefix on fetch errors
+STUB_EXTERNAL_ID_PREFIX = "stub-"
+# stub metadata_ key: why the adapter fell back (see core.metrics.error_status)
+STUB_STATUS_KEY = "fallback_status"
+
 
 class Feedback(BaseModel):
     id: UUID
@@ -20,3 +26,67 @@ class Feedback(BaseModel):
 
     class Config:
         orm_mode = True
+
+    # Validation costs ~10x building the model. Records from our own pull
+    # adapters and from feedback rows are already well-typed, so they take the
+    # unchecked paths below; untrusted input (webhook payloads, uploaded dumps,
+    # API parameters) is still validated by Feedback(**values).
+
+    @classmethod
+    def trusted(cls, **values: Any) -> "Feedback":
+        """Build without validation. Every field must be given, correctly typed."""
+        return cls._unchecked(values)
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> "Feedback":
+        """Unvalidated Feedback from a feedback table row (columns in field order)."""
+        return cls._unchecked(dict(zip(FEEDBACK_FIELDS, row)))
+
+    @classmethod
+    def _unchecked(cls, values: Dict[str, Any]) -> "Feedback":
+        # what BaseModel.construct() does, minus defaults and alias handling;
+        # `values` becomes the instance __dict__ as is
+        fb = cls.__new__(cls)
+        object.__setattr__(fb, "__dict__", values)
+        object.__setattr__(fb, "__fields_set__", set(FEEDBACK_FIELDS))
+        return fb
+
+    def to_row(self) -> Tuple[Any, ...]:
+        """Field values as a tuple in feedback column order."""
+        return _row_values(self.__dict__)
+
+
+FEEDBACK_FIELDS: Tuple[str, ...] = tuple(Feedback.__fields__)
+_row_values = itemgetter(*FEEDBACK_FIELDS)
+
+
+class FeedbackPage(BaseModel):
+    """One page of /feedback results; pass next_cursor back to get the next."""
+
+    items: List[Feedback]
+    next_cursor: Optional[str]
+
+
+class StatsBucket(BaseModel):
+    """Feedback count in one bucket; dimensions not grouped by are None."""
+
+    bucket: datetime
+    source_type: Optional[str]
+    source_instance: Optional[str]
+    lang: Optional[str]
+    count: int
+
+
+class FeedbackStats(BaseModel):
+    """/feedback/stats: counts per UTC hour or day from the rollup table."""
+
+    granularity: str
+    start: datetime
+    end: datetime
+    buckets: List[StatsBucket]
+    total: int
+
+
+def is_stub(feedback: Feedback) -> bool:
+    """True for the fallback records adapters emit instead of real data."""
+    return feedback.external_id.startswith(STUB_EXTERNAL_ID_PREFIX)
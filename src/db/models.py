@@ -1,34 +1,152 @@
 # src/db/models.py
 
-from sqlalchemy import Column, DateTime, Index, String, UniqueConstraint
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+)
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
 
+# Natural key used to deduplicate records coming back from overlapping pulls.
+FEEDBACK_NATURAL_KEY = (
+    "tenant_id",
+    "source_type",
+    "external_id",
+    "source_instance",
+)
+# The unique constraint adds created_at because unique constraints on a
+# partitioned table must include the partition key. Adapters fall back to the
+# fetch time when an upstream timestamp is missing, so inserts also skip a
+# record whose natural key is stored under another created_at.
+FEEDBACK_UNIQUE_CONSTRAINT = "uq_feedback_tenant_source_external"
+FEEDBACK_UNIQUE_COLUMNS = (*FEEDBACK_NATURAL_KEY, "created_at")
+
 
 class FeedbackORM(Base):
+    """
+    Range-partitioned by month on created_at (see db/partitions.py), optionally
+    hash sub-partitioned by tenant_id. The primary key and unique constraint
+    carry both partition keys so Postgres can enforce them per partition.
+    """
+
     __tablename__ = "feedback"
     __table_args__ = (
+        # a record without a source_instance is still one record; the index
+        # also serves the natural-key lookup across partitions
         UniqueConstraint(
-            "tenant_id",
-            "source_type",
-            "external_id",
-            "source_instance",
-            name="uq_feedback_tenant_source_external",
+            *FEEDBACK_UNIQUE_COLUMNS,
+            name=FEEDBACK_UNIQUE_CONSTRAINT,
+            postgresql_nulls_not_distinct=True,
         ),
         # GIN index on metadata_ JSONB
         Index("idx_feedback_metadata", "metadata_", postgresql_using="gin"),
+        # keyset pagination for /feedback: filter + ORDER BY created_at, id
+        Index(
+            "idx_feedback_tenant_source_created_id",
+            "tenant_id",
+            "source_type",
+            "created_at",
+            "id",
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
 
     id = Column(PGUUID(as_uuid=True), primary_key=True)
     external_id = Column(String, nullable=False)
     source_type = Column(String, nullable=False)
     source_instance = Column(String, nullable=True)
-    tenant_id = Column(String, nullable=False)
-    created_at = Column(DateTime(timezone=True), nullable=False)
+    tenant_id = Column(String, primary_key=True)
+    created_at = Column(DateTime(timezone=True), primary_key=True)
     fetched_at = Column(DateTime(timezone=True), nullable=True)
     lang = Column(String, nullable=True)
     body = Column(String, nullable=True)
     metadata_ = Column(JSONB, nullable=False, default={})
+
+
+class SourceCheckpointORM(Base):
+    """
+    High-water mark for one (tenant, source_type, source_instance) pull source.
+    After a fetch that stopped part-way, last_cursor is the page it stopped
+    at, cursor_since/cursor_until the window that cursor belongs to and
+    cursor_last_created_at the newest record stored from that window so far.
+    """
+
+    __tablename__ = "source_checkpoints"
+
+    tenant_id = Column(String, primary_key=True)
+    source_type = Column(String, primary_key=True)
+    source_instance = Column(String, primary_key=True)
+    last_created_at = Column(DateTime(timezone=True), nullable=True)
+    last_cursor = Column(String, nullable=True)
+    cursor_since = Column(DateTime(timezone=True), nullable=True)
+    cursor_until = Column(DateTime(timezone=True), nullable=True)
+    cursor_last_created_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class BackfillWindowORM(Base):
+    """
+    A historical backfill window: completed once its records were all stored,
+    or, while completed_at is NULL, cut short at MAX_PAGES_PER_FETCH with
+    everything before `cursor` stored.
+    """
+
+    __tablename__ = "backfill_windows"
+
+    tenant_id = Column(String, primary_key=True)
+    source_type = Column(String, primary_key=True)
+    source_instance = Column(String, primary_key=True)
+    window_start = Column(DateTime(timezone=True), primary_key=True)
+    window_end = Column(DateTime(timezone=True), primary_key=True)
+    records = Column(Integer, nullable=False)
+    cursor = Column(String, nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class PullJobORM(Base):
+    """
+    Queue entry for one pull source (PULL_MODE=queue). due_at is the next
+    run, interval_sec the source's current adaptive poll interval; a worker
+    holds the job while leased_by is set and lease_expires_at is in the future.
+    """
+
+    __tablename__ = "pull_jobs"
+    __table_args__ = (Index("idx_pull_jobs_due", "due_at"),)
+
+    tenant_id = Column(String, primary_key=True)
+    source_type = Column(String, primary_key=True)
+    source_instance = Column(String, primary_key=True)
+    due_at = Column(DateTime(timezone=True), nullable=True)
+    interval_sec = Column(Float, nullable=True)
+    leased_by = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(String, nullable=True)
+    last_run_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class FeedbackRollupORM(Base):
+    """
+    Stored feedback per tenant, source, language and UTC hour or day, kept in
+    step with inserts by services/rollups.py. A missing source_instance or
+    lang is stored as '' (primary key columns can't be NULL).
+    """
+
+    __tablename__ = "feedback_rollups"
+
+    tenant_id = Column(String, primary_key=True)
+    granularity = Column(String, primary_key=True)  # 'hour' | 'day'
+    bucket = Column(DateTime(timezone=True), primary_key=True)
+    source_type = Column(String, primary_key=True)
+    source_instance = Column(String, primary_key=True)
+    lang = Column(String, primary_key=True)
+    count = Column(BigInteger, nullable=False)
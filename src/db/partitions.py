@@ -0,0 +1,190 @@
+# src/db/partitions.py
+import logging
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from config.settings import settings
+from db.models import FeedbackORM
+from db.session import engine
+from utils.time_utils import utc_now
+
+logger = logging.getLogger(__name__)
+
+PARENT = FeedbackORM.__tablename__
+# catches rows outside every monthly range (e.g. a backfill of old history)
+DEFAULT_PARTITION = f"{PARENT}_default"
+_MONTHLY = re.compile(rf"^{PARENT}_(\d{{4}})_(\d{{2}})$")
+
+
+def month_start(dt: datetime) -> date:
+    return date(dt.year, dt.month, 1)
+
+
+def add_months(month: date, n: int) -> date:
+    index = month.year * 12 + month.month - 1 + n
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT}_{month.year:04d}_{month.month:02d}"
+
+
+def _bound(month: date) -> str:
+    # explicit UTC offset so bounds don't depend on the session TimeZone
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+
+@dataclass
+class MaintenanceReport:
+    created: List[str] = field(default_factory=list)
+    expired: List[str] = field(default_factory=list)
+
+
+async def existing_partitions(conn: AsyncConnection) -> List[str]:
+    """Direct children of the feedback table."""
+    result = await conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:parent AS regclass)"
+        ),
+        {"parent": PARENT},
+    )
+    return [row[0] for row in result]
+
+
+async def create_month_partition(
+    conn: AsyncConnection, month: date, hash_partitions: int = 0
+) -> str:
+    """
+    Create the partition holding [month, next month). With `hash_partitions`
+    it is itself split by tenant_id hash into that many leaf tables. Fails if
+    the default partition already holds rows for that month.
+    """
+    name = partition_name(month)
+    bounds = f"FOR VALUES FROM ({_bound(month)}) TO ({_bound(add_months(month, 1))})"
+    if hash_partitions:
+        await conn.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT} "
+                f"{bounds} PARTITION BY HASH (tenant_id)"
+            )
+        )
+        for remainder in range(hash_partitions):
+            await conn.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {name}_h{remainder} PARTITION OF {name} "
+                    f"FOR VALUES WITH (MODULUS {hash_partitions}, REMAINDER {remainder})"
+                )
+            )
+    else:
+        await conn.execute(
+            text(f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT} {bounds}")
+        )
+    return name
+
+
+async def ensure_partitions(
+    conn: AsyncConnection,
+    now: Optional[datetime] = None,
+    start: Optional[date] = None,
+    months_ahead: Optional[int] = None,
+) -> List[str]:
+    """
+    Create the default partition and every monthly partition from `start`
+    (default: last month) through PARTITION_MONTHS_AHEAD months after `now`.
+    Returns the names of partitions created. No-op outside Postgres.
+    """
+    if conn.dialect.name != "postgresql":
+        return []
+    now = now or utc_now()
+    ahead = settings.PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    current = month_start(now)
+    month = start or add_months(current, -1)
+    last = add_months(current, ahead)
+
+    existing = set(await existing_partitions(conn))
+    created: List[str] = []
+    if DEFAULT_PARTITION not in existing:
+        await conn.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} "
+                f"PARTITION OF {PARENT} DEFAULT"
+            )
+        )
+        created.append(DEFAULT_PARTITION)
+    while month <= last:
+        if partition_name(month) not in existing:
+            created.append(
+                await create_month_partition(
+                    conn, month, settings.FEEDBACK_TENANT_HASH_PARTITIONS
+                )
+            )
+        month = add_months(month, 1)
+    return created
+
+
+async def expire_partitions(
+    conn: AsyncConnection,
+    now: Optional[datetime] = None,
+    retention_months: Optional[int] = None,
+    detach_only: Optional[bool] = None,
+) -> List[str]:
+    """
+    Detach (and unless `detach_only`, drop) monthly partitions that end before
+    the retention cutoff. Retention is a catalog change, not a DELETE, so it
+    leaves no dead tuples behind. Unless `detach_only`, rows older than the
+    cutoff that landed in the default partition (no monthly partition existed
+    for them) are deleted too; there should be few, since backfills and bulk
+    loads create the partitions of their range first. No-op when retention
+    is 0 or outside Postgres.
+    """
+    retention = (
+        settings.FEEDBACK_RETENTION_MONTHS if retention_months is None else retention_months
+    )
+    if conn.dialect.name != "postgresql" or retention <= 0:
+        return []
+    detach_only = settings.PARTITION_DETACH_ONLY if detach_only is None else detach_only
+    cutoff = add_months(month_start(now or utc_now()), -retention)
+
+    expired: List[str] = []
+    existing = await existing_partitions(conn)
+    for name in sorted(existing):
+        match = _MONTHLY.match(name)
+        if not match:
+            continue
+        if date(int(match[1]), int(match[2]), 1) >= cutoff:
+            continue
+        await conn.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {name}"))
+        if not detach_only:
+            await conn.execute(text(f"DROP TABLE {name}"))
+        expired.append(name)
+    if not detach_only and DEFAULT_PARTITION in existing:
+        pruned = await conn.execute(
+            text(f"DELETE FROM {DEFAULT_PARTITION} WHERE created_at < {_bound(cutoff)}")
+        )
+        if pruned.rowcount:
+            logger.info(
+                f"Deleted {pruned.rowcount} expired rows from {DEFAULT_PARTITION}"
+            )
+            expired.append(DEFAULT_PARTITION)
+    return expired
+
+
+async def maintain_partitions(now: Optional[datetime] = None) -> MaintenanceReport:
+    """Pre-create upcoming partitions and expire old ones in one transaction."""
+    async with engine.begin() as conn:
+        report = MaintenanceReport(
+            created=await ensure_partitions(conn, now),
+            expired=await expire_partitions(conn, now),
+        )
+    if report.created or report.expired:
+        logger.info(
+            f"Partition maintenance: created {report.created}, expired {report.expired}"
+        )
+    return report
@@ -0,0 +1,130 @@
+# src/db/search.py
+"""
+Full-text search over feedback bodies (Postgres only).
+
+feedback.search_tsv is a stored generated column, to_tsvector() of the body
+in the text search configuration for the row's lang (its first two letters,
+so 'en' and 'en-US' both stem as English), 'simple' for unknown or missing
+languages. A GIN index on it serves /feedback?q=.
+
+The column is not mapped on FeedbackORM: inserts, COPY and exports keep
+working on the same columns, and the SQLite test database doesn't need it.
+"""
+from typing import Dict
+
+from sqlalchemy import (
+    ARRAY,
+    ColumnElement,
+    Text,
+    and_,
+    cast,
+    distinct,
+    func,
+    literal,
+    literal_column,
+    select,
+    text,
+)
+from sqlalchemy.dialects.postgresql import REGCONFIG, TSQUERY, TSVECTOR, array
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from db.models import FeedbackORM
+
+# ISO 639-1 code → configuration shipped with every supported Postgres
+SEARCH_CONFIGS: Dict[str, str] = {
+    "da": "danish",
+    "de": "german",
+    "en": "english",
+    "es": "spanish",
+    "fi": "finnish",
+    "fr": "french",
+    "hu": "hungarian",
+    "it": "italian",
+    "nl": "dutch",
+    "no": "norwegian",
+    "pt": "portuguese",
+    "ro": "romanian",
+    "ru": "russian",
+    "sv": "swedish",
+    "tr": "turkish",
+}
+FALLBACK_CONFIG = "simple"
+
+SEARCH_COLUMN = "search_tsv"
+SEARCH_INDEX = "idx_feedback_search"
+_PARENT = FeedbackORM.__tablename__
+search_tsv = literal_column(f"{_PARENT}.{SEARCH_COLUMN}", TSVECTOR)
+
+
+def _config_sql(lang: str) -> str:
+    branches = " ".join(
+        f"WHEN '{code}' THEN '{config}'::regconfig"
+        for code, config in SEARCH_CONFIGS.items()
+    )
+    return (
+        f"CASE lower(substr({lang}, 1, 2)) {branches} "
+        f"ELSE '{FALLBACK_CONFIG}'::regconfig END"
+    )
+
+
+# the configuration each row was indexed with
+row_config = literal_column(_config_sql(f"{_PARENT}.lang"))
+
+
+async def ensure_search_index(conn: AsyncConnection) -> bool:
+    """
+    Add search_tsv and its GIN index if missing. Adding the column rewrites
+    every partition, so on a large existing table run it in a quiet window.
+    Returns False outside Postgres.
+    """
+    if conn.dialect.name != "postgresql":
+        return False
+    await conn.execute(
+        text(
+            f"ALTER TABLE {_PARENT} ADD COLUMN IF NOT EXISTS {SEARCH_COLUMN} "
+            f"tsvector GENERATED ALWAYS AS "
+            f"(to_tsvector({_config_sql('lang')}, coalesce(body, ''))) STORED"
+        )
+    )
+    await conn.execute(
+        text(
+            f"CREATE INDEX IF NOT EXISTS {SEARCH_INDEX} "
+            f"ON {_PARENT} USING gin ({SEARCH_COLUMN})"
+        )
+    )
+    return True
+
+
+def _any_config_query(q: str) -> ColumnElement:
+    # `q` parsed with every configuration, OR-ed together. Many configurations
+    # parse it the same way, and each duplicate branch costs the index scan
+    # about as much as the first, so only the distinct ones are kept.
+    configs = sorted({*SEARCH_CONFIGS.values(), FALLBACK_CONFIG})
+    cfg = func.unnest(cast(array(configs), ARRAY(REGCONFIG))).column_valued("cfg")
+    parsed = func.websearch_to_tsquery(cfg, q)
+    branch = literal("(") + cast(parsed, Text) + literal(")")
+    return cast(
+        select(func.string_agg(distinct(branch), literal(" | ")))
+        .where(func.numnode(parsed) > 0)
+        .scalar_subquery(),
+        TSQUERY,
+    )
+
+
+def search_filter(q: str) -> ColumnElement:
+    """
+    Rows matching the web-search style query `q` (quoted phrases, OR, -word).
+
+    Each row has to match `q` parsed with its own configuration, which can't
+    use the index; the OR of `q` parsed with every configuration is a superset
+    of the matches that can, so the GIN index narrows the rows first.
+    """
+    return and_(
+        search_tsv.op("@@")(_any_config_query(q)),
+        search_tsv.op("@@")(func.websearch_to_tsquery(row_config, q)),
+    )
+
+
+def search_rank(q: str) -> ColumnElement:
+    """ts_rank of each matching row against `q` in the row's configuration."""
+    return func.ts_rank(search_tsv, func.websearch_to_tsquery(row_config, q))
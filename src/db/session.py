@@ -1,14 +1,147 @@
-import os
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
 
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
-
-DATABASE_URL = os.getenv(
-    "DATABASE_URL", "postgresql+asyncpg://postgres:postgres@db:5432/ingestdb"
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
 )
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+DATABASE_URL = str(settings.DATABASE_URL)
+DATABASE_READ_URL = settings.DATABASE_READ_URL
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long each checkout waited (including opening a
+    new overflow connection) and how many checkouts timed out.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total_sec = 0.0
+        self.wait_max_sec = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            self.checkouts += 1
+            self.wait_total_sec += waited
+            self.wait_max_sec = max(self.wait_max_sec, waited)
+
+    def stats(self) -> Dict[str, Any]:
+        capacity = self.size() + max(self._max_overflow, 0)
+        return {
+            "size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "saturation": round(self.checkedout() / capacity, 3) if capacity else 0.0,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_avg_ms": round(1000 * self.wait_total_sec / self.checkouts, 3)
+            if self.checkouts
+            else 0.0,
+            "wait_max_ms": round(1000 * self.wait_max_sec, 3),
+        }
+
+
+def build_engine(url: str) -> AsyncEngine:
+    """Async engine with pool and driver options taken from settings."""
+    connect_args: Dict[str, Any] = {}
+    if url.startswith("postgresql+asyncpg"):
+        # 0 disables both caches (needed behind PgBouncer in transaction mode)
+        connect_args = {
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        }
+    return create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        poolclass=InstrumentedPool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SEC,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE_SEC,
+        connect_args=connect_args,
+    )
 
-# async engine & session factory
-engine = create_async_engine(DATABASE_URL, echo=True)
+
+class ReadSessionFactory:
+    """
+    Sessions for read-only endpoints. Uses the replica when one is configured
+    and reachable; if connecting to it fails, reads go to the primary for
+    DB_REPLICA_RETRY_SEC before the replica is tried again.
+    """
+
+    def __init__(
+        self,
+        primary: async_sessionmaker,
+        replica: Optional[async_sessionmaker] = None,
+    ):
+        self.primary = primary
+        self.replica = replica
+        self._replica_down_until = 0.0
+
+    @asynccontextmanager
+    async def __call__(self) -> AsyncIterator[AsyncSession]:
+        if self.replica is not None and time.monotonic() >= self._replica_down_until:
+            session = self.replica()
+            try:
+                await session.connection()
+            except (exc.DBAPIError, OSError) as e:
+                await session.close()
+                self._replica_down_until = (
+                    time.monotonic() + settings.DB_REPLICA_RETRY_SEC
+                )
+                logger.warning(f"Read replica unavailable, using primary: {e}")
+            else:
+                async with session:
+                    yield session
+                return
+        async with self.primary() as session:
+            yield session
+
+
+# async engines & session factories
+engine = build_engine(DATABASE_URL)
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
     expire_on_commit=False,
 )
+
+read_engine: Optional[AsyncEngine] = (
+    build_engine(DATABASE_READ_URL) if DATABASE_READ_URL else None
+)
+AsyncReadSessionLocal = ReadSessionFactory(
+    AsyncSessionLocal,
+    async_sessionmaker(bind=read_engine, expire_on_commit=False)
+    if read_engine is not None
+    else None,
+)
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Checkout wait and saturation per engine, for sizing pools from data."""
+    stats = {"primary": engine.pool.stats()}
+    if read_engine is not None:
+        stats["replica"] = read_engine.pool.stats()
+    return stats
@@ -1,7 +1,7 @@
 # src/ports/fetcher.py
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import AsyncIterator
+from typing import AsyncIterator, Optional
 
 from core.models import Feedback
 
@@ -9,9 +9,20 @@ from core.models import Feedback
 class BaseFetcher(ABC):
     """
     A pull‐adapter must implement fetch(since, until) and yield Feedback.
+    Given a `cursor` that an earlier fetch of the same window followed,
+    fetch() picks that fetch up from the page the cursor points at.
     """
 
+    #: whether fetch() stops at `until`; if not, it returns everything after `since`
+    honours_until: bool = True
+
+    #: last upstream pagination cursor followed by fetch(), if any
+    last_cursor: Optional[str] = None
+
+    def remember_cursor(self, cursor: str) -> None:
+        self.last_cursor = cursor
+
     @abstractmethod
     async def fetch(
-        self, since: datetime, until: datetime
+        self, since: datetime, until: datetime, cursor: Optional[str] = None
     ) -> AsyncIterator[Feedback]: ...
@@ -0,0 +1,97 @@
+# src/services/buffer.py
+import asyncio
+import logging
+from typing import List, Optional
+
+from config.settings import settings
+from core.models import Feedback
+from services.ingest import ingest_many
+
+logger = logging.getLogger(__name__)
+
+
+class IngestBuffer:
+    """
+    Bounded in-process queue between the webhook route and the database.
+    The route only enqueues; a background flusher drains the queue into
+    ingest_many() whenever `batch_size` records are waiting or
+    `flush_interval` seconds have passed since the first one arrived.
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+    ):
+        self.batch_size = batch_size or settings.WEBHOOK_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.WEBHOOK_FLUSH_INTERVAL_SEC
+        # None is the shutdown sentinel
+        self._queue: asyncio.Queue[Optional[Feedback]] = asyncio.Queue(
+            maxsize or settings.WEBHOOK_QUEUE_MAX
+        )
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    def offer(self, feedback: Feedback) -> bool:
+        """Enqueue without waiting. False means the buffer is full or closing."""
+        if self._closing:
+            return False
+        try:
+            self._queue.put_nowait(feedback)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        self._closing = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop accepting records and flush everything already queued."""
+        self._closing = True
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            first = await self._queue.get()
+            if first is None:
+                return
+            batch: List[Feedback] = [first]
+            deadline = loop.time() + self.flush_interval
+            stopping = False
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+            if stopping:
+                return
+
+    async def _flush(self, batch: List[Feedback]) -> None:
+        try:
+            result = await ingest_many(batch)
+        except Exception as e:
+            logger.error(f"Webhook buffer flush of {len(batch)} records failed: {e}")
+            return
+        if result.failed:
+            logger.error(f"Webhook buffer dropped {result.failed} records on flush")
+
+
+webhook_buffer = IngestBuffer()
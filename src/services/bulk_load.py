@@ -0,0 +1,208 @@
+# src/services/bulk_load.py
+import asyncio
+import csv
+import gzip
+import io
+import json
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from config.settings import settings
+from core.models import Feedback
+from db.models import FEEDBACK_NATURAL_KEY, FeedbackORM
+from db.session import engine
+from services.ingest import FeedbackSource, _chunked
+from services.rollups import rollup_upsert_sql
+from utils.time_utils import as_utc
+
+logger = logging.getLogger(__name__)
+
+COPY_COLUMNS = [c.name for c in FeedbackORM.__table__.columns]
+_COLUMN_LIST = ", ".join(COPY_COLUMNS)
+_STAGED_LIST = ", ".join(f"s.{name}" for name in COPY_COLUMNS)
+_KEY_LIST = ", ".join(FEEDBACK_NATURAL_KEY)
+_KEY_MATCH = " AND ".join(
+    f"f.{name} IS NOT DISTINCT FROM s.{name}" for name in FEEDBACK_NATURAL_KEY
+)
+
+
+@dataclass
+class BulkLoadResult:
+    rows: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    chunks: int = 0
+    duration_sec: float = 0.0
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.duration_sec if self.duration_sec else 0.0
+
+
+# ── Input readers (one record in memory at a time) ───────────────────
+def _open_text(path: Path) -> io.TextIOBase:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return path.open("r", encoding="utf-8", newline="")
+
+
+def _to_feedback(obj: Dict[str, Any]) -> Feedback:
+    # upstream dumps may not carry our id; derive it the way the adapters do
+    if not obj.get("id"):
+        obj["id"] = uuid.uuid5(uuid.NAMESPACE_URL, obj["external_id"])
+    obj.setdefault("fetched_at", None)
+    obj.setdefault("lang", None)
+    obj.setdefault("source_instance", None)
+    obj.setdefault("metadata_", {})
+    return Feedback(**obj)
+
+
+def read_ndjson(path: Path) -> Iterator[Feedback]:
+    """One JSON object per line, as written by /feedback/export?format=ndjson."""
+    with _open_text(path) as f:
+        for line in f:
+            if line.strip():
+                yield _to_feedback(json.loads(line))
+
+
+def read_csv(path: Path) -> Iterator[Feedback]:
+    """Header row of Feedback fields; metadata_ as JSON text (export format)."""
+    with _open_text(path) as f:
+        for row in csv.DictReader(f):
+            obj: Dict[str, Any] = {k: (v if v != "" else None) for k, v in row.items()}
+            meta = obj.get("metadata_")
+            obj["metadata_"] = json.loads(meta) if meta else {}
+            yield _to_feedback(obj)
+
+
+def read_records(path: Path, fmt: Optional[str] = None) -> Iterator[Feedback]:
+    """Pick a reader from `fmt` or the suffix (.ndjson/.jsonl/.csv, optionally .gz)."""
+    suffixes = [s for s in path.suffixes if s != ".gz"]
+    fmt = fmt or (suffixes[-1].lstrip(".") if suffixes else "")
+    if fmt in ("ndjson", "jsonl", "json"):
+        return read_ndjson(path)
+    if fmt == "csv":
+        return read_csv(path)
+    raise ValueError(f"Unknown input format '{fmt}' (expected ndjson or csv)")
+
+
+def to_copy_row(fb: Feedback) -> Tuple[Any, ...]:
+    """Feedback as a tuple in COPY_COLUMNS order, ready for the binary COPY."""
+    return (
+        fb.id,
+        fb.external_id,
+        fb.source_type,
+        fb.source_instance,
+        fb.tenant_id,
+        as_utc(fb.created_at),
+        as_utc(fb.fetched_at) if fb.fetched_at else None,
+        fb.lang,
+        fb.body,
+        json.dumps(fb.metadata_),
+    )
+
+
+# ── COPY → staging → merge ────────────────────────────────────────────
+async def _load_worker(
+    worker: int,
+    chunks: "asyncio.Queue[Optional[List[Tuple[Any, ...]]]]",
+    result: BulkLoadResult,
+) -> None:
+    stage = f"feedback_stage_{uuid.uuid4().hex[:8]}_{worker}"
+    async with engine.connect() as conn:
+        raw = (await conn.get_raw_connection()).driver_connection
+        # unlogged: the staging copy skips WAL; it's rebuilt from the input anyway
+        await raw.execute(
+            f"CREATE UNLOGGED TABLE {stage} "
+            f"(LIKE {FeedbackORM.__tablename__} INCLUDING DEFAULTS)"
+        )
+        try:
+            while (rows := await chunks.get()) is not None:
+                async with raw.transaction():
+                    await raw.execute(f"TRUNCATE {stage}")
+                    await raw.copy_records_to_table(
+                        stage, records=rows, columns=COPY_COLUMNS
+                    )
+                    # one row per natural key (also within the chunk), none
+                    # whose key is stored under any created_at, skipping
+                    # unique and primary-key clashes; the rows that went in
+                    # are counted into the rollups
+                    inserted = await raw.fetchval(
+                        f"WITH inserted AS ("
+                        f"INSERT INTO {FeedbackORM.__tablename__} ({_COLUMN_LIST}) "
+                        f"SELECT DISTINCT ON ({_KEY_LIST}) {_STAGED_LIST} "
+                        f"FROM {stage} s WHERE NOT EXISTS ("
+                        f"SELECT 1 FROM {FeedbackORM.__tablename__} f "
+                        f"WHERE {_KEY_MATCH}) "
+                        f"ON CONFLICT DO NOTHING RETURNING *), "
+                        f"counted AS ({rollup_upsert_sql('inserted')}) "
+                        f"SELECT count(*) FROM inserted"
+                    )
+                result.inserted += inserted
+                result.duplicates += len(rows) - inserted
+                result.chunks += 1
+                logger.info(
+                    f"Bulk chunk of {len(rows)}: {inserted} inserted, "
+                    f"{len(rows) - inserted} duplicates"
+                )
+        finally:
+            await raw.execute(f"DROP TABLE IF EXISTS {stage}")
+
+
+async def bulk_load(
+    records: FeedbackSource,
+    parallelism: int = 4,
+    chunk_rows: Optional[int] = None,
+) -> BulkLoadResult:
+    """
+    Load records with COPY into per-worker unlogged staging tables, merging
+    each chunk into feedback with INSERT … SELECT … WHERE NOT EXISTS … ON
+    CONFLICT DO NOTHING in its own transaction. At most 2 × `parallelism`
+    chunks of `chunk_rows` rows are held in memory at once, however large the
+    input is. Postgres only.
+    """
+    size = chunk_rows or settings.BULK_LOAD_CHUNK_ROWS
+    result = BulkLoadResult()
+    started = time.monotonic()
+    chunks: asyncio.Queue = asyncio.Queue(maxsize=parallelism * 2)
+    workers = [
+        asyncio.create_task(_load_worker(i, chunks, result))
+        for i in range(parallelism)
+    ]
+
+    async def produce() -> None:
+        async for batch in _chunked(records, size):
+            result.rows += len(batch)
+            await chunks.put([to_copy_row(fb) for fb in batch])
+        for _ in workers:
+            await chunks.put(None)
+
+    producer = asyncio.create_task(produce())
+    try:
+        # a failed worker must stop the producer rather than leave it blocked
+        done, _ = await asyncio.wait(
+            [producer, *workers], return_when=asyncio.FIRST_EXCEPTION
+        )
+        for task in done:
+            task.result()
+        await asyncio.gather(producer, *workers)
+    finally:
+        for task in (producer, *workers):
+            task.cancel()
+        await asyncio.gather(producer, *workers, return_exceptions=True)
+    result.duration_sec = time.monotonic() - started
+    return result
+
+
+async def iter_records(
+    path: Path, fmt: Optional[str] = None
+) -> AsyncIterator[Feedback]:
+    """read_records() as an async iterable, yielding to the loop between chunks."""
+    for i, fb in enumerate(read_records(path, fmt)):
+        yield fb
+        if i % 1000 == 0:
+            await asyncio.sleep(0)
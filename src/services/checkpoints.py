@@ -0,0 +1,169 @@
+# src/services/checkpoints.py
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import case
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.settings import settings
+from core.models import Feedback, is_stub
+from db.models import SourceCheckpointORM
+from db.session import AsyncSessionLocal
+from ports.fetcher import BaseFetcher
+from utils.time_utils import as_utc, utc_now
+
+logger = logging.getLogger(__name__)
+
+
+async def load_checkpoint(
+    tenant_id: str, source_type: str, source_instance: str
+) -> Optional[SourceCheckpointORM]:
+    async with AsyncSessionLocal() as session:
+        return await session.get(
+            SourceCheckpointORM, (tenant_id, source_type, source_instance)
+        )
+
+
+def resume_since(
+    checkpoint: Optional[SourceCheckpointORM], platform: str, now: datetime
+) -> datetime:
+    """
+    Start of the next fetch window: the last record seen minus a small safety
+    overlap, or the platform poll interval when the source has no checkpoint yet.
+    Never reaches back further than CHECKPOINT_MAX_LOOKBACK_SEC.
+    """
+    if checkpoint is None or checkpoint.last_created_at is None:
+        return now - timedelta(seconds=settings.POLL_INTERVALS[platform])
+    since = as_utc(checkpoint.last_created_at) - timedelta(
+        seconds=settings.CHECKPOINT_OVERLAP_SEC
+    )
+    floor = now - timedelta(seconds=settings.CHECKPOINT_MAX_LOOKBACK_SEC)
+    return min(max(since, floor), now)
+
+
+@dataclass
+class CheckpointAdvance:
+    """
+    Pending high-water mark for one source. ingest_many() feeds it every batch
+    and writes it in the same transaction as the final batch, so the checkpoint
+    only moves once everything up to it is stored.
+
+    A stream that stopped part-way (`complete=False`) leaves the high-water
+    mark alone and records the fetcher's last cursor with the fetch window
+    [since, until) and the newest record seen so far instead, so the next
+    pull resumes at that page; a complete stream clears it. `resumed_from`
+    is the cursor this fetch started at.
+    """
+
+    tenant_id: str
+    source_type: str
+    source_instance: str
+    fetcher: Optional[BaseFetcher] = None
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    resumed_from: Optional[str] = None
+    last_created_at: Optional[datetime] = None
+    complete: bool = True
+
+    def observe(self, batch: Iterable[Feedback]) -> None:
+        for fb in batch:
+            if is_stub(fb):
+                continue
+            created_at = as_utc(fb.created_at)
+            if self.last_created_at is None or created_at > self.last_created_at:
+                self.last_created_at = created_at
+
+    @property
+    def cursor(self) -> Optional[str]:
+        """Where the next pull resumes; None once the window was covered."""
+        if self.complete or self.fetcher is None or self.since is None:
+            return None
+        return self.fetcher.last_cursor
+
+    @property
+    def pending(self) -> bool:
+        """Whether write() has anything to store."""
+        if self.complete and self.last_created_at is not None:
+            return True
+        # set a resume cursor, or clear the one this fetch started from
+        return self.cursor is not None or self.resumed_from is not None
+
+    async def write(self, session: AsyncSession) -> None:
+        """Upsert the checkpoint; the high-water mark never moves backwards."""
+        if not self.pending:
+            return
+        cursor = self.cursor
+        values = {
+            "tenant_id": self.tenant_id,
+            "source_type": self.source_type,
+            "source_instance": self.source_instance,
+            "last_created_at": self.last_created_at if self.complete else None,
+            "last_cursor": cursor,
+            "cursor_since": self.since if cursor else None,
+            "cursor_until": self.until if cursor else None,
+            "cursor_last_created_at": self.last_created_at if cursor else None,
+            "updated_at": utc_now(),
+        }
+        insert = sqlite_insert if session.bind.dialect.name == "sqlite" else pg_insert
+        stmt = insert(SourceCheckpointORM).values(values)
+        current = SourceCheckpointORM.last_created_at
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["tenant_id", "source_type", "source_instance"],
+            set_={
+                "last_created_at": case(
+                    (
+                        current.is_(None)
+                        | (stmt.excluded.last_created_at > current),
+                        stmt.excluded.last_created_at,
+                    ),
+                    else_=current,
+                ),
+                "last_cursor": stmt.excluded.last_cursor,
+                "cursor_since": stmt.excluded.cursor_since,
+                "cursor_until": stmt.excluded.cursor_until,
+                "cursor_last_created_at": stmt.excluded.cursor_last_created_at,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        await session.execute(stmt)
+        high_water = values["last_created_at"]
+        logger.debug(
+            f"Checkpoint {self.tenant_id}:{self.source_type}:{self.source_instance} "
+            f"→ {high_water.isoformat() if high_water else 'unchanged'}"
+            + (f", resume at cursor {cursor}" if cursor else "")
+        )
+
+
+def next_pull(
+    checkpoint: Optional[SourceCheckpointORM],
+    tenant_id: str,
+    source_type: str,
+    source_instance: str,
+    now: datetime,
+    fetcher: Optional[BaseFetcher] = None,
+) -> CheckpointAdvance:
+    """
+    The window (and cursor) of a source's next pull: the rest of a pull that
+    stopped part-way, picked up at its cursor, or else resume_since() to now.
+    """
+    advance = CheckpointAdvance(tenant_id, source_type, source_instance, fetcher)
+    if (
+        checkpoint is not None
+        and checkpoint.last_cursor
+        and checkpoint.cursor_since is not None
+        and checkpoint.cursor_until is not None
+    ):
+        advance.since = as_utc(checkpoint.cursor_since)
+        advance.until = as_utc(checkpoint.cursor_until)
+        advance.resumed_from = checkpoint.last_cursor
+        if checkpoint.cursor_last_created_at is not None:
+            # the whole window counts once the resumed pull completes
+            advance.last_created_at = as_utc(checkpoint.cursor_last_created_at)
+    else:
+        advance.since = resume_since(checkpoint, source_type, now)
+        advance.until = now
+    return advance
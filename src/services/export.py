@@ -0,0 +1,118 @@
+# src/services/export.py
+import csv
+import importlib.util
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, Sequence
+from uuid import UUID
+
+from sqlalchemy import Row
+
+from db.models import FeedbackORM
+
+EXPORT_COLUMNS = [c.name for c in FeedbackORM.__table__.columns]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+RowBatches = AsyncIterator[Sequence[Row]]
+
+
+def arrow_available() -> bool:
+    """pyarrow is an optional dependency (the 'arrow' extra)."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialise {type(value).__name__}")
+
+
+async def ndjson_chunks(batches: RowBatches) -> AsyncIterator[bytes]:
+    """One JSON object per line, one chunk per row batch."""
+    async for rows in batches:
+        lines = [
+            json.dumps(dict(zip(EXPORT_COLUMNS, row)), default=_json_default)
+            for row in rows
+        ]
+        yield ("\n".join(lines) + "\n").encode()
+
+
+async def csv_chunks(batches: RowBatches) -> AsyncIterator[bytes]:
+    """Header row first; metadata_ is embedded as a JSON string."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(EXPORT_COLUMNS)
+    meta_idx = EXPORT_COLUMNS.index("metadata_")
+    async for rows in batches:
+        for row in rows:
+            values = list(row)
+            values[meta_idx] = json.dumps(values[meta_idx], default=_json_default)
+            writer.writerow(values)
+        yield buf.getvalue().encode()
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode()
+
+
+async def arrow_chunks(batches: RowBatches) -> AsyncIterator[bytes]:
+    """Arrow IPC stream: the schema, then one record batch per row batch."""
+    import pyarrow as pa
+
+    schema = pa.schema(
+        [
+            ("id", pa.string()),
+            ("external_id", pa.string()),
+            ("source_type", pa.string()),
+            ("source_instance", pa.string()),
+            ("tenant_id", pa.string()),
+            ("created_at", pa.timestamp("us", tz="UTC")),
+            ("fetched_at", pa.timestamp("us", tz="UTC")),
+            ("lang", pa.string()),
+            ("body", pa.string()),
+            ("metadata_", pa.string()),  # JSON text
+        ]
+    )
+    sink = io.BytesIO()
+    writer = pa.ipc.new_stream(sink, schema)
+    async for rows in batches:
+        columns: Dict[str, list] = {name: [] for name in EXPORT_COLUMNS}
+        for row in rows:
+            for name, value in zip(EXPORT_COLUMNS, row):
+                columns[name].append(value)
+        columns["id"] = [str(v) for v in columns["id"]]
+        columns["metadata_"] = [
+            json.dumps(v, default=_json_default) for v in columns["metadata_"]
+        ]
+        writer.write_batch(pa.record_batch(columns, schema=schema))
+        yield sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+    writer.close()
+    yield sink.getvalue()
+
+
+FORMATTERS: Dict[str, Callable[[RowBatches], AsyncIterator[bytes]]] = {
+    "ndjson": ndjson_chunks,
+    "csv": csv_chunks,
+    "arrow": arrow_chunks,
+}
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Gzip a byte stream incrementally (one gzip member, flushed per chunk)."""
+    compressor = zlib.compressobj(wbits=31)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
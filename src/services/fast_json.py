@@ -0,0 +1,62 @@
+# src/services/fast_json.py
+"""
+/feedback responses written straight from database rows (API_FAST_JSON).
+
+The default path validates every row into a Feedback, then FastAPI checks it
+against the response model again and jsonable_encoder() walks it into plain
+dicts before json.dumps. Here each row is encoded to bytes once, with orjson
+when it is installed (the 'json' extra). metadata_ is selected as JSON text
+and spliced into the output as is, so large JSONB blobs are never decoded
+and re-encoded.
+"""
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import Row, Text, cast
+
+from core.models import FEEDBACK_FIELDS
+from db.models import FeedbackORM
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+# metadata_ is the last field: every other column, then its JSON text
+_SCALAR_FIELDS = FEEDBACK_FIELDS[:-1]
+RAW_COLUMNS = [FeedbackORM.__table__.c[name] for name in _SCALAR_FIELDS] + [
+    cast(FeedbackORM.metadata_, Text).label("metadata_")
+]
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialise {type(value).__name__}")
+
+
+def dumps(value: Any) -> bytes:
+    """Compact JSON bytes; UUIDs and datetimes as in the pydantic responses."""
+    if orjson is not None:
+        # asyncpg returns its own UUID subclass, which orjson hands to default
+        return orjson.dumps(value, default=_json_default)
+    return json.dumps(
+        value, default=_json_default, ensure_ascii=False, separators=(",", ":")
+    ).encode()
+
+
+def feedback_json(row: Row) -> bytes:
+    """One Feedback object from a row selected with RAW_COLUMNS."""
+    *scalars, metadata = row
+    head = dumps(dict(zip(_SCALAR_FIELDS, scalars)))
+    return b'%s,"metadata_":%s}' % (head[:-1], metadata.encode())
+
+
+def feedback_page_json(rows: Sequence[Row], next_cursor: Optional[str]) -> bytes:
+    """A FeedbackPage body."""
+    items = b",".join([feedback_json(row) for row in rows])
+    return b'{"items":[%s],"next_cursor":%s}' % (items, dumps(next_cursor))
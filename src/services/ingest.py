@@ -1,35 +1,356 @@
 # src/services/ingest.py
+import asyncio
 import logging
+from dataclasses import dataclass, field
+from operator import attrgetter
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from uuid import UUID
 
+from sqlalchemy import Executable, cast, column, exists, select, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from config.settings import settings
+from core.metrics import INGESTED_ROWS
 from core.models import Feedback
-from db.models import FeedbackORM
+from db.models import (
+    FEEDBACK_NATURAL_KEY,
+    FEEDBACK_UNIQUE_COLUMNS,
+    FEEDBACK_UNIQUE_CONSTRAINT,
+    FeedbackORM,
+)
 from db.session import AsyncSessionLocal
+from services.checkpoints import CheckpointAdvance
+from services.lang_detect import lang_detector
+from services.read_cache import read_cache
+from services.rollups import add_to_rollups
+from services.seen import seen_key, seen_keys
 
 logger = logging.getLogger(__name__)
 
+FeedbackSource = Union[Iterable[Feedback], AsyncIterable[Feedback]]
 
-async def ingest(feedback: Feedback) -> bool:
+
+@dataclass
+class BatchResult:
+    """Outcome of writing one chunk of records in a single transaction."""
+
+    inserted: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    inserted_ids: List[UUID] = field(default_factory=list)
+
+    def merge(self, other: "BatchResult") -> None:
+        self.inserted += other.inserted
+        self.duplicates += other.duplicates
+        self.failed += other.failed
+        self.inserted_ids.extend(other.inserted_ids)
+
+
+@dataclass
+class IngestResult:
+    """Per-batch results of an ingest_many() call, plus totals."""
+
+    batches: List[BatchResult] = field(default_factory=list)
+
+    @property
+    def inserted(self) -> int:
+        return sum(b.inserted for b in self.batches)
+
+    @property
+    def duplicates(self) -> int:
+        return sum(b.duplicates for b in self.batches)
+
+    @property
+    def failed(self) -> int:
+        return sum(b.failed for b in self.batches)
+
+    @property
+    def inserted_ids(self) -> List[UUID]:
+        return [i for b in self.batches for i in b.inserted_ids]
+
+
+_natural_key = attrgetter(*FEEDBACK_NATURAL_KEY)
+
+
+def _insert_ignoring_duplicates(batch: List[Feedback]) -> Executable:
     """
-    Insert a Feedback record. Returns True if inserted, False if a duplicate or on error.
-    This version simply ADDs the ORM object and relies on the DB's unique constraint
-    (tenant_id, source_type, external_id, source_instance) turning duplicates into
-    IntegrityError, which we catch and treat as "not inserted".
+    Build a single Postgres INSERT … SELECT that skips records whose natural
+    key is already stored, under any created_at (NOT EXISTS over every
+    partition), and anything else the unique constraint catches (ON CONFLICT
+    ON CONSTRAINT … DO NOTHING), returning the ids it inserted.
     """
+    columns = FeedbackORM.__table__.columns
+    incoming = values(
+        *(column(c.name, c.type) for c in columns), name="incoming"
+    ).data([fb.to_row() for fb in batch])
+    stored = FeedbackORM.__table__.alias("stored")
+    # source_instance may be NULL
+    already_stored = exists().where(
+        *(
+            stored.c[name].is_not_distinct_from(incoming.c[name])
+            for name in FEEDBACK_NATURAL_KEY
+        )
+    )
+    # a VALUES column that is NULL in every row is typed text; cast each one
+    typed = [cast(incoming.c[c.name], c.type) for c in columns]
+    return (
+        pg_insert(FeedbackORM)
+        .from_select(
+            [c.name for c in columns], select(*typed).where(~already_stored)
+        )
+        .on_conflict_do_nothing(constraint=FEEDBACK_UNIQUE_CONSTRAINT)
+        .returning(FeedbackORM.id)
+    )
+
+
+async def _execute_insert(
+    session: AsyncSession, batch: List[Feedback]
+) -> List[Feedback]:
+    """Insert `batch` minus its duplicates; returns the records inserted."""
+    # one row per key: a repeat within the batch is a duplicate like any other
+    unique: Dict[Tuple[Any, ...], Feedback] = {}
+    for fb in batch:
+        unique.setdefault(_natural_key(fb), fb)
+    by_id = {fb.id: fb for fb in unique.values()}
+    return [by_id[i] for i in await _insert_unique(session, list(unique.values()))]
+
+
+async def _insert_unique(session: AsyncSession, batch: List[Feedback]) -> List[UUID]:
+    if session.bind.dialect.name != "sqlite":
+        result = await session.execute(_insert_ignoring_duplicates(batch))
+        return list(result.scalars())
+
+    # SQLite (tests): look the keys up first, then insert the rest
+    stored = await session.execute(
+        select(*(FeedbackORM.__table__.c[name] for name in FEEDBACK_NATURAL_KEY))
+        .where(FeedbackORM.external_id.in_({fb.external_id for fb in batch}))
+    )
+    known = {tuple(row) for row in stored}
+    fresh = [fb.to_row() for fb in batch if _natural_key(fb) not in known]
+    if not fresh:
+        return []
+    result = await session.execute(
+        sqlite_insert(FeedbackORM)
+        .values(fresh)
+        .on_conflict_do_nothing(index_elements=list(FEEDBACK_UNIQUE_COLUMNS))
+        .returning(FeedbackORM.id)
+    )
+    return list(result.scalars())
+
+
+async def _write_checkpoint(checkpoint: CheckpointAdvance) -> None:
     async with AsyncSessionLocal() as session:
         try:
-            # build ORM instance directly
-            obj = FeedbackORM(**feedback.dict())
-            session.add(obj)
+            await checkpoint.write(session)
             await session.commit()
-            logger.info(f"Inserted feedback: {feedback.external_id}")
-            return True
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Error writing checkpoint for {checkpoint.source_type}: {e}")
+
+
+async def _write_batch(
+    batch: List[Feedback],
+    checkpoint: Optional[CheckpointAdvance] = None,
+    remember: bool = True,
+) -> BatchResult:
+    async with AsyncSessionLocal() as session:
+        try:
+            stored = await _execute_insert(session, batch)
+            inserted_ids = [fb.id for fb in stored]
+            await add_to_rollups(session, stored)
+            if checkpoint:
+                await checkpoint.write(session)
+            await session.commit()
+            # cached /feedback pages of these tenants may now miss rows
+            read_cache.invalidate({fb.tenant_id for fb in stored})
         except IntegrityError:
             await session.rollback()
-            logger.info(f"Duplicate feedback skipped: {feedback.external_id}")
-            return False
+            if len(batch) == 1:
+                # e.g. a primary-key clash: same outcome as a duplicate
+                return BatchResult(duplicates=1)
+            # A conflict outside the dedup constraint aborts the whole statement;
+            # retry row by row so one bad record doesn't sink the rest.
+            logger.warning(
+                f"Batch of {len(batch)} hit a non-dedup conflict; retrying per row"
+            )
+            result = BatchResult()
+            for fb in batch:
+                result.merge(await _write_batch([fb], remember=remember))
+            if checkpoint and not result.failed:
+                await _write_checkpoint(checkpoint)
+            return result
         except Exception as e:
             await session.rollback()
-            logger.error(f"Error ingesting feedback {feedback.external_id}: {e}")
-            return False
+            logger.error(f"Error ingesting batch of {len(batch)} feedback records: {e}")
+            return BatchResult(failed=len(batch))
+
+    # inserted or skipped by the dedup constraint: either way the key is stored
+    if remember:
+        seen_keys.add_many(seen_key(fb) for fb in batch)
+    return BatchResult(
+        inserted=len(inserted_ids),
+        duplicates=len(batch) - len(inserted_ids),
+        inserted_ids=inserted_ids,
+    )
+
+
+async def _write_unseen(
+    batch: List[Feedback],
+    checkpoint: Optional[CheckpointAdvance] = None,
+    remember: bool = True,
+) -> BatchResult:
+    """_write_batch() for the records the seen-key filter doesn't already know."""
+    unseen = [fb for fb in batch if seen_key(fb) not in seen_keys]
+    skipped = len(batch) - len(unseen)
+    if unseen:
+        try:
+            await lang_detector.fill_missing(unseen)
+        except Exception as e:
+            # lang is optional; backfill_missing_langs() can fill it in later
+            logger.warning(
+                f"Language detection failed for batch of {len(unseen)}; "
+                f"writing without it: {e}"
+            )
+        result = await _write_batch(unseen, checkpoint, remember)
+    else:
+        result = BatchResult()
+        if checkpoint:
+            await _write_checkpoint(checkpoint)
+    result.duplicates += skipped
+    _count_rows(batch, result)
+    return result
+
+
+def _count_rows(batch: List[Feedback], result: BatchResult) -> None:
+    source_type = batch[0].source_type
+    if any(fb.source_type != source_type for fb in batch):
+        source_type = "mixed"
+    for outcome, rows in (
+        ("inserted", result.inserted),
+        ("duplicate", result.duplicates),
+        ("failed", result.failed),
+    ):
+        if rows:
+            INGESTED_ROWS.labels(source_type, outcome).inc(rows)
+
+
+async def _chunked(records: FeedbackSource, size: int) -> AsyncIterator[List[Feedback]]:
+    batch: List[Feedback] = []
+    try:
+        if isinstance(records, AsyncIterable):
+            async for fb in records:
+                batch.append(fb)
+                if len(batch) >= size:
+                    yield batch
+                    batch = []
+        else:
+            for fb in records:
+                batch.append(fb)
+                if len(batch) >= size:
+                    yield batch
+                    batch = []
+    except (Exception, asyncio.CancelledError):
+        # a stream failing part-way still hands over what it produced first
+        if batch:
+            yield batch
+        raise
+    if batch:
+        yield batch
+
+
+async def ingest_many(
+    records: FeedbackSource,
+    batch_size: Optional[int] = None,
+    checkpoint: Optional[CheckpointAdvance] = None,
+    remember: bool = True,
+) -> IngestResult:
+    """
+    Insert Feedback records in fixed-size chunks, one transaction per chunk.
+    On Postgres each chunk is a single INSERT … SELECT that skips rows whose
+    natural key is already stored (NOT EXISTS, plus ON CONFLICT ON CONSTRAINT
+    uq_feedback_tenant_source_external DO NOTHING), RETURNING id, so
+    duplicates cost nothing beyond the statement.
+    Keys the seen-key filter already knows are counted as duplicates without
+    reaching the database at all.
+    Accepts a plain or async iterable. With remember=False (historical
+    backfills) written keys aren't added to the filter, so old records don't
+    evict the recent ones live polling keeps re-fetching.
+
+    With a `checkpoint`, the source's high-water mark is written in the same
+    transaction as the last chunk, and only if the stream ran to completion.
+    A stream that fails part-way or is cancelled (a pull timeout), with every
+    chunk so far stored, records the fetcher's last cursor instead so the
+    next pull resumes from it.
+    """
+    size = batch_size or settings.INGEST_BATCH_SIZE
+    result = IngestResult()
+
+    async def write(batch: List[Feedback], final: bool = False) -> None:
+        batch_result = await _write_unseen(
+            batch, checkpoint if final else None, remember
+        )
+        logger.info(
+            f"Ingested batch of {len(batch)}: {batch_result.inserted} inserted, "
+            f"{batch_result.duplicates} duplicates, {batch_result.failed} failed"
+        )
+        result.batches.append(batch_result)
+
+    if checkpoint is None:
+        async for batch in _chunked(records, size):
+            await write(batch)
+        return result
+
+    # hold one chunk back so the last one can carry the checkpoint; a chunk
+    # stays in `unwritten` until its write returns
+    unwritten: List[List[Feedback]] = []
+    try:
+        async for batch in _chunked(records, size):
+            checkpoint.observe(batch)
+            unwritten.append(batch)
+            while len(unwritten) > 1:
+                await write(unwritten[0])
+                unwritten.pop(0)
+    except (Exception, asyncio.CancelledError):
+        # e.g. a failed page, or a pull cancelled at its timeout: store what
+        # was fetched and the cursor to resume from, which would skip any
+        # record that failed to write
+        checkpoint.complete = False
+        for i, batch in enumerate(unwritten):
+            final = i == len(unwritten) - 1 and not result.failed
+            await write(batch, final=final)
+        if not unwritten and not result.failed and checkpoint.pending:
+            await _write_checkpoint(checkpoint)
+        raise
+    if unwritten:
+        await write(unwritten[0], final=True)
+    elif checkpoint.pending:
+        # nothing came back, but a resumed fetch still has to clear its cursor
+        await _write_checkpoint(checkpoint)
+    return result
+
+
+async def ingest(feedback: Feedback) -> bool:
+    """
+    Insert a single Feedback record. Returns True if inserted, False if a duplicate
+    or on error. Duplicates on (tenant_id, source_type, external_id, source_instance)
+    are skipped by the INSERT itself rather than surfacing as an IntegrityError.
+    """
+    result = await _write_unseen([feedback])
+    if result.inserted:
+        logger.info(f"Inserted feedback: {feedback.external_id}")
+    elif result.duplicates:
+        logger.info(f"Duplicate feedback skipped: {feedback.external_id}")
+    return result.inserted == 1
@@ -0,0 +1,230 @@
+# src/services/lang_detect.py
+"""
+Language detection for feedback that arrives without a lang (Twitter and
+Discourse never set one), with fastText's offline language identification
+model (lid.176.ftz, character n-grams, 176 languages) through fasttext-predict
+(the "lang" extra). Batches run in a pool of worker processes, each holding
+its own copy of the model, so the event loop only awaits them. Without the
+package, without LANG_DETECT_MODEL, or with LANG_DETECT_WORKERS=0, records
+keep lang=None.
+
+ingest_many() fills in the records it is about to insert;
+backfill_missing_langs() (scripts/detect_langs.py) does the stored rows.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select, tuple_, update
+
+from config.settings import settings
+from core.metrics import LANG_DETECTED
+from core.models import Feedback
+from db.models import FeedbackORM
+from db.session import AsyncSessionLocal
+from services.read_cache import read_cache
+from services.rollups import move_in_rollups
+
+try:
+    import fasttext
+except ImportError:  # optional: pip install fasttext-predict (the "lang" extra)
+    fasttext = None
+
+logger = logging.getLogger(__name__)
+
+DetectFn = Callable[[Sequence[str], float, str], List[Optional[str]]]
+_LABEL_PREFIX = "__label__"
+# per worker process: model path → loaded model
+_models: Dict[str, Any] = {}
+
+
+def model_available() -> bool:
+    return fasttext is not None and os.path.isfile(settings.LANG_DETECT_MODEL)
+
+
+def detect_batch(
+    texts: Sequence[str], min_prob: float, model_path: str
+) -> List[Optional[str]]:
+    """
+    Runs in a pool process. The most likely language code of each text, or
+    None when its probability is below `min_prob`.
+    """
+    model = _models.get(model_path)
+    if model is None:
+        model = _models[model_path] = fasttext.load_model(model_path)
+    langs: List[Optional[str]] = []
+    for text in texts:
+        # predict() works line by line
+        labels, probs = model.predict(" ".join(text.split()), k=1)
+        if labels and probs[0] >= min_prob:
+            langs.append(labels[0][len(_LABEL_PREFIX) :])
+        else:
+            langs.append(None)
+    return langs
+
+
+class LanguageDetector:
+    """
+    Fills in Feedback.lang where it is None, fanning each call out over the
+    worker processes in tasks of at most `batch_size` bodies. The pool is
+    started on first use; a broken pool (a killed worker) is replaced on the
+    next call. Detection failures leave lang=None and never fail the caller.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        detect: DetectFn = detect_batch,
+    ):
+        self.workers = settings.LANG_DETECT_WORKERS if workers is None else workers
+        self.batch_size = batch_size or settings.LANG_DETECT_BATCH
+        self._detect = detect
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def enabled(self) -> bool:
+        if self.workers <= 0:
+            return False
+        return self._detect is not detect_batch or model_available()
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: forking a process that runs an event loop and driver
+            # threads can copy held locks into the children
+            self._pool = ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    async def fill_missing(self, records: Sequence[Feedback]) -> int:
+        """Detect and set lang on the records without one; returns how many got one."""
+        if not self.enabled:
+            return 0
+        # a word or two gives the model too little to go on
+        todo = [
+            fb
+            for fb in records
+            if fb.lang is None
+            and len((fb.body or "").strip()) >= settings.LANG_DETECT_MIN_CHARS
+        ]
+        if not todo:
+            return 0
+        texts = [fb.body[: settings.LANG_DETECT_MAX_CHARS] for fb in todo]
+        # spread even a small batch over every worker
+        size = min(self.batch_size, -(-len(texts) // self.workers))
+        loop = asyncio.get_running_loop()
+        pool = self._executor()
+        try:
+            parts = await asyncio.gather(
+                *(
+                    loop.run_in_executor(
+                        pool,
+                        self._detect,
+                        texts[i : i + size],
+                        settings.LANG_DETECT_MIN_PROB,
+                        settings.LANG_DETECT_MODEL,
+                    )
+                    for i in range(0, len(texts), size)
+                )
+            )
+        except Exception as e:
+            logger.warning(f"Language detection failed for {len(todo)} records: {e}")
+            LANG_DETECTED.labels("failed").inc(len(todo))
+            if isinstance(e, BrokenProcessPool):
+                self.shutdown(wait=False)
+            return 0
+
+        detected = 0
+        for fb, lang in zip(todo, (lang for part in parts for lang in part)):
+            if lang is not None:
+                fb.lang = lang
+                detected += 1
+        LANG_DETECTED.labels("detected").inc(detected)
+        LANG_DETECTED.labels("undetermined").inc(len(todo) - detected)
+        return detected
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+
+lang_detector = LanguageDetector()
+
+
+async def backfill_missing_langs(
+    tenant_id: Optional[str] = None,
+    source_type: Optional[str] = None,
+    batch_size: Optional[int] = None,
+    detector: Optional[LanguageDetector] = None,
+) -> Tuple[int, int]:
+    """
+    Detect the language of stored rows with lang IS NULL, oldest first, one
+    transaction per `batch_size` rows, moving their rollup counts from the ''
+    language to the detected one. Rows set concurrently by someone else are
+    left alone. Cached responses of the tenants updated are invalidated in
+    this process; an API elsewhere serves them until their TTL runs out.
+    Returns (rows scanned, rows updated).
+    """
+    detector = detector or lang_detector
+    size = batch_size or settings.INGEST_BATCH_SIZE
+    key = tuple_(FeedbackORM.created_at, FeedbackORM.id)
+    scope = [FeedbackORM.lang.is_(None)]
+    if tenant_id is not None:
+        scope.append(FeedbackORM.tenant_id == tenant_id)
+    if source_type is not None:
+        scope.append(FeedbackORM.source_type == source_type)
+
+    scanned = updated = 0
+    after = None
+    while True:
+        async with AsyncSessionLocal() as session:
+            filters = scope if after is None else [*scope, key > tuple_(*after)]
+            result = await session.execute(
+                select(*FeedbackORM.__table__.columns)
+                .where(*filters)
+                .order_by(FeedbackORM.created_at, FeedbackORM.id)
+                .limit(size)
+            )
+            rows = result.fetchall()
+            if not rows:
+                break
+            after = (rows[-1].created_at, rows[-1].id)
+            records = [Feedback.from_row(row) for row in rows]
+            await detector.fill_missing(records)
+
+            by_lang = {}
+            for fb in records:
+                if fb.lang is not None:
+                    by_lang.setdefault(fb.lang, []).append(fb.id)
+            changed = set()
+            for lang, ids in by_lang.items():
+                # created_at bounds let Postgres prune to the batch's partitions
+                stmt = (
+                    update(FeedbackORM)
+                    .where(
+                        FeedbackORM.id.in_(ids),
+                        FeedbackORM.created_at.between(
+                            rows[0].created_at, rows[-1].created_at
+                        ),
+                        FeedbackORM.lang.is_(None),
+                    )
+                    .values(lang=lang)
+                    .returning(FeedbackORM.id)
+                )
+                changed.update((await session.execute(stmt)).scalars())
+            moved = [fb for fb in records if fb.id in changed]
+            await move_in_rollups(
+                session, [fb.copy(update={"lang": None}) for fb in moved], moved
+            )
+            await session.commit()
+        read_cache.invalidate({fb.tenant_id for fb in moved})
+        scanned += len(rows)
+        updated += len(changed)
+        logger.info(f"Language backfill: {updated} of {scanned} rows updated so far")
+    return scanned, updated
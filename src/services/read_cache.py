@@ -0,0 +1,129 @@
+# src/services/read_cache.py
+import asyncio
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from config.settings import settings
+from core.metrics import READ_CACHE_LOOKUPS
+
+# rough per-entry bookkeeping on top of the body (key tuple, dict slots)
+_ENTRY_OVERHEAD = 256
+
+
+class ReadCache:
+    """
+    In-process cache of /feedback response bodies: a TTL'd LRU bounded by
+    the bytes it holds. Keys carry the tenant's generation, which ingest
+    bumps whenever it stores rows for that tenant (and the language backfill
+    when it updates some), so a write makes the tenant's cached pages and
+    rows unreachable at once and leaves other tenants' alone. Concurrent misses on one key share a single load.
+
+    Generations are per process: writes made by other processes (pull
+    workers in PULL_MODE=queue, bulk loads, other API replicas) show up
+    once the entry's TTL runs out.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, ttl: Optional[float] = None):
+        self.max_bytes = (
+            settings.READ_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        )
+        self.ttl = settings.READ_CACHE_TTL_SEC if ttl is None else ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, bytes]]" = OrderedDict()
+        self._loading: Dict[Hashable, asyncio.Task] = {}
+        self._generations: Dict[str, int] = defaultdict(int)
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def generation(self, tenant_id: str) -> int:
+        return self._generations[tenant_id]
+
+    def invalidate(self, tenant_ids: Iterable[str]) -> None:
+        """Called after rows for these tenants were committed."""
+        for tenant_id in tenant_ids:
+            self._generations[tenant_id] += 1
+
+    async def get(
+        self,
+        endpoint: str,
+        tenant_id: str,
+        params: Tuple[Any, ...],
+        load: Callable[[], Awaitable[bytes]],
+    ) -> bytes:
+        """The cached body for `params`, or `load()`'s result."""
+        if self.max_bytes <= 0 or self.ttl <= 0:
+            return await load()
+        key = (endpoint, tenant_id, self.generation(tenant_id), params)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self._count(endpoint, "hit")
+                return entry[1]
+            self._drop(key)
+
+        task = self._loading.get(key)
+        if task is None:
+            self._count(endpoint, "miss")
+            task = asyncio.ensure_future(load())
+            self._loading[key] = task
+            task.add_done_callback(lambda t: self._loaded(key, t))
+        else:
+            self._count(endpoint, "coalesced")
+        # a cancelled caller leaves the load running for the others
+        return await asyncio.shield(task)
+
+    def _loaded(self, key: Hashable, task: asyncio.Task) -> None:
+        self._loading.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        body = task.result()
+        size = len(body) + _ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (time.monotonic() + self.ttl, body)
+        self.size_bytes += size
+        while self.size_bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _drop(self, key: Hashable) -> None:
+        _, body = self._entries.pop(key)
+        self.size_bytes -= len(body) + _ENTRY_OVERHEAD
+
+    def _count(self, endpoint: str, result: str) -> None:
+        if result == "hit":
+            self.hits += 1
+        elif result == "miss":
+            self.misses += 1
+        else:
+            self.coalesced += 1
+        READ_CACHE_LOOKUPS.labels(endpoint, result).inc()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._loading.clear()
+        self._generations.clear()
+        self.size_bytes = 0
+        self.hits = self.misses = self.coalesced = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self.size_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+        }
+
+
+read_cache = ReadCache()
@@ -0,0 +1,266 @@
+# src/services/rollups.py
+"""
+Feedback volume per tenant, source_type, source_instance, lang and UTC hour
+or day (feedback_rollups), for /feedback/stats.
+
+Counters are bumped in the same transaction as the feedback INSERT, for the
+rows it actually inserted, so they never count a duplicate or a rolled-back
+batch. Rollups outlive expired feedback partitions. rebuild_rollups() recounts
+a range from the feedback table (scripts/rebuild_rollups.py) after a repair.
+"""
+import logging
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, and_, delete, func, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.models import Feedback
+from db.models import FeedbackORM, FeedbackRollupORM
+from db.session import AsyncSessionLocal
+from utils.time_utils import as_utc
+
+logger = logging.getLogger(__name__)
+
+GRANULARITIES = ("hour", "day")
+DIMENSIONS = ("source_type", "source_instance", "lang")
+# /feedback/stats range when the caller gives no start
+DEFAULT_SPAN = {"hour": timedelta(hours=48), "day": timedelta(days=30)}
+
+# (tenant_id, granularity, bucket, source_type, source_instance, lang)
+RollupKey = Tuple[str, str, datetime, str, str, str]
+_KEY_COLUMNS = [c.name for c in FeedbackRollupORM.__table__.primary_key]
+# rows per upsert statement, well under the bind parameter limits
+_UPSERT_ROWS = 2000
+
+
+def bucket_start(at: datetime, granularity: str) -> datetime:
+    """Start of the UTC hour or day holding `at` (naive datetimes are UTC)."""
+    at = as_utc(at).astimezone(timezone.utc)
+    at = at.replace(minute=0, second=0, microsecond=0)
+    return at.replace(hour=0) if granularity == "day" else at
+
+
+def count_rollups(records: Iterable[Feedback]) -> "Counter[RollupKey]":
+    counts: "Counter[RollupKey]" = Counter()
+    for fb in records:
+        for granularity in GRANULARITIES:
+            counts[
+                (
+                    fb.tenant_id,
+                    granularity,
+                    bucket_start(fb.created_at, granularity),
+                    fb.source_type,
+                    fb.source_instance or "",
+                    fb.lang or "",
+                )
+            ] += 1
+    return counts
+
+
+async def _upsert(
+    session: AsyncSession, counts: "Counter[RollupKey]", replace: bool = False
+) -> None:
+    # sorted keys: concurrent batches lock shared rollup rows in the same
+    # order, so they queue behind each other instead of deadlocking
+    rows = [
+        {**dict(zip(_KEY_COLUMNS, key)), "count": n}
+        for key, n in sorted(counts.items())
+    ]
+    insert = sqlite_insert if session.bind.dialect.name == "sqlite" else pg_insert
+    for i in range(0, len(rows), _UPSERT_ROWS):
+        stmt = insert(FeedbackRollupORM).values(rows[i : i + _UPSERT_ROWS])
+        added = stmt.excluded["count"]
+        await session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=_KEY_COLUMNS,
+                set_={"count": added if replace else FeedbackRollupORM.count + added},
+            )
+        )
+
+
+async def add_to_rollups(session: AsyncSession, records: Sequence[Feedback]) -> None:
+    """Count just-inserted `records` in the session's (uncommitted) transaction."""
+    if records:
+        await _upsert(session, count_rollups(records))
+
+
+async def move_in_rollups(
+    session: AsyncSession, before: Sequence[Feedback], after: Sequence[Feedback]
+) -> None:
+    """
+    Move stored rows whose dimensions changed (e.g. a lang filled in later)
+    from their `before` buckets to their `after` ones, in the session's
+    transaction. Buckets left at zero are deleted.
+    """
+    counts = count_rollups(after)
+    counts.subtract(count_rollups(before))
+    moved = Counter({key: n for key, n in counts.items() if n})
+    if not moved:
+        return
+    await _upsert(session, moved)
+    emptied = [key for key, n in moved.items() if n < 0]
+    if emptied:
+        await session.execute(
+            delete(FeedbackRollupORM).where(
+                tuple_(*FeedbackRollupORM.__table__.primary_key).in_(emptied),
+                FeedbackRollupORM.count == 0,
+            )
+        )
+
+
+def rollup_upsert_sql(source: str) -> str:
+    """
+    Postgres INSERT … SELECT adding the rows of `source` (a table or CTE with
+    tenant_id, source_type, source_instance, lang and created_at) to the
+    rollups, for SQL-side inserts such as the bulk loader's merge.
+    """
+    table = FeedbackRollupORM.__tablename__
+    keys = ", ".join(_KEY_COLUMNS)
+    return (
+        f"INSERT INTO {table} ({keys}, count) "
+        f"SELECT tenant_id, g, "
+        f"date_trunc(g, created_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC', "
+        f"source_type, coalesce(source_instance, ''), coalesce(lang, ''), count(*) "
+        f"FROM {source} CROSS JOIN unnest(ARRAY{list(GRANULARITIES)}) AS g "
+        f"GROUP BY 1, 2, 3, 4, 5, 6 ORDER BY 1, 2, 3, 4, 5, 6 "
+        f"ON CONFLICT ({keys}) DO UPDATE SET count = {table}.count + EXCLUDED.count"
+    )
+
+
+def _hour_bucket(dialect_name: str):
+    if dialect_name == "sqlite":
+        return func.strftime("%Y-%m-%d %H:00:00", FeedbackORM.created_at)
+    return func.date_trunc("hour", func.timezone("UTC", FeedbackORM.created_at))
+
+
+def _as_bucket(value) -> datetime:
+    # Postgres returns a naive UTC timestamp, SQLite a string
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return as_utc(value)
+
+
+async def rebuild_rollups(
+    tenant_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> int:
+    """
+    Recount the rollups of `tenant_id` (default: every tenant) for
+    [since, until), widened to whole UTC days, from the feedback table, in one
+    transaction. Ingest waits on it rather than racing it. Returns the number
+    of rollup rows written.
+    """
+    if since is not None:
+        since = bucket_start(since, "day")
+    if until is not None:
+        day = bucket_start(until, "day")
+        until = day if day == as_utc(until) else day + timedelta(days=1)
+
+    feedback_scope, rollup_scope = [], []
+    if tenant_id is not None:
+        feedback_scope.append(FeedbackORM.tenant_id == tenant_id)
+        rollup_scope.append(FeedbackRollupORM.tenant_id == tenant_id)
+    if since is not None:
+        feedback_scope.append(FeedbackORM.created_at >= since)
+        rollup_scope.append(FeedbackRollupORM.bucket >= since)
+    if until is not None:
+        feedback_scope.append(FeedbackORM.created_at < until)
+        rollup_scope.append(FeedbackRollupORM.bucket < until)
+
+    async with AsyncSessionLocal() as session:
+        dialect = session.bind.dialect.name
+        if dialect == "postgresql":
+            # blocks ingest's counter updates (not its reads) until commit, so
+            # no batch is counted twice or missed while the range is rebuilt
+            await session.execute(
+                text(
+                    f"LOCK TABLE {FeedbackRollupORM.__tablename__} "
+                    f"IN SHARE ROW EXCLUSIVE MODE"
+                )
+            )
+        await session.execute(delete(FeedbackRollupORM).where(*rollup_scope))
+        hour = _hour_bucket(dialect)
+        groups = await session.execute(
+            select(
+                FeedbackORM.tenant_id,
+                FeedbackORM.source_type,
+                func.coalesce(FeedbackORM.source_instance, ""),
+                func.coalesce(FeedbackORM.lang, ""),
+                hour,
+                func.count(),
+            )
+            .where(*feedback_scope)
+            .group_by(
+                FeedbackORM.tenant_id,
+                FeedbackORM.source_type,
+                FeedbackORM.source_instance,
+                FeedbackORM.lang,
+                hour,
+            )
+        )
+        counts: "Counter[RollupKey]" = Counter()
+        for tenant, source_type, instance, lang, bucket, n in groups:
+            at = _as_bucket(bucket)
+            for granularity in GRANULARITIES:
+                key = (
+                    tenant,
+                    granularity,
+                    bucket_start(at, granularity),
+                    source_type,
+                    instance,
+                    lang,
+                )
+                counts[key] += n
+        await _upsert(session, counts, replace=True)
+        await session.commit()
+    logger.info(
+        f"Rebuilt {len(counts)} rollup rows "
+        f"(tenant={tenant_id or 'all'}, since={since}, until={until})"
+    )
+    return len(counts)
+
+
+def stats_query(
+    tenant_id: str,
+    granularity: str,
+    start: datetime,
+    end: datetime,
+    group_by: Sequence[str] = DIMENSIONS,
+    source_type: Optional[str] = None,
+    source_instance: Optional[str] = None,
+    lang: Optional[str] = None,
+) -> Select:
+    """
+    Counts per bucket in [start, end] for one tenant, split by the `group_by`
+    dimensions and summed over the rest. Reads only the tenant's rollup rows
+    in the range, however much feedback is behind them.
+    """
+    filters = [
+        FeedbackRollupORM.tenant_id == tenant_id,
+        FeedbackRollupORM.granularity == granularity,
+        FeedbackRollupORM.bucket >= bucket_start(start, granularity),
+        FeedbackRollupORM.bucket <= end,
+    ]
+    for name, value in (
+        ("source_type", source_type),
+        ("source_instance", source_instance),
+        ("lang", lang),
+    ):
+        if value is not None:
+            filters.append(getattr(FeedbackRollupORM, name) == value)
+    dims: List = [getattr(FeedbackRollupORM, name) for name in group_by]
+    return (
+        select(
+            FeedbackRollupORM.bucket,
+            *dims,
+            func.sum(FeedbackRollupORM.count).label("count"),
+        )
+        .where(and_(*filters))
+        .group_by(FeedbackRollupORM.bucket, *dims)
+        .order_by(FeedbackRollupORM.bucket, *dims)
+    )
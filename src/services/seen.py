@@ -0,0 +1,107 @@
+# src/services/seen.py
+import logging
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import select
+
+from config.settings import settings
+from core.models import Feedback
+from db.models import FeedbackORM
+from db.session import AsyncSessionLocal
+from utils.time_utils import utc_now
+
+logger = logging.getLogger(__name__)
+
+# The natural key (db.models.FEEDBACK_NATURAL_KEY), without created_at
+SeenKey = Tuple[str, str, Optional[str], str]
+
+
+def seen_key(feedback: Feedback) -> SeenKey:
+    return (
+        feedback.tenant_id,
+        feedback.source_type,
+        feedback.source_instance,
+        feedback.external_id,
+    )
+
+
+class SeenKeys:
+    """
+    Bounded LRU of dedup keys the database has confirmed as stored, each
+    trusted for `ttl` seconds. Keys are exact, so a hit is a real duplicate;
+    a miss (or an expired entry) just means the INSERT decides as before.
+    """
+
+    def __init__(self, max_keys: Optional[int] = None, ttl: Optional[float] = None):
+        self.max_keys = settings.SEEN_KEYS_MAX if max_keys is None else max_keys
+        self.ttl = settings.SEEN_KEYS_TTL_SEC if ttl is None else ttl
+        self._entries: "OrderedDict[SeenKey, float]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: SeenKey) -> bool:
+        expires = self._entries.get(key)
+        if expires is not None and expires > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True
+        if expires is not None:
+            del self._entries[key]
+        self.misses += 1
+        return False
+
+    def add_many(self, keys: Iterable[SeenKey]) -> None:
+        if self.max_keys <= 0:
+            return
+        expires = time.monotonic() + self.ttl
+        for key in keys:
+            self._entries[key] = expires
+            self._entries.move_to_end(key)
+        while len(self._entries) > self.max_keys:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    async def warm(self) -> int:
+        """Load keys of rows created within the TTL window, newest first."""
+        if self.max_keys <= 0:
+            return 0
+        since = utc_now() - timedelta(seconds=self.ttl)
+        stmt = (
+            select(
+                FeedbackORM.tenant_id,
+                FeedbackORM.source_type,
+                FeedbackORM.source_instance,
+                FeedbackORM.external_id,
+            )
+            .where(FeedbackORM.created_at >= since)
+            .order_by(FeedbackORM.created_at.desc())
+            .limit(self.max_keys)
+        )
+        async with AsyncSessionLocal() as session:
+            rows = (await session.execute(stmt)).all()
+        # oldest first, so the newest keys end up most recently used
+        self.add_many(tuple(row) for row in reversed(rows))
+        logger.info(f"Warmed seen-key filter with {len(rows)} keys")
+        return len(rows)
+
+
+seen_keys = SeenKeys()
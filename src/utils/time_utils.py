@@ -4,3 +4,8 @@ from datetime import datetime, timezone
 def utc_now() -> datetime:
     """Return a timezone‐aware UTC “now”."""
     return datetime.now(timezone.utc)
+
+
+def as_utc(dt: datetime) -> datetime:
+    """Treat naive datetimes (as most adapters produce) as UTC."""
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
@@ -0,0 +1,269 @@
+# src/workers/backfill.py
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, select
+
+from adapters.pagination import PaginationTruncated
+from adapters.rate_limit import rate_share
+from config.settings import settings
+from core.exceptions import AdapterError
+from core.models import Feedback, is_stub
+from db.models import BackfillWindowORM
+from db.partitions import ensure_partitions, month_start
+from db.session import AsyncSessionLocal
+from services.ingest import IngestResult, ingest_many
+from utils.time_utils import as_utc, utc_now
+from workers.scheduler import Source, build_adapter
+
+logger = logging.getLogger(__name__)
+
+Window = Tuple[datetime, datetime]
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass
+class BackfillReport:
+    """What one backfill_source() call did with each window of its range."""
+
+    source: Source
+    windows: int = 0
+    skipped: int = 0
+    completed: List[Window] = field(default_factory=list)
+    failed: Dict[Window, str] = field(default_factory=dict)
+    inserted: int = 0
+    duplicates: int = 0
+    duration_sec: float = 0.0
+
+
+def plan_windows(since: datetime, until: datetime, window_sec: int) -> List[Window]:
+    """
+    Split [since, until) into windows on a fixed `window_sec` grid (counted
+    from the epoch) clipped to the range, so a rerun with a different `since`
+    lines up with the windows an earlier run completed.
+    """
+    since, until = as_utc(since), as_utc(until)
+    step = timedelta(seconds=window_sec)
+    start = _EPOCH + (since - _EPOCH) // step * step
+    windows: List[Window] = []
+    while start < until:
+        end = start + step
+        windows.append((max(start, since), min(end, until)))
+        start = end
+    return windows
+
+
+def is_covered(window: Window, done: List[Window]) -> bool:
+    return any(start <= window[0] and end >= window[1] for start, end in done)
+
+
+async def completed_windows(
+    source: Source, since: datetime, until: datetime
+) -> List[Window]:
+    """Windows of `source` overlapping [since, until) that earlier runs stored."""
+    async with AsyncSessionLocal() as session:
+        rows = await session.execute(
+            select(BackfillWindowORM.window_start, BackfillWindowORM.window_end).where(
+                _of_source(source),
+                BackfillWindowORM.window_end > since,
+                BackfillWindowORM.window_start < until,
+                BackfillWindowORM.completed_at.is_not(None),
+            )
+        )
+        return [(as_utc(start), as_utc(end)) for start, end in rows]
+
+
+async def stopped_windows(
+    source: Source, since: datetime, until: datetime
+) -> Dict[Window, Tuple[str, int]]:
+    """
+    Windows of `source` overlapping [since, until) that an earlier run cut
+    short at MAX_PAGES_PER_FETCH: their cursor and the records stored so far.
+    """
+    async with AsyncSessionLocal() as session:
+        rows = await session.execute(
+            select(
+                BackfillWindowORM.window_start,
+                BackfillWindowORM.window_end,
+                BackfillWindowORM.cursor,
+                BackfillWindowORM.records,
+            ).where(
+                _of_source(source),
+                BackfillWindowORM.window_end > since,
+                BackfillWindowORM.window_start < until,
+                BackfillWindowORM.completed_at.is_(None),
+                BackfillWindowORM.cursor.is_not(None),
+            )
+        )
+        return {
+            (as_utc(start), as_utc(end)): (cursor, records)
+            for start, end, cursor, records in rows
+        }
+
+
+def _of_source(source: Source):
+    return and_(
+        BackfillWindowORM.tenant_id == source.tenant_id,
+        BackfillWindowORM.source_type == source.platform,
+        BackfillWindowORM.source_instance == source.instance,
+    )
+
+
+async def _save_window(
+    source: Source, window: Window, records: int, cursor: Optional[str] = None
+) -> None:
+    """Record `window` as completed, or as stopped at `cursor`."""
+    async with AsyncSessionLocal() as session:
+        await session.merge(
+            BackfillWindowORM(
+                tenant_id=source.tenant_id,
+                source_type=source.platform,
+                source_instance=source.instance,
+                window_start=window[0],
+                window_end=window[1],
+                records=records,
+                cursor=cursor,
+                completed_at=None if cursor else utc_now(),
+            )
+        )
+        await session.commit()
+
+
+async def _ensure_partitions(since: datetime) -> None:
+    # history older than last month would otherwise land in feedback_default
+    try:
+        async with AsyncSessionLocal() as session:
+            conn = await session.connection()
+            await ensure_partitions(conn, start=month_start(since))
+            await session.commit()
+    except Exception as e:
+        # e.g. feedback_default already holds rows of one of those months
+        logger.warning(f"Could not create partitions from {since:%Y-%m}: {e}")
+
+
+async def _without_stubs(
+    records: AsyncIterator[Feedback],
+    stubs: List[Feedback],
+    truncated: List[PaginationTruncated],
+) -> AsyncIterator[Feedback]:
+    # a fallback stub means the upstream call failed; keep it out of history
+    try:
+        async for fb in records:
+            if is_stub(fb):
+                stubs.append(fb)
+            else:
+                yield fb
+    except PaginationTruncated as e:
+        # let ingest_many() finish writing what was fetched
+        truncated.append(e)
+
+
+async def backfill_window(
+    source: Source, window: Window, resume: Optional[Tuple[str, int]] = None
+) -> IngestResult:
+    """
+    Fetch one window and write it in BACKFILL_BATCH_SIZE batches, then record
+    the window as completed. Raises if the window is incomplete, so it's
+    fetched again by the next run. A fetch cut short at MAX_PAGES_PER_FETCH
+    records its cursor instead, and the next run picks it up from there
+    (`resume`: that cursor and the records stored before it).
+    """
+    adapter = build_adapter(source)
+    cursor, earlier = resume or (None, 0)
+    stubs: List[Feedback] = []
+    truncated: List[PaginationTruncated] = []
+    result = await ingest_many(
+        _without_stubs(adapter.fetch(*window, cursor), stubs, truncated),
+        batch_size=settings.BACKFILL_BATCH_SIZE,
+        remember=False,
+    )
+    if stubs:
+        raise AdapterError(f"upstream fell back to a stub: {stubs[0].body}")
+    if result.failed:
+        raise AdapterError(f"{result.failed} records failed to write")
+    records = earlier + result.inserted + result.duplicates
+    if truncated:
+        if not adapter.last_cursor:
+            raise AdapterError(str(truncated[0]))
+        await _save_window(source, window, records, adapter.last_cursor)
+        raise AdapterError(
+            f"{truncated[0]}; the next run resumes at cursor {adapter.last_cursor}"
+        )
+    # writes are idempotent, so a crash before this line only costs a re-fetch
+    await _save_window(source, window, records)
+    return result
+
+
+async def backfill_source(
+    source: Source,
+    since: datetime,
+    until: Optional[datetime] = None,
+    window_sec: Optional[int] = None,
+    concurrency: Optional[int] = None,
+) -> BackfillReport:
+    """
+    Pull the history of one source between `since` and `until` (default now).
+    The range is split into BACKFILL_WINDOW_SEC windows, fetched up to
+    BACKFILL_CONCURRENCY at a time; windows completed by an earlier run are
+    skipped, and one cut short at MAX_PAGES_PER_FETCH is picked up at its
+    cursor, so an interrupted backfill resumes where it stopped. The monthly
+    partitions of the range are created first.
+
+    Live polling is left alone: the source's checkpoint isn't touched, written
+    keys stay out of the seen-key filter, and upstream requests from this
+    process are capped at BACKFILL_RATE_SHARE of each credential's rate (the
+    cap is per process: polling workers and other backfills elsewhere aren't
+    counted against it). Adapters whose fetch() ignores `until` are fetched
+    as a single window.
+    """
+    started = time.monotonic()
+    until = as_utc(until or utc_now())
+    since = as_utc(since)
+    report = BackfillReport(source)
+
+    await _ensure_partitions(since)
+    stopped = await stopped_windows(source, since, until)
+    if build_adapter(source).honours_until:
+        windows = plan_windows(since, until, window_sec or settings.BACKFILL_WINDOW_SEC)
+    else:
+        # fetch() ignores the end, so it's only a label: pick up a window from
+        # `since` that an earlier run stopped, whatever `until` that run had
+        windows = [next((w for w in stopped if w[0] == since), (since, until))]
+    done = await completed_windows(source, since, until)
+    pending = [w for w in windows if not is_covered(w, done)]
+    report.windows = len(windows)
+    report.skipped = len(windows) - len(pending)
+    limit = asyncio.Semaphore(concurrency or settings.BACKFILL_CONCURRENCY)
+
+    async def run(window: Window) -> None:
+        async with limit:
+            try:
+                result = await backfill_window(source, window, stopped.get(window))
+            except Exception as e:
+                logger.error(
+                    f"Backfill of {source} {window[0]:%Y-%m-%d %H:%M}–"
+                    f"{window[1]:%Y-%m-%d %H:%M} failed ({type(e).__name__}): {e}"
+                )
+                report.failed[window] = str(e)
+                return
+        report.completed.append(window)
+        report.inserted += result.inserted
+        report.duplicates += result.duplicates
+
+    with rate_share(settings.BACKFILL_RATE_SHARE):
+        await asyncio.gather(*(run(w) for w in pending))
+
+    report.completed.sort()
+    report.duration_sec = time.monotonic() - started
+    logger.info(
+        f"Backfill of {source} finished in {report.duration_sec:.1f}s: "
+        f"{len(report.completed)} windows done, {report.skipped} already done, "
+        f"{len(report.failed)} failed; {report.inserted} inserted, "
+        f"{report.duplicates} duplicates"
+    )
+    return report
@@ -0,0 +1,224 @@
+# src/workers/leader.py
+"""
+Leader election between the processes serving the API, so that one of them
+(not every uvicorn/gunicorn worker and replica) runs the pull scheduler.
+
+The leader is the process holding a session-level Postgres advisory lock on a
+dedicated connection. It renews its lease every LEADER_RENEW_SEC by checking
+that connection, and steps down when a check fails or hangs. Postgres frees
+the lock as soon as the connection closes: at once on a clean shutdown or a
+crash, and within LEADER_LEASE_SEC (server-side TCP keepalives) when the
+leader's host stops answering; it steps down itself before that, within two
+renewal periods, so LEADER_LEASE_SEC must exceed 2 * LEADER_RENEW_SEC.
+Followers retry the lock every LEADER_RENEW_SEC; the one that gets it waits
+out two renewal periods, in case the lock was freed under a leader that has
+not noticed yet, and then starts the leader-only work: failover takes about
+3 * LEADER_RENEW_SEC.
+
+Outside Postgres there is nothing to coordinate with: the process leads.
+"""
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from config.settings import settings
+from core.metrics import SCHEDULER_LEADER
+from db.session import engine
+from utils.time_utils import utc_now
+
+logger = logging.getLogger(__name__)
+
+_APP_NAME_PREFIX = "ingest-leader "
+
+
+class LeaderElection:
+    """
+    Campaigns for the advisory lock `key` in the background once started.
+    `on_elected()` runs when this process becomes leader and its return value
+    is handed to `on_deposed()` when it stops being leader (including on
+    stop()).
+    """
+
+    def __init__(
+        self,
+        key: Optional[int] = None,
+        renew_sec: Optional[float] = None,
+        lease_sec: Optional[int] = None,
+    ):
+        self.key = settings.LEADER_LOCK_KEY if key is None else key
+        self.renew_sec = renew_sec or settings.LEADER_RENEW_SEC
+        self.lease_sec = lease_sec or settings.LEADER_LEASE_SEC
+        self.identity = f"{socket.gethostname()}:{os.getpid()}"
+        self.is_leader = False
+        self.leader_since: Optional[datetime] = None
+        self._on_elected: Callable[[], Any] = lambda: None
+        self._on_deposed: Callable[[Any], None] = lambda handle: None
+        self._handle: Any = None
+        self._engine: Optional[AsyncEngine] = None
+        self._conn: Optional[AsyncConnection] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    @property
+    def coordinated(self) -> bool:
+        return engine.dialect.name == "postgresql"
+
+    def start(
+        self,
+        on_elected: Callable[[], Any],
+        on_deposed: Callable[[Any], None],
+    ) -> None:
+        self._on_elected = on_elected
+        self._on_deposed = on_deposed
+        self._stopping = False
+        self._task = asyncio.create_task(self._campaign())
+
+    async def stop(self) -> None:
+        """Step down (freeing the lock for a successor) and stop campaigning."""
+        if self._task is not None:
+            # the flag too: on 3.11 wait_for() can swallow a cancellation
+            self._stopping = True
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._step_down()
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = None
+
+    async def _campaign(self) -> None:
+        while not self._stopping:
+            try:
+                if self.is_leader:
+                    # a lease check that hangs is as bad as one that fails
+                    await asyncio.wait_for(self._renew(), self.renew_sec)
+                elif await self._try_acquire():
+                    await self._await_predecessor()
+                    self._elected()
+            except Exception as e:
+                logger.warning(
+                    f"Leader election: {'lease lost' if self.is_leader else 'retrying'}"
+                    f" ({type(e).__name__}: {e})"
+                )
+                await self._step_down()
+            await asyncio.sleep(self.renew_sec)
+
+    async def _await_predecessor(self) -> None:
+        # A lock freed because Postgres cut the old leader's session is free
+        # before that leader knows. It finds out within two renewal periods
+        # (a failed or a timed-out check), so start the work only after that.
+        if self.coordinated:
+            await asyncio.sleep(2 * self.renew_sec)
+            await asyncio.wait_for(self._renew(), self.renew_sec)
+
+    def _elected(self) -> None:
+        self.is_leader = True
+        self.leader_since = utc_now()
+        SCHEDULER_LEADER.set(1)
+        logger.info(f"{self.identity} is now the scheduler leader")
+        self._handle = self._on_elected()
+
+    async def _step_down(self) -> None:
+        if self.is_leader:
+            self.is_leader = False
+            self.leader_since = None
+            SCHEDULER_LEADER.set(0)
+            logger.info(f"{self.identity} stepped down as scheduler leader")
+            try:
+                self._on_deposed(self._handle)
+            except Exception as e:
+                logger.error(f"Stopping leader-only work failed: {e}")
+            self._handle = None
+        await self._disconnect()
+
+    async def _connect(self) -> AsyncConnection:
+        if self._engine is None:
+            # not from the request pool: closing it must really disconnect,
+            # and it stays checked out for as long as the process leads
+            self._engine = create_async_engine(engine.url, poolclass=NullPool)
+        conn = await self._engine.connect()
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        # keepalives: Postgres drops the session (and the lock) of a leader
+        # whose host went silent after about lease_sec
+        idle = max(1, self.lease_sec // 2)
+        probe = max(1, (self.lease_sec - idle) // 3)
+        await conn.execute(
+            text(
+                "SELECT set_config('application_name', :name, false), "
+                "set_config('tcp_keepalives_idle', :idle, false), "
+                "set_config('tcp_keepalives_interval', :probe, false), "
+                "set_config('tcp_keepalives_count', '3', false)"
+            ),
+            {
+                "name": f"{_APP_NAME_PREFIX}{self.identity}",
+                "idle": str(idle),
+                "probe": str(probe),
+            },
+        )
+        return conn
+
+    async def _disconnect(self) -> None:
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            try:
+                await asyncio.wait_for(conn.close(), self.renew_sec)
+            except Exception as e:
+                logger.debug(f"Closing the leader connection failed: {e}")
+
+    async def _try_acquire(self) -> bool:
+        if not self.coordinated:
+            return True
+        if self._conn is None:
+            self._conn = await self._connect()
+        result = await self._conn.execute(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key}
+        )
+        return bool(result.scalar())
+
+    async def _renew(self) -> None:
+        # the lock lives as long as the session: a live session still holds it
+        if self.coordinated:
+            await self._conn.execute(text("SELECT 1"))
+
+    async def status(self) -> Dict[str, Any]:
+        """This process's role and, on Postgres, which session holds the lock."""
+        status: Dict[str, Any] = {
+            "process": self.identity,
+            "is_leader": self.is_leader,
+            "leader_since": self.leader_since.isoformat() if self.leader_since else None,
+            "leader": self.identity if self.is_leader else None,
+        }
+        if not self.coordinated:
+            return status
+        async with engine.connect() as conn:
+            holder = await conn.execute(
+                text(
+                    "SELECT a.application_name, a.client_addr, a.backend_start "
+                    "FROM pg_locks l JOIN pg_stat_activity a ON a.pid = l.pid "
+                    "WHERE l.locktype = 'advisory' AND l.granted "
+                    "AND l.classid = :high AND l.objid = :low AND l.objsubid = 1"
+                ),
+                {"high": (self.key >> 32) & 0xFFFFFFFF, "low": self.key & 0xFFFFFFFF},
+            )
+            row = holder.first()
+        if row is not None:
+            name = row.application_name or ""
+            status["leader"] = name.removeprefix(_APP_NAME_PREFIX) or None
+            status["leader_addr"] = str(row.client_addr) if row.client_addr else None
+            status["leader_connected_at"] = row.backend_start.isoformat()
+        else:
+            status["leader"] = None
+        return status
+
+
+scheduler_leader = LeaderElection()
@@ -0,0 +1,298 @@
+# src/workers/queue.py
+"""
+Pull jobs leased from a Postgres table (PULL_MODE=queue).
+
+Every DISPATCH_INTERVAL_SEC the enqueuer adds newly configured sources, each
+first due at a random point within its poll interval. Any number of
+PullWorker processes lease due jobs with SELECT … FOR UPDATE SKIP LOCKED, so
+each job runs on one worker at a time and pull capacity grows with the
+number of workers. After a successful run a job is due again after its
+source's adaptive, jittered poll interval (PollCadence), kept in the row.
+A worker renews its leases while the pulls run; a job whose worker died
+becomes visible again once its lease expires.
+"""
+import asyncio
+import logging
+import os
+import random
+import socket
+import uuid
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import and_, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from config.settings import settings
+from db.models import PullJobORM
+from db.session import AsyncSessionLocal
+from utils.time_utils import utc_now
+from workers.scheduler import (
+    DispatchReport,
+    Source,
+    _DispatchLimits,
+    _run_source,
+    iter_sources,
+    poll_cadence,
+)
+
+logger = logging.getLogger(__name__)
+
+_KEY = (PullJobORM.tenant_id, PullJobORM.source_type, PullJobORM.source_instance)
+
+
+@dataclass
+class PullJob:
+    source: Source
+    attempts: int
+    interval: Optional[float] = None
+
+
+def _job_filter(source: Source):
+    return and_(
+        PullJobORM.tenant_id == source.tenant_id,
+        PullJobORM.source_type == source.platform,
+        PullJobORM.source_instance == source.instance,
+    )
+
+
+async def enqueue_sources(now: Optional[datetime] = None) -> int:
+    """
+    Queue configured sources that have no scheduled run: new ones, and jobs
+    parked after PULL_JOB_MAX_ATTEMPTS failed or crashed runs. Each is due
+    at a random point within its poll interval so they don't all fire at
+    once. Scheduled jobs keep their place, so this can run from several
+    processes without queueing a source twice.
+    """
+    now = now or utc_now()
+    rows = []
+    for s in iter_sources():
+        interval = poll_cadence.interval(s)
+        rows.append(
+            {
+                "tenant_id": s.tenant_id,
+                "source_type": s.platform,
+                "source_instance": s.instance,
+                "due_at": now + timedelta(seconds=random.uniform(0, interval)),
+                "attempts": 0,
+            }
+        )
+    if not rows:
+        return 0
+    async with AsyncSessionLocal() as session:
+        insert = (
+            sqlite_insert if session.bind.dialect.name == "sqlite" else pg_insert
+        )
+        stmt = insert(PullJobORM).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(_KEY),
+            set_={"due_at": stmt.excluded.due_at, "attempts": 0},
+            where=or_(
+                PullJobORM.due_at.is_(None),
+                and_(
+                    PullJobORM.attempts >= settings.PULL_JOB_MAX_ATTEMPTS,
+                    PullJobORM.lease_expires_at < now,
+                ),
+            ),
+        )
+        result = await session.execute(stmt)
+        await session.commit()
+    logger.info(f"Enqueued {result.rowcount} of {len(rows)} pull jobs")
+    return result.rowcount
+
+
+async def lease_jobs(
+    worker_id: str, limit: int, now: Optional[datetime] = None
+) -> List[PullJob]:
+    """
+    Lease up to `limit` due jobs for PULL_LEASE_SEC, oldest first. Rows other
+    workers are leasing right now are skipped rather than waited on.
+    """
+    now = now or utc_now()
+    free = or_(
+        PullJobORM.lease_expires_at.is_(None), PullJobORM.lease_expires_at < now
+    )
+    async with AsyncSessionLocal() as session:
+        keys = (
+            await session.execute(
+                select(*_KEY)
+                .where(
+                    PullJobORM.due_at <= now,
+                    PullJobORM.attempts < settings.PULL_JOB_MAX_ATTEMPTS,
+                    free,
+                )
+                .order_by(PullJobORM.due_at)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+        ).all()
+        if not keys:
+            return []
+        # re-checking `free` makes a lease safe even without row locks
+        leased = await session.execute(
+            update(PullJobORM)
+            .where(tuple_(*_KEY).in_([tuple(k) for k in keys]), free)
+            .values(
+                leased_by=worker_id,
+                lease_expires_at=now + timedelta(seconds=settings.PULL_LEASE_SEC),
+                attempts=PullJobORM.attempts + 1,
+            )
+            .returning(*_KEY, PullJobORM.attempts, PullJobORM.interval_sec)
+        )
+        jobs = [
+            PullJob(Source(platform, tenant, instance), attempts, interval)
+            for tenant, platform, instance, attempts, interval in leased
+        ]
+        await session.commit()
+    return jobs
+
+
+async def renew_leases(worker_id: str, now: Optional[datetime] = None) -> Set[Source]:
+    """Extend every lease `worker_id` holds; returns the sources still held."""
+    now = now or utc_now()
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            update(PullJobORM)
+            # until another worker leases it, an expired lease is still ours
+            .where(PullJobORM.leased_by == worker_id)
+            .values(lease_expires_at=now + timedelta(seconds=settings.PULL_LEASE_SEC))
+            .returning(*_KEY)
+        )
+        held = {
+            Source(platform, tenant, instance)
+            for tenant, platform, instance in result
+        }
+        await session.commit()
+    return held
+
+
+async def finish_job(
+    worker_id: str,
+    job: PullJob,
+    error: Optional[str] = None,
+    now: Optional[datetime] = None,
+) -> None:
+    """
+    Release a job after a run. Success makes it due again after the source's
+    jittered poll interval; a failure after PULL_RETRY_BASE_SEC × 2^(attempts-1),
+    or leaves it for the next enqueue once PULL_JOB_MAX_ATTEMPTS is reached.
+    """
+    now = now or utc_now()
+    values = {"leased_by": None, "lease_expires_at": None, "last_run_at": now}
+    if error is None:
+        values.update(
+            due_at=now + timedelta(seconds=poll_cadence.jittered(job.source)),
+            interval_sec=poll_cadence.interval(job.source),
+            attempts=0,
+            last_error=None,
+        )
+    elif job.attempts >= settings.PULL_JOB_MAX_ATTEMPTS:
+        logger.error(
+            f"Pull job {job.source} failed {job.attempts} times; "
+            f"waiting for the next enqueue: {error}"
+        )
+        values.update(due_at=None, attempts=0, last_error=error)
+    else:
+        delay = settings.PULL_RETRY_BASE_SEC * 2 ** (job.attempts - 1)
+        values.update(due_at=now + timedelta(seconds=delay), last_error=error)
+    async with AsyncSessionLocal() as session:
+        # a lease lost to another worker is theirs to finish
+        await session.execute(
+            update(PullJobORM)
+            .where(_job_filter(job.source), PullJobORM.leased_by == worker_id)
+            .values(**values)
+        )
+        await session.commit()
+
+
+class PullWorker:
+    """
+    Leases due pull jobs and runs them with the same per-platform and
+    per-tenant limits and timeout as dispatch_all(), up to
+    PULL_WORKER_CONCURRENCY at a time.
+    """
+
+    def __init__(
+        self, worker_id: Optional[str] = None, concurrency: Optional[int] = None
+    ):
+        self.worker_id = worker_id or (
+            f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        )
+        self.concurrency = concurrency or settings.PULL_WORKER_CONCURRENCY
+        self.running: Dict[Source, asyncio.Task] = {}
+        self._limits = _DispatchLimits()
+        self._stopping = False
+        self._wake = asyncio.Event()
+
+    def stop(self) -> None:
+        """Stop leasing; run() returns once the running jobs finish."""
+        self._stopping = True
+        self._wake.set()
+
+    async def run(self) -> None:
+        logger.info(f"Pull worker {self.worker_id} started")
+        heartbeat = asyncio.create_task(self._heartbeat())
+        try:
+            while not self._stopping:
+                free = self.concurrency - len(self.running)
+                jobs = await lease_jobs(self.worker_id, free) if free > 0 else []
+                for job in jobs:
+                    task = asyncio.create_task(self._run_job(job))
+                    self.running[job.source] = task
+                    task.add_done_callback(lambda _, s=job.source: self._done(s))
+                # every slot busy or nothing due: wait for a free slot or the
+                # next poll
+                with suppress(TimeoutError):
+                    await asyncio.wait_for(
+                        self._wake.wait(), settings.PULL_WORKER_POLL_SEC
+                    )
+                self._wake.clear()
+            if self.running:
+                await asyncio.gather(*self.running.values(), return_exceptions=True)
+        finally:
+            heartbeat.cancel()
+            with suppress(asyncio.CancelledError):
+                await heartbeat
+        logger.info(f"Pull worker {self.worker_id} stopped")
+
+    def _done(self, source: Source) -> None:
+        self.running.pop(source, None)
+        self._wake.set()
+
+    async def _run_job(self, job: PullJob) -> None:
+        if job.interval is not None:
+            # the source's last run may have been on another worker
+            poll_cadence.set_interval(job.source, job.interval)
+        report = DispatchReport()
+        timeout = settings.DISPATCH_TASK_TIMEOUT_SEC or None
+        await _run_source(job.source, utc_now(), self._limits, report, timeout)
+        if job.source in report.results:
+            error = None
+        elif job.source in report.failed:
+            error = report.failed[job.source]
+        else:
+            error = f"timed out after {timeout}s"
+        try:
+            await finish_job(self.worker_id, job, error)
+        except Exception as e:
+            # the lease expires and the job runs again; ingest dedups
+            logger.error(f"Could not release pull job {job.source}: {e}")
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(settings.PULL_HEARTBEAT_SEC)
+            if not self.running:
+                continue
+            try:
+                held = await renew_leases(self.worker_id)
+            except Exception as e:
+                logger.warning(f"Lease renewal failed: {e}")
+                continue
+            for source, task in list(self.running.items()):
+                if source not in held and not task.done():
+                    # expired and possibly re-leased elsewhere; don't run it twice
+                    logger.warning(f"Lost lease on {source}; cancelling its pull")
+                    task.cancel()
@@ -1,6 +1,14 @@
 # src/workers/scheduler.py
+import asyncio
+import logging
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
+from apscheduler.events import EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED, JobEvent
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from utils.time_utils import utc_now
 from adapters.discourse import DiscoursePullAdapter
@@ -8,66 +16,313 @@ from adapters.intercom import IntercomPullAdapter
 from adapters.playstore import PlaystorePullAdapter
 from adapters.twitter import TwitterPullAdapter
 from config.settings import settings
-from services.ingest import ingest
+from core.exceptions import AdapterError
+from core.metrics import (
+    DISPATCH_SECONDS,
+    DISPATCH_SOURCES,
+    SKIPPED_JOB_RUNS,
+    instrument_fetch,
+)
+from db.partitions import maintain_partitions
+from ports.fetcher import BaseFetcher
+from services.checkpoints import load_checkpoint, next_pull
+from services.ingest import IngestResult, ingest_many
 
+logger = logging.getLogger(__name__)
 
-async def dispatch_all() -> None:
+
+@dataclass(frozen=True)
+class Source:
+    """One pullable (platform, tenant, instance) combination."""
+
+    platform: str
+    tenant_id: str
+    instance: str
+
+    def __str__(self) -> str:
+        return f"{self.platform}:{self.tenant_id}:{self.instance}"
+
+
+@dataclass
+class DispatchReport:
+    """What happened to each source during one dispatch cycle."""
+
+    results: Dict[Source, IngestResult] = field(default_factory=dict)
+    failed: Dict[Source, str] = field(default_factory=dict)
+    timed_out: List[Source] = field(default_factory=list)
+    duration_sec: float = 0.0
+
+
+def iter_sources() -> List[Source]:
+    """
+    Every configured instance of each platform.
+    Only tenants present in PLATFORM_CONFIG for that platform are included.
+    """
+    cfg = settings.PLATFORM_CONFIG
+    sources: List[Source] = []
+    for tenant, apps in cfg.get("playstore", {}).get("apps", {}).items():
+        sources.extend(Source("playstore", tenant, app_id) for app_id in apps)
+    for tenant in cfg.get("twitter", {}).get("queries", {}).keys():
+        sources.append(Source("twitter", tenant, "search"))
+    for tenant, base_url in cfg.get("discourse", {}).get("base_urls", {}).items():
+        sources.append(Source("discourse", tenant, base_url.rstrip("/")))
+    for tenant in cfg.get("intercom", {}).get("secrets", {}).keys():
+        sources.append(Source("intercom", tenant, "pull"))
+    return sources
+
+
+def build_adapter(source: Source) -> BaseFetcher:
+    if source.platform == "playstore":
+        return PlaystorePullAdapter(source.tenant_id, source.instance)
+    if source.platform == "twitter":
+        return TwitterPullAdapter(source.tenant_id)
+    if source.platform == "discourse":
+        return DiscoursePullAdapter(source.tenant_id)
+    if source.platform == "intercom":
+        return IntercomPullAdapter(source.tenant_id)
+    raise AdapterError(f"Unknown platform '{source.platform}'")
+
+
+class PollCadence:
+    """
+    Poll interval per source, starting at POLL_INTERVALS[platform]. A poll
+    with nothing new stretches it by POLL_BACKOFF_FACTOR; one whose first
+    page came back full (the adapter followed a cursor) halves it. Both stay
+    within POLL_INTERVAL_MIN_SEC..POLL_INTERVAL_MAX_SEC, so upstream
+    requests follow data volume rather than the number of sources.
+    """
+
+    def __init__(self) -> None:
+        self._intervals: Dict[Source, float] = {}
+
+    def _clamp(self, interval: float) -> float:
+        return min(
+            max(interval, settings.POLL_INTERVAL_MIN_SEC),
+            settings.POLL_INTERVAL_MAX_SEC,
+        )
+
+    def interval(self, source: Source) -> float:
+        if source not in self._intervals:
+            return self._clamp(settings.POLL_INTERVALS.get(source.platform, 60))
+        return self._intervals[source]
+
+    def set_interval(self, source: Source, interval: float) -> None:
+        self._intervals[source] = self._clamp(interval)
+
+    def clear(self) -> None:
+        self._intervals.clear()
+
+    def observe(self, source: Source, full_page: bool, new_records: int) -> float:
+        """Adapt the interval to one successful poll; returns the new interval."""
+        current = self.interval(source)
+        if new_records == 0:
+            # also when the page was full of re-fetched duplicates
+            interval = current * settings.POLL_BACKOFF_FACTOR
+        elif full_page:
+            interval = current / 2
+        else:
+            interval = current
+        self.set_interval(source, interval)
+        if self._intervals[source] != current:
+            logger.debug(
+                f"Poll interval of {source}: {current:.0f}s → "
+                f"{self._intervals[source]:.0f}s"
+            )
+        return self._intervals[source]
+
+    def jittered(self, source: Source) -> float:
+        """The interval randomised by ± POLL_JITTER_FRACTION."""
+        jitter = settings.POLL_JITTER_FRACTION
+        return self.interval(source) * random.uniform(1 - jitter, 1 + jitter)
+
+
+poll_cadence = PollCadence()
+
+
+async def pull_source(source: Source, now: datetime) -> IngestResult:
     """
-    For each configured instance of each platform, pull new records and ingest them.
-    Only tenants present in PLATFORM_CONFIG for that platform are iterated.
+    Pull one source from its persisted checkpoint up to `now` and ingest it,
+    advancing the checkpoint together with the last batch, then adapt the
+    source's poll interval to what came back. When the previous pull stopped
+    part-way, this one first finishes that pull's window from its cursor.
     """
+    checkpoint = await load_checkpoint(
+        source.tenant_id, source.platform, source.instance
+    )
+    adapter = build_adapter(source)
+    advance = next_pull(
+        checkpoint, source.tenant_id, source.platform, source.instance, now, adapter
+    )
+    if advance.resumed_from:
+        logger.info(f"Resuming {source} at cursor {advance.resumed_from}")
+    records = instrument_fetch(
+        source.platform,
+        source.tenant_id,
+        adapter.fetch(advance.since, advance.until, advance.resumed_from),
+    )
+    result = await ingest_many(records, checkpoint=advance)
+    poll_cadence.observe(source, adapter.last_cursor is not None, result.inserted)
+    return result
+
+
+class _DispatchLimits:
+    """Global, per-platform and per-tenant semaphores for one dispatch cycle."""
+
+    def __init__(self) -> None:
+        self.total = asyncio.Semaphore(settings.DISPATCH_MAX_CONCURRENCY)
+        self.platforms: Dict[str, asyncio.Semaphore] = {
+            platform: asyncio.Semaphore(limit)
+            for platform, limit in settings.DISPATCH_PLATFORM_CONCURRENCY.items()
+        }
+        self.tenants: Dict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(settings.DISPATCH_TENANT_CONCURRENCY)
+        )
+
+    def platform(self, name: str) -> asyncio.Semaphore:
+        if name not in self.platforms:
+            self.platforms[name] = asyncio.Semaphore(settings.DISPATCH_MAX_CONCURRENCY)
+        return self.platforms[name]
+
+
+async def _run_source(
+    source: Source,
+    now: datetime,
+    limits: _DispatchLimits,
+    report: DispatchReport,
+    timeout: Optional[float],
+) -> None:
+    # narrowest limit first so waiting tasks don't hold a global slot
+    async with limits.tenants[source.tenant_id], limits.platform(
+        source.platform
+    ), limits.total:
+        try:
+            async with asyncio.timeout(timeout):
+                report.results[source] = await pull_source(source, now)
+            outcome = "ok"
+        except TimeoutError:
+            report.timed_out.append(source)
+            outcome = "timed_out"
+        except Exception as e:
+            logger.error(f"Dispatch of {source} failed ({type(e).__name__}): {e}")
+            report.failed[source] = str(e)
+            outcome = "failed"
+    DISPATCH_SOURCES.labels(source.platform, outcome).inc()
+
+
+async def dispatch_all() -> DispatchReport:
+    """
+    Pull new records for every configured source and ingest them.
+    Sources run as concurrent tasks bounded by DISPATCH_MAX_CONCURRENCY,
+    DISPATCH_PLATFORM_CONCURRENCY and DISPATCH_TENANT_CONCURRENCY; each pull is
+    cancelled after DISPATCH_TASK_TIMEOUT_SEC so one hung upstream can't stall
+    the cycle.
+    """
+    started = time.monotonic()
     now = utc_now()
+    limits = _DispatchLimits()
+    report = DispatchReport()
+    timeout = settings.DISPATCH_TASK_TIMEOUT_SEC or None
 
-    # ── Play Store ────────────────────────────────────────────────
-    ps_cfg = settings.PLATFORM_CONFIG.get("playstore", {})
-    ps_interval = settings.POLL_INTERVALS["playstore"]
-    ps_since = now - timedelta(seconds=ps_interval)
-    for tenant, apps in ps_cfg.get("apps", {}).items():
-        for app_id in apps:
-            playstore_adapter = PlaystorePullAdapter(tenant, app_id)
-            async for fb in playstore_adapter.fetch(ps_since, now):
-                await ingest(fb)
-
-    # ── Twitter ──────────────────────────────────────────────────
-    tw_cfg = settings.PLATFORM_CONFIG.get("twitter", {})
-    tw_interval = settings.POLL_INTERVALS["twitter"]
-    tw_since = now - timedelta(seconds=tw_interval)
-    for tenant in tw_cfg.get("queries", {}).keys():
-        twitter_adapter = TwitterPullAdapter(tenant)
-        async for fb in twitter_adapter.fetch(tw_since, now):
-            await ingest(fb)
-
-    # ── Discourse ────────────────────────────────────────────────
-    dc_cfg = settings.PLATFORM_CONFIG.get("discourse", {})
-    dc_interval = settings.POLL_INTERVALS["discourse"]
-    dc_since = now - timedelta(seconds=dc_interval)
-    for tenant in dc_cfg.get("base_urls", {}).keys():
-        discourse_adapter = DiscoursePullAdapter(tenant)
-        async for fb in discourse_adapter.fetch(dc_since, now):
-            await ingest(fb)
-
-    # ── Intercom ─────────────────────────────────────────────────
-    ic_cfg = settings.PLATFORM_CONFIG.get("intercom", {})
-    ic_interval = settings.POLL_INTERVALS["intercom"]
-    ic_since = now - timedelta(seconds=ic_interval)
-    for tenant in ic_cfg.get("secrets", {}).keys():
-        intercom_adapter = IntercomPullAdapter(tenant)
-        async for fb in intercom_adapter.fetch(ic_since, now):
-            await ingest(fb)
-
-
-def schedule_jobs() -> None:
+    await asyncio.gather(
+        *(_run_source(s, now, limits, report, timeout) for s in iter_sources())
+    )
+
+    report.duration_sec = time.monotonic() - started
+    DISPATCH_SECONDS.observe(report.duration_sec)
+    if report.timed_out:
+        logger.warning(
+            f"{len(report.timed_out)} source(s) overran {timeout}s: "
+            + ", ".join(str(s) for s in report.timed_out)
+        )
+    logger.info(
+        f"Dispatch cycle finished in {report.duration_sec:.2f}s: "
+        f"{len(report.results)} ok, {len(report.failed)} failed, "
+        f"{len(report.timed_out)} timed out"
+    )
+    return report
+
+
+async def poll_source_job(
+    scheduler: AsyncIOScheduler, source: Source, limits: _DispatchLimits
+) -> None:
     """
-    Schedule a single repeating job that calls dispatch_all()
-    every DISPATCH_INTERVAL_SEC seconds.
+    One scheduled poll of `source`, under the same limits and timeout as
+    dispatch_all(). Reschedules the source's job if its interval changed.
+    """
+    report = DispatchReport()
+    timeout = settings.DISPATCH_TASK_TIMEOUT_SEC or None
+    await _run_source(source, utc_now(), limits, report, timeout)
+    interval = poll_cadence.interval(source)
+    job = scheduler.get_job(_poll_job_id(source))
+    if job is not None and job.trigger.interval != timedelta(seconds=interval):
+        job.reschedule(
+            trigger="interval",
+            seconds=interval,
+            jitter=interval * settings.POLL_JITTER_FRACTION,
+        )
+
+
+def _poll_job_id(source: Source) -> str:
+    return f"poll:{source}"
+
+
+def _count_skipped_run(event: JobEvent) -> None:
+    reason = "overlap" if event.code == EVENT_JOB_MAX_INSTANCES else "misfire"
+    logger.warning(f"Skipped a run of job '{event.job_id}' ({reason})")
+    # one job per source: label by kind ("poll") to keep the series bounded
+    SKIPPED_JOB_RUNS.labels(event.job_id.split(":", 1)[0], reason).inc()
+
+
+def schedule_jobs(
+    pull_job: Optional[Callable[[], Awaitable[Any]]] = None,
+) -> AsyncIOScheduler:
+    """
+    Schedule one polling job per source, each on its own adaptive interval
+    (see PollCadence) with a random first run and per-run jitter so requests
+    don't all fire at once; or, given `pull_job` (the pull queue's enqueuer),
+    that instead every DISPATCH_INTERVAL_SEC seconds. Plus daily partition
+    maintenance either way.
     """
     scheduler = AsyncIOScheduler()
+    scheduler.add_listener(
+        _count_skipped_run, EVENT_JOB_MAX_INSTANCES | EVENT_JOB_MISSED
+    )
+    if pull_job is not None:
+        scheduler.add_job(
+            pull_job,
+            trigger="interval",
+            seconds=settings.DISPATCH_INTERVAL_SEC,
+            id=pull_job.__name__,
+            max_instances=1,
+            coalesce=True,
+        )
+    else:
+        limits = _DispatchLimits()
+        now = utc_now()
+        for source in iter_sources():
+            interval = poll_cadence.interval(source)
+            scheduler.add_job(
+                poll_source_job,
+                trigger="interval",
+                seconds=interval,
+                jitter=interval * settings.POLL_JITTER_FRACTION,
+                args=[scheduler, source, limits],
+                id=_poll_job_id(source),
+                next_run_time=now + timedelta(seconds=random.uniform(0, interval)),
+                # a late poll still beats a skipped one
+                misfire_grace_time=None,
+                max_instances=1,
+                coalesce=True,
+            )
+    # daily: keep monthly feedback partitions created ahead and expire old ones
     scheduler.add_job(
-        dispatch_all,
+        maintain_partitions,
         trigger="interval",
-        seconds=settings.DISPATCH_INTERVAL_SEC,
-        id="dispatch_all",
+        hours=24,
+        id="maintain_partitions",
+        next_run_time=utc_now(),
         max_instances=1,
         coalesce=True,
     )
     scheduler.start()
+    return scheduler
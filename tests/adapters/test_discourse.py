@@ -42,6 +42,7 @@ async def test_fetch_success(mock_discourse_response, monkeypatch):
             def __init__(self, data):
                 self._data = data
                 self.status_code = 200
+                self.headers = {}
 
             def json(self):
                 return self._data
@@ -54,7 +55,8 @@ async def test_fetch_success(mock_discourse_response, monkeypatch):
     monkeypatch.setattr(httpx.AsyncClient, "get", mock_get)
 
     adapter = DiscoursePullAdapter(TENANT)
-    since = utc_now() - timedelta(days=1)
+    # before the mock topics
+    since = datetime(2023, 5, 1)
     until = utc_now()
 
     feedbacks = [fb async for fb in adapter.fetch(since, until)]
@@ -68,6 +70,78 @@ async def test_fetch_success(mock_discourse_response, monkeypatch):
     assert fb0.tenant_id == TENANT
 
 
+@pytest.mark.asyncio
+async def test_topic_without_title_gets_an_empty_body(monkeypatch):
+    """A topic without a title (missing or null) still yields a str body."""
+    now = utc_now().timestamp()
+    topics = [
+        {"id": 201, "created_at": now, "posts_count": 1},
+        {"id": 202, "title": None, "created_at": now, "posts_count": 1},
+    ]
+
+    async def mock_get(self, url, params=None):
+        class MockResponse:
+            status_code = 200
+            headers = {}
+
+            def json(self):
+                return {"topics": topics}
+
+            def raise_for_status(self):
+                pass
+
+        return MockResponse()
+
+    monkeypatch.setattr(httpx.AsyncClient, "get", mock_get)
+
+    adapter = DiscoursePullAdapter(TENANT)
+    feedbacks = [
+        fb async for fb in adapter.fetch(utc_now() - timedelta(days=1), utc_now())
+    ]
+
+    assert [fb.external_id for fb in feedbacks] == ["201", "202"]
+    assert [fb.body for fb in feedbacks] == ["", ""]
+
+
+@pytest.mark.asyncio
+async def test_poll_stops_at_the_first_topic_older_than_since(monkeypatch):
+    """A poll with a recent `since` is one request, however many pages match."""
+    since = utc_now() - timedelta(minutes=5)
+    requests = []
+
+    async def mock_get(self, url, params=None):
+        requests.append(params)
+
+        class MockResponse:
+            status_code = 200
+            headers = {}
+
+            def json(self):
+                page, at = int(params.get("page", 1)), since.timestamp()
+                return {
+                    "topics": [
+                        {"id": page * 10, "title": "new", "created_at": at + 60},
+                        {"id": page * 10 + 1, "title": "old", "created_at": at - 60},
+                    ],
+                    "grouped_search_result": {"more_full_page_results": True},
+                }
+
+            def raise_for_status(self):
+                pass
+
+        return MockResponse()
+
+    monkeypatch.setattr(httpx.AsyncClient, "get", mock_get)
+
+    adapter = DiscoursePullAdapter(TENANT)
+    feedbacks = [fb async for fb in adapter.fetch(since, utc_now())]
+
+    assert [fb.body for fb in feedbacks] == ["new"]
+    assert len(requests) == 1
+    assert "order:latest" in requests[0]["q"]
+    assert f"after:{since - timedelta(days=1):%Y-%m-%d}" in requests[0]["q"]
+
+
 @pytest.mark.asyncio
 async def test_fetch_404_fallback(monkeypatch):
     """Should emit a single stub Feedback tagged with the tenant on any error."""
@@ -76,6 +150,7 @@ async def test_fetch_404_fallback(monkeypatch):
         class MockResponse:
             def __init__(self):
                 self.status_code = 404
+                self.headers = {}
 
             def json(self):
                 return {}
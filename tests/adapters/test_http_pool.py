@@ -0,0 +1,64 @@
+# tests/adapters/test_http_pool.py
+import importlib.util
+
+import pytest
+from pydantic import SecretStr, ValidationError
+
+from adapters.http_pool import HttpClientRegistry, http_clients
+from adapters.twitter import TwitterPullAdapter
+from config.settings import Settings, settings
+
+
+@pytest.mark.asyncio
+async def test_one_client_per_host():
+    registry = HttpClientRegistry()
+    a = registry.get("https://api.example.com/v1/things")
+    b = registry.get("https://api.example.com/other")
+    c = registry.get("https://other.example.com")
+    assert a is b
+    assert a is not c
+    await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_per_host_timeout(monkeypatch):
+    monkeypatch.setitem(settings.HTTP_HOST_TIMEOUTS, "slow.example.com", 42)
+    registry = HttpClientRegistry()
+
+    slow = registry.get("https://slow.example.com")
+    fast = registry.get("https://fast.example.com")
+    assert slow.timeout.read == 42
+    assert fast.timeout.read == settings.HTTP_TIMEOUT_SEC
+    await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_aclose_closes_and_reopens_lazily():
+    registry = HttpClientRegistry()
+    client = registry.get("https://api.example.com")
+    await registry.aclose()
+    assert client.is_closed
+
+    reopened = registry.get("https://api.example.com")
+    assert reopened is not client
+    assert not reopened.is_closed
+    await registry.aclose()
+
+
+def test_adapters_borrow_shared_client(monkeypatch):
+    cfg = settings.PLATFORM_CONFIG.setdefault("twitter", {})
+    monkeypatch.setitem(cfg.setdefault("tokens", {}), "tenant1", SecretStr("t"))
+    monkeypatch.setitem(cfg.setdefault("queries", {}), "tenant1", "#q")
+
+    first = TwitterPullAdapter("tenant1")
+    second = TwitterPullAdapter("tenant1")
+    assert first.client is second.client
+    assert first.client is http_clients.get(TwitterPullAdapter.BASE_URL)
+
+
+def test_http2_without_h2_is_rejected_at_startup(monkeypatch):
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name: None)
+
+    with pytest.raises(ValidationError, match="http2"):
+        Settings(HTTP2_ENABLED=True)
+    assert Settings(HTTP2_ENABLED=False).HTTP2_ENABLED is False
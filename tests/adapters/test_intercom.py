@@ -42,6 +42,7 @@ async def test_fetch_success(mock_intercom_response, monkeypatch):
             def __init__(self, data):
                 self._data = data
                 self.status_code = 200
+                self.headers = {}
 
             def json(self):
                 return self._data
@@ -77,6 +78,7 @@ async def test_fetch_404_fallback(monkeypatch):
         class MockResponse:
             def __init__(self):
                 self.status_code = 404
+                self.headers = {}
 
             def json(self):
                 return {}
@@ -7,6 +7,7 @@ from pydantic import SecretStr
 
 import app.main as app_module
 from config.settings import settings
+from services.buffer import IngestBuffer
 
 TENANT = "tenant1"
 
@@ -33,28 +34,35 @@ def load_payload():
 
 def test_intercom_push_endpoint(monkeypatch):
     payload = load_payload()
-    captured = {}
+    buffer = IngestBuffer(maxsize=10)
 
-    async def fake_ingest(fb):
-        captured["fb"] = fb
-        return True
-
-    # Patch the ingest function used in the FastAPI route
-    monkeypatch.setattr(app_module, "ingest", fake_ingest)
+    # Swap in a private buffer so we can inspect what the route enqueued
+    monkeypatch.setattr(app_module, "webhook_buffer", buffer)
 
     # POST to the webhook endpoint
     response = client.post(f"/webhook/intercom/{TENANT}", json=payload)
-    assert response.status_code == 200
+    assert response.status_code == 202
 
     data = response.json()
-    assert data["status"] == "ok"
-    assert data["inserted"] is True
+    assert data["status"] == "accepted"
 
-    # Validate captured Feedback
-    fb = captured.get("fb")
-    assert fb is not None
+    # Validate queued Feedback
+    assert buffer.qsize() == 1
+    fb = buffer._queue.get_nowait()
+    assert data["id"] == str(fb.id)
     assert fb.external_id == payload["data"]["item"]["id"]
     assert fb.source_type == "intercom"
     assert fb.source_instance == "push"
     assert fb.tenant_id == TENANT
     assert "New user message!" in fb.body
+
+
+def test_intercom_push_backpressure(monkeypatch):
+    payload = load_payload()
+    monkeypatch.setattr(app_module, "webhook_buffer", IngestBuffer(maxsize=1))
+
+    assert client.post(f"/webhook/intercom/{TENANT}", json=payload).status_code == 202
+
+    response = client.post(f"/webhook/intercom/{TENANT}", json=payload)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(settings.WEBHOOK_RETRY_AFTER_SEC)
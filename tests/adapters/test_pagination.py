@@ -0,0 +1,108 @@
+# tests/adapters/test_pagination.py
+import asyncio
+
+import pytest
+
+from adapters.pagination import (
+    Page,
+    PageSizer,
+    PaginationError,
+    PaginationTruncated,
+    paginate,
+)
+
+
+def pages_fetcher(pages, calls):
+    """Serve `pages` (list of item lists) keyed by cursor '0', '1', ..."""
+
+    async def fetch_page(cursor, size):
+        index = int(cursor or 0)
+        calls.append((cursor, size))
+        next_cursor = str(index + 1) if index + 1 < len(pages) else None
+        return Page(pages[index], next_cursor)
+
+    return fetch_page
+
+
+@pytest.mark.asyncio
+async def test_follows_cursor_until_exhausted():
+    calls = []
+    fetch = pages_fetcher([[1, 2], [3, 4], [5]], calls)
+
+    items = [i async for i in paginate(fetch)]
+
+    assert items == [1, 2, 3, 4, 5]
+    assert [c for c, _ in calls] == [None, "1", "2"]
+
+
+@pytest.mark.asyncio
+async def test_prefetches_next_page_while_consumer_works():
+    started = []
+
+    async def fetch_page(cursor, size):
+        started.append(cursor)
+        await asyncio.sleep(0)
+        return Page(["a", "b"], None if cursor else "next")
+
+    stream = paginate(fetch_page)
+    first = await stream.__anext__()
+    # consumer holds the first record; the second page is already in flight
+    await asyncio.sleep(0)
+    assert first == "a"
+    assert started == [None, "next"]
+    assert [i async for i in stream] == ["b", "a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_max_pages_truncates_after_yielding_what_was_fetched():
+    calls = []
+    fetch = pages_fetcher([[1], [2], [3], [4]], calls)
+    items = []
+
+    with pytest.raises(PaginationTruncated):
+        async for i in paginate(fetch, max_pages=2):
+            items.append(i)
+
+    assert items == [1, 2]
+    assert len(calls) == 2
+    # exactly max_pages pages with nothing left is a complete stream
+    assert [i async for i in paginate(pages_fetcher([[1], [2]], []), max_pages=2)] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_first_page_error_propagates_unchanged():
+    async def fetch_page(cursor, size):
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        [i async for i in paginate(fetch_page)]
+
+
+@pytest.mark.asyncio
+async def test_later_page_error_keeps_earlier_records():
+    seen = []
+
+    async def fetch_page(cursor, size):
+        if cursor:
+            raise ValueError("boom")
+        return Page([1, 2], "next")
+
+    with pytest.raises(PaginationError):
+        async for i in paginate(fetch_page):
+            seen.append(i)
+    assert seen == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_page_size_grows_on_full_pages_and_shrinks_when_sparse():
+    sizer = PageSizer(initial=10, minimum=10, maximum=40)
+    calls = []
+    full = [[0] * 10, [0] * 20, [0] * 40, [0] * 5]
+    [i async for i in paginate(pages_fetcher(full, calls), sizer)]
+
+    assert [size for _, size in calls] == [10, 20, 40, 40]
+    assert sizer.size == 40
+
+    calls.clear()
+    [i async for i in paginate(pages_fetcher([[0]], calls), sizer)]
+    assert sizer.size == 20
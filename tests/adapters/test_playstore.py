@@ -37,6 +37,7 @@ async def test_fetch_success(mock_playstore_response, monkeypatch):
             def __init__(self, data):
                 self._data = data
                 self.status_code = 200
+                self.headers = {}
 
             def json(self):
                 return self._data
@@ -70,6 +71,7 @@ async def test_fetch_failure(monkeypatch):
         class MockResponse:
             def __init__(self):
                 self.status_code = 404
+                self.headers = {}
 
             def json(self):
                 return None
@@ -100,6 +102,7 @@ async def test_fetch_empty_response(monkeypatch):
         class MockResponse:
             def __init__(self):
                 self.status_code = 200
+                self.headers = {}
 
             def json(self):
                 return {"reviews": []}
@@ -0,0 +1,79 @@
+# tests/adapters/test_rate_limit.py
+import time
+
+import httpx
+import pytest
+
+from adapters.rate_limit import RateLimiter, TokenBucket, rate_share
+from config.settings import settings
+
+
+def test_headers_spread_remaining_quota_over_window():
+    bucket = TokenBucket(rate=100, capacity=10)
+    reset = time.time() + 100
+    headers = {"x-rate-limit-remaining": "50", "x-rate-limit-reset": str(reset)}
+    bucket.observe(200, headers)
+
+    assert bucket.rate == pytest.approx(0.5, rel=0.05)
+    assert bucket.retry_delay() == 0
+
+
+def test_exhausted_quota_blocks_until_reset():
+    bucket = TokenBucket(rate=1, capacity=10)
+    reset = time.time() + 20
+    # Intercom-style header casing
+    headers = {"x-ratelimit-remaining": "0", "x-ratelimit-reset": str(reset)}
+    bucket.observe(200, headers)
+
+    assert 18 < bucket.retry_delay() <= 20
+
+
+def test_429_honours_retry_after_then_backs_off_exponentially():
+    bucket = TokenBucket(rate=1, capacity=10)
+    bucket.observe(429, {"retry-after": "7"})
+    assert 6 < bucket.retry_delay() <= 7
+
+    bucket = TokenBucket(rate=1, capacity=10)
+    bucket.observe(429, {})
+    first = bucket.retry_delay()
+    bucket.observe(429, {})
+    assert bucket.retry_delay() > first
+
+
+@pytest.mark.asyncio
+async def test_acquire_paces_once_burst_is_spent():
+    bucket = TokenBucket(rate=20, capacity=2)
+    started = time.monotonic()
+    for _ in range(4):
+        await bucket.acquire()
+    # two immediate, two more at 20/s
+    assert time.monotonic() - started >= 0.09
+
+
+def test_buckets_keyed_by_platform_and_credential():
+    limiter = RateLimiter()
+    assert limiter.bucket("twitter", "a") is limiter.bucket("twitter", "a")
+    assert limiter.bucket("twitter", "a") is not limiter.bucket("twitter", "b")
+    assert limiter.bucket("twitter", "a") is not limiter.bucket("intercom", "a")
+
+
+@pytest.mark.asyncio
+async def test_rate_share_paces_requests_sent_inside_it(monkeypatch):
+    monkeypatch.setitem(settings.RATE_LIMIT_RPS, "twitter", 40)
+    limiter = RateLimiter()
+
+    async def request():
+        return httpx.Response(200)
+
+    started = time.monotonic()
+    for _ in range(3):
+        await limiter.send("twitter", "a", request)
+    assert time.monotonic() - started < 0.04  # within the burst
+
+    with rate_share(0.5):
+        started = time.monotonic()
+        for _ in range(3):
+            await limiter.send("twitter", "a", request)
+    # one immediately, then two more at 20/s
+    assert time.monotonic() - started >= 0.09
+    assert limiter.share_bucket("twitter", "a", 0.5).rate == 20
@@ -7,8 +7,10 @@ import httpx
 import pytest
 from pydantic import SecretStr
 from utils.time_utils import utc_now
+from adapters.rate_limit import RateLimiter
 from adapters.twitter import TwitterPullAdapter
 from config.settings import settings
+from core.exceptions import RateLimitedError
 
 TENANT = "tenant1"
 TEST_QUERY = "#feedback1 lang:en"
@@ -23,6 +25,11 @@ def ensure_twitter_settings(monkeypatch):
     monkeypatch.setitem(queries, TENANT, TEST_QUERY)
 
 
+@pytest.fixture(autouse=True)
+def fresh_rate_limiter(monkeypatch):
+    monkeypatch.setattr("adapters.twitter.rate_limiter", RateLimiter())
+
+
 @pytest.fixture
 def mock_twitter_response():
     path = os.path.join(os.path.dirname(__file__), "mock_twitter_response.json")
@@ -39,6 +46,7 @@ async def test_fetch_success(mock_twitter_response, monkeypatch):
             def __init__(self, payload):
                 self._payload = payload
                 self.status_code = 200
+                self.headers = {}
 
             def json(self):
                 return self._payload
@@ -65,24 +73,35 @@ async def test_fetch_success(mock_twitter_response, monkeypatch):
     assert fb0.tenant_id == TENANT
 
 
-@pytest.mark.asyncio
-async def test_rate_limit_fallback(monkeypatch):
-    """Adapter emits exactly one stub Feedback on HTTP 429 or 401."""
+def mock_responses(monkeypatch, responses):
+    """Serve (status, headers, payload) tuples in order, one per GET."""
+    queue = list(responses)
 
     async def mock_get(self, url, params=None, headers=None):
+        status, resp_headers, payload = queue.pop(0)
+
         class MockResponse:
             def __init__(self):
-                self.status_code = 429
+                self.status_code = status
+                self.headers = resp_headers
 
             def json(self):
-                return {}
+                return payload
 
             def raise_for_status(self):
-                raise httpx.HTTPStatusError("Rate limited", request=None, response=self)
+                if status >= 400:
+                    raise httpx.HTTPStatusError("error", request=None, response=self)
 
         return MockResponse()
 
     monkeypatch.setattr(httpx.AsyncClient, "get", mock_get)
+    return queue
+
+
+@pytest.mark.asyncio
+async def test_auth_error_fallback(monkeypatch):
+    """Adapter emits exactly one stub Feedback on HTTP 401."""
+    mock_responses(monkeypatch, [(401, {}, {})])
 
     adapter = TwitterPullAdapter(TENANT)
     since = utc_now() - timedelta(days=1)
@@ -95,3 +114,71 @@ async def test_rate_limit_fallback(monkeypatch):
     assert fb.external_id == "stub-twitter"
     assert "stub tweet" in fb.body.lower()
     assert fb.tenant_id == TENANT
+    assert fb.metadata_ == {"fallback_status": "401"}
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_retried_at_reset(monkeypatch, mock_twitter_response):
+    """A 429 is retried once the announced reset passes instead of emitting a stub."""
+    queue = mock_responses(
+        monkeypatch,
+        [
+            (429, {"retry-after": "0"}, {}),
+            (200, {"x-rate-limit-remaining": "10"}, mock_twitter_response),
+        ],
+    )
+
+    adapter = TwitterPullAdapter(TENANT)
+    since = utc_now() - timedelta(days=1)
+    feedbacks = [fb async for fb in adapter.fetch(since, utc_now())]
+
+    assert [fb.external_id for fb in feedbacks] == ["123", "456"]
+    assert queue == []
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_gives_up_without_stub(monkeypatch):
+    """A reset too far away aborts the fetch with no junk stub record."""
+    mock_responses(monkeypatch, [(429, {"retry-after": "3600"}, {})])
+
+    adapter = TwitterPullAdapter(TENANT)
+    feedbacks = []
+    with pytest.raises(RateLimitedError):
+        async for fb in adapter.fetch(utc_now() - timedelta(days=1), utc_now()):
+            feedbacks.append(fb)
+    assert feedbacks == []
+
+
+@pytest.mark.asyncio
+async def test_fetch_follows_next_token(monkeypatch):
+    """Adapter keeps requesting pages until meta.next_token is absent."""
+    pages = {
+        None: {"data": [{"id": "1", "text": "a"}], "meta": {"next_token": "p2"}},
+        "p2": {"data": [{"id": "2", "text": "b"}], "meta": {}},
+    }
+    seen_tokens = []
+
+    async def mock_get(self, url, params=None, headers=None):
+        token = params.get("next_token")
+        seen_tokens.append(token)
+
+        class MockResponse:
+            status_code = 200
+            headers = {}
+
+            def json(self):
+                return pages[token]
+
+            def raise_for_status(self):
+                pass
+
+        return MockResponse()
+
+    monkeypatch.setattr(httpx.AsyncClient, "get", mock_get)
+
+    adapter = TwitterPullAdapter(TENANT)
+    since = utc_now() - timedelta(days=1)
+    feedbacks = [fb async for fb in adapter.fetch(since, utc_now())]
+
+    assert [fb.external_id for fb in feedbacks] == ["1", "2"]
+    assert seen_tokens == [None, "p2"]
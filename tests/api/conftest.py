@@ -0,0 +1,14 @@
+# tests/api/conftest.py
+import httpx
+import pytest
+
+import app.main as app_module
+
+
+@pytest.fixture
+async def api(monkeypatch, sqlite_session):
+    monkeypatch.setattr("services.ingest.AsyncSessionLocal", sqlite_session)
+    monkeypatch.setattr(app_module, "AsyncReadSessionLocal", sqlite_session)
+    transport = httpx.ASGITransport(app=app_module.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
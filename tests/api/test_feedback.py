@@ -0,0 +1,197 @@
+# tests/api/test_feedback.py
+import uuid
+from datetime import timedelta
+
+import pytest
+from prometheus_client import REGISTRY
+
+import app.main as app_module
+import services.fast_json as fast_json
+from config.settings import settings
+from core.cursor import decode_rank_cursor, encode_cursor, encode_rank_cursor
+from core.models import Feedback
+from services.ingest import ingest_many
+from utils.time_utils import utc_now
+
+TENANT = "tenant1"
+
+
+async def seed(count, tenant_id=TENANT, metadata=None):
+    base = utc_now() - timedelta(days=1)
+    records = [
+        Feedback(
+            id=uuid.uuid4(),
+            external_id=f"{tenant_id}-{i}",
+            source_type="playstore",
+            source_instance="app1",
+            tenant_id=tenant_id,
+            # pairs share a timestamp so the id tie-breaker matters
+            created_at=base + timedelta(minutes=i // 2),
+            fetched_at=utc_now(),
+            lang="en",
+            body=f"review {i}",
+            metadata_=metadata or {},
+        )
+        for i in range(count)
+    ]
+    await ingest_many(records)
+    return records
+
+
+async def collect_pages(api, **params):
+    pages, cursor = [], None
+    while True:
+        query = {"tenant_id": TENANT, **params}
+        if cursor:
+            query["cursor"] = cursor
+        resp = await api.get("/feedback", params=query)
+        assert resp.status_code == 200
+        body = resp.json()
+        pages.append(body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_cover_every_row_once_in_order(api):
+    records = await seed(7)
+    await seed(3, tenant_id="tenant2")
+
+    pages = await collect_pages(api, limit=3, sort="created_at")
+
+    assert [len(p) for p in pages] == [3, 3, 1]
+    ids = [item["id"] for page in pages for item in page]
+    assert len(set(ids)) == 7
+    keys = [(item["created_at"], item["id"]) for page in pages for item in page]
+    assert keys == sorted(keys)
+    assert set(ids) == {str(r.id) for r in records}
+
+
+@pytest.mark.asyncio
+async def test_default_sort_is_newest_first(api):
+    await seed(4)
+
+    pages = await collect_pages(api, limit=10)
+
+    created = [item["created_at"] for item in pages[0]]
+    assert created == sorted(created, reverse=True)
+    assert len(pages) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_orjson", [True, False])
+async def test_fast_json_matches_the_response_model(api, monkeypatch, use_orjson):
+    metadata = {"author": "Zoë", "tags": ["ios", 2], "nested": {"x": None}}
+    await seed(2, metadata=metadata)
+    if not use_orjson:
+        monkeypatch.setattr(fast_json, "orjson", None)
+    params = {"tenant_id": TENANT, "limit": 1}
+    slow_page = (await api.get("/feedback", params=params)).json()
+    item_url = f"/feedback/{slow_page['items'][0]['id']}"
+    slow_item = (await api.get(item_url, params={"tenant_id": TENANT})).json()
+
+    monkeypatch.setattr(settings, "API_FAST_JSON", True)
+    resp = await api.get("/feedback", params=params)
+
+    assert resp.headers["content-type"] == "application/json"
+    assert resp.json() == slow_page and slow_page["next_cursor"]
+    assert slow_item["metadata_"] == metadata
+    resp = await api.get(item_url, params={"tenant_id": TENANT})
+    assert resp.json() == slow_item
+    resp = await api.get(item_url, params={"tenant_id": "tenant2"})
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_search_needs_postgres_and_relevance_needs_q(api):
+    resp = await api.get("/feedback", params={"tenant_id": TENANT, "q": "crash"})
+    assert resp.status_code == 400 and "Postgres" in resp.json()["detail"]
+
+    resp = await api.get("/feedback", params={"tenant_id": TENANT, "sort": "relevance"})
+    assert resp.status_code == 400
+
+
+def test_rank_cursor_round_trips_the_rank_exactly():
+    at, fid = utc_now(), uuid.uuid4()
+    rank = 0.0607927107810974
+
+    assert decode_rank_cursor(encode_rank_cursor(rank, at, fid)) == (rank, at, fid)
+    with pytest.raises(ValueError):
+        decode_rank_cursor(encode_cursor(at, fid))
+
+
+@pytest.mark.asyncio
+async def test_stats_group_and_filter_the_rollups(api):
+    await seed(3)
+    await seed(2, tenant_id="tenant2")
+    params = {"tenant_id": TENANT, "granularity": "hour"}
+
+    split = (await api.get("/feedback/stats", params=params)).json()
+    summed = (
+        await api.get(
+            "/feedback/stats", params={**params, "group_by": "lang", "lang": "en"}
+        )
+    ).json()
+
+    assert split["total"] == summed["total"] == 3
+    assert {b["source_type"] for b in split["buckets"]} == {"playstore"}
+    assert all(b["source_instance"] is None for b in summed["buckets"])
+    assert sum(b["count"] for b in summed["buckets"]) == 3
+    resp = await api.get("/feedback/stats", params={**params, "lang": "fr"})
+    assert resp.json()["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_ingest_invalidates_only_its_tenants_cached_pages(api):
+    records = await seed(2)
+    await seed(1, tenant_id="tenant2")
+    params = {"tenant_id": TENANT}
+    assert len((await api.get("/feedback", params=params)).json()["items"]) == 2
+    one = await api.get(f"/feedback/{records[0].id}", params=params)
+
+    await seed(1, tenant_id="tenant2")  # only a duplicate: nothing stored
+    await api.get("/feedback", params=params)
+    assert (await api.get("/healthz/cache")).json()["hits"] == 1
+
+    await seed(3)  # stores the third row
+    assert len((await api.get("/feedback", params=params)).json()["items"]) == 3
+    again = await api.get(f"/feedback/{records[0].id}", params=params)
+
+    assert again.json() == one.json()
+    # the row by id is reloaded too: a stored row's lang can be backfilled
+    stats = (await api.get("/healthz/cache")).json()
+    assert (stats["hits"], stats["misses"]) == (1, 4)
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_is_rejected(api):
+    resp = await api.get("/feedback", params={"tenant_id": TENANT, "cursor": "nope"})
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_route_latency(api):
+    await api.get("/feedback", params={"tenant_id": TENANT})
+
+    resp = await api.get("/metrics")
+
+    assert resp.status_code == 200
+    assert 'route="/feedback"' in resp.text
+    assert "ingest_rows_total" in resp.text
+
+
+@pytest.mark.asyncio
+async def test_metrics_count_requests_whose_handler_raises(api, monkeypatch):
+    def broken_session():
+        raise RuntimeError("database is gone")
+
+    monkeypatch.setattr(app_module, "AsyncReadSessionLocal", broken_session)
+    labels = {"method": "GET", "route": "/feedback", "status": "500"}
+    before = REGISTRY.get_sample_value("ingest_http_request_seconds_count", labels) or 0
+
+    with pytest.raises(RuntimeError):
+        await api.get("/feedback", params={"tenant_id": "metrics-500"})
+
+    after = REGISTRY.get_sample_value("ingest_http_request_seconds_count", labels)
+    assert after == before + 1
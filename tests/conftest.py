@@ -0,0 +1,87 @@
+# tests/conftest.py
+import os
+
+import pytest
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.sqlite import JSON as SQLiteJSON
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from db.models import Base, FeedbackORM
+from db.partitions import ensure_partitions
+from services.lang_detect import lang_detector
+from services.read_cache import read_cache
+from services.seen import seen_keys
+from workers.scheduler import poll_cadence
+
+
+@pytest.fixture(autouse=True)
+def fresh_seen_keys():
+    # the filter is process-wide; don't let keys leak between test databases
+    seen_keys.clear()
+    yield
+    seen_keys.clear()
+
+
+@pytest.fixture(autouse=True)
+def fresh_poll_cadence():
+    # adapted poll intervals are process-wide too
+    poll_cadence.clear()
+    yield
+    poll_cadence.clear()
+
+
+@pytest.fixture(autouse=True)
+def no_lang_detection(monkeypatch):
+    # worker processes per test are slow; tests/services/test_lang_detect.py
+    # turns detection on where it is under test
+    monkeypatch.setattr(lang_detector, "workers", 0)
+
+
+@pytest.fixture(autouse=True)
+def fresh_read_cache():
+    # cached bodies and generations must not outlive a test's database
+    read_cache.clear()
+    yield
+    read_cache.clear()
+
+
+@pytest.fixture
+async def sqlite_session():
+    # Use in-memory SQLite
+    url = "sqlite+aiosqlite:///:memory:"
+    engine = create_async_engine(url, echo=False)
+
+    # Monkey-patch JSONB → SQLite JSON
+    FeedbackORM.__table__.c.metadata_.type = SQLiteJSON()
+
+    # Create tables
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    yield session_factory
+
+    await engine.dispose()
+
+
+@pytest.fixture
+async def pg_session():
+    # Postgres-only paths; point TEST_DATABASE_URL at a scratch database
+    # (postgresql+asyncpg://…) to run them: its tables are dropped
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    engine = create_async_engine(url, echo=False)
+
+    # undo sqlite_session's JSONB → JSON swap
+    FeedbackORM.__table__.c.metadata_.type = JSONB()
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await ensure_partitions(conn)
+
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    yield session_factory
+
+    await engine.dispose()
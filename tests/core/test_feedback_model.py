@@ -0,0 +1,38 @@
+# tests/core/test_feedback_model.py
+import uuid
+
+from core.models import FEEDBACK_FIELDS, Feedback
+from db.models import FeedbackORM
+from utils.time_utils import utc_now
+
+
+def values():
+    now = utc_now()
+    return {
+        "id": uuid.uuid4(),
+        "external_id": "42",
+        "source_type": "twitter",
+        "source_instance": "search",
+        "tenant_id": "t1",
+        "created_at": now,
+        "fetched_at": now,
+        "lang": "en",
+        "body": "hello",
+        "metadata_": {"likes": 3},
+    }
+
+
+def test_fields_follow_the_feedback_columns():
+    columns = tuple(c.name for c in FeedbackORM.__table__.columns)
+    assert columns[: len(FEEDBACK_FIELDS)] == FEEDBACK_FIELDS
+
+
+def test_trusted_equals_validated_and_round_trips_rows():
+    v = values()
+    fb = Feedback.trusted(**v)
+
+    assert fb == Feedback(**v)
+    assert fb.dict() == v and fb.__fields_set__ == set(FEEDBACK_FIELDS)
+    assert fb.to_row() == tuple(v.values())
+    assert Feedback.from_row(fb.to_row()) == fb
+    assert Feedback.parse_raw(fb.json()) == fb
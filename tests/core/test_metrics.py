@@ -0,0 +1,81 @@
+# tests/core/test_metrics.py
+import uuid
+
+import httpx
+import pytest
+from prometheus_client import REGISTRY
+
+from core.exceptions import AdapterError
+from core.metrics import error_status, instrument_fetch
+from core.models import STUB_STATUS_KEY, Feedback
+from utils.time_utils import utc_now
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def make_feedback(external_id, metadata=None):
+    return Feedback(
+        id=uuid.uuid4(),
+        external_id=external_id,
+        source_type="twitter",
+        source_instance="search",
+        tenant_id="metrics-t1",
+        created_at=utc_now(),
+        fetched_at=utc_now(),
+        lang=None,
+        body="hi",
+        metadata_=metadata or {},
+    )
+
+
+def http_error(code):
+    request = httpx.Request("GET", "https://example.com")
+    response = httpx.Response(code, request=request)
+    return httpx.HTTPStatusError("boom", request=request, response=response)
+
+
+def test_error_status_finds_wrapped_http_status():
+    try:
+        raise AdapterError("wrapped") from http_error(503)
+    except AdapterError as e:
+        assert error_status(e) == "503"
+    assert error_status(None) == "ok"
+    assert error_status(ValueError()) == "ValueError"
+
+
+@pytest.mark.asyncio
+async def test_instrument_fetch_counts_records_and_stubs():
+    labels = {"platform": "twitter", "tenant": "metrics-t1"}
+    before = sample("ingest_fetch_records_total", **labels)
+    stubs_before = sample("ingest_stub_records_total", **labels)
+    ok_before = sample("ingest_fetch_seconds_count", status="ok", **labels)
+
+    async def fetch():
+        yield make_feedback("1")
+        yield make_feedback("stub-twitter", {STUB_STATUS_KEY: "503"})
+
+    out = [fb async for fb in instrument_fetch("twitter", "metrics-t1", fetch())]
+
+    assert len(out) == 2
+    assert sample("ingest_fetch_records_total", **labels) == before + 2
+    assert sample("ingest_stub_records_total", **labels) == stubs_before + 1
+    # the stub stands in for a failed upstream call, so the fetch isn't "ok"
+    assert sample("ingest_fetch_seconds_count", status="fallback_503", **labels) >= 1
+    assert sample("ingest_fetch_seconds_count", status="ok", **labels) == ok_before
+
+
+@pytest.mark.asyncio
+async def test_instrument_fetch_labels_failures_with_status_code():
+    labels = {"platform": "twitter", "tenant": "metrics-t2", "status": "500"}
+
+    async def fetch():
+        raise AdapterError("down") from http_error(500)
+        yield  # pragma: no cover
+
+    with pytest.raises(AdapterError):
+        async for _ in instrument_fetch("twitter", "metrics-t2", fetch()):
+            pass
+
+    assert sample("ingest_fetch_seconds_count", **labels) == 1
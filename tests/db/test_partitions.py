@@ -0,0 +1,27 @@
+# tests/db/test_partitions.py
+from datetime import date, datetime, timezone
+
+import pytest
+
+from db.partitions import (
+    add_months,
+    ensure_partitions,
+    expire_partitions,
+    month_start,
+    partition_name,
+)
+
+
+def test_month_arithmetic_crosses_years():
+    assert month_start(datetime(2025, 12, 31, 23, tzinfo=timezone.utc)) == date(2025, 12, 1)
+    assert add_months(date(2025, 12, 1), 1) == date(2026, 1, 1)
+    assert add_months(date(2026, 1, 1), -13) == date(2024, 12, 1)
+    assert partition_name(date(2026, 3, 1)) == "feedback_2026_03"
+
+
+@pytest.mark.asyncio
+async def test_maintenance_is_noop_outside_postgres(sqlite_session):
+    engine = sqlite_session.kw["bind"]
+    async with engine.begin() as conn:
+        assert await ensure_partitions(conn) == []
+        assert await expire_partitions(conn, retention_months=1) == []
@@ -0,0 +1,29 @@
+# tests/db/test_search.py
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from db.models import FeedbackORM
+from db.search import ensure_search_index, search_filter, search_rank
+
+
+def test_search_compiles_for_postgres():
+    stmt = (
+        select(FeedbackORM.id)
+        .where(search_filter("crash -login"))
+        .order_by(search_rank("crash -login").desc())
+    )
+
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+    assert sql.count("feedback.search_tsv @@") == 2
+    assert "string_agg(DISTINCT" in sql and "unnest(" in sql
+    assert "WHEN 'en' THEN 'english'::regconfig" in sql
+    assert "ELSE 'simple'::regconfig END" in sql
+
+
+@pytest.mark.asyncio
+async def test_search_index_is_noop_outside_postgres(sqlite_session):
+    engine = sqlite_session.kw["bind"]
+    async with engine.begin() as conn:
+        assert await ensure_search_index(conn) is False
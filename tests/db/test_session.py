@@ -0,0 +1,55 @@
+# tests/db/test_session.py
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from db.session import ReadSessionFactory, build_engine
+
+
+@pytest.fixture
+async def sqlite_engine(tmp_path):
+    engine = build_engine(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}")
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_pool_records_checkouts_and_saturation(sqlite_engine):
+    async with sqlite_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        busy = sqlite_engine.pool.stats()
+
+    stats = sqlite_engine.pool.stats()
+    assert busy["checked_out"] == 1 and busy["saturation"] > 0
+    assert stats["checked_out"] == 0
+    assert stats["checkouts"] == 1
+    assert stats["timeouts"] == 0
+
+
+@pytest.mark.asyncio
+async def test_reads_fall_back_to_primary_when_replica_is_down(sqlite_engine, tmp_path):
+    primary = async_sessionmaker(bind=sqlite_engine)
+    # a directory can't be opened as a database file
+    broken = build_engine(f"sqlite+aiosqlite:///{tmp_path}")
+    factory = ReadSessionFactory(primary, async_sessionmaker(bind=broken))
+
+    async with factory() as session:
+        assert session.bind is sqlite_engine
+    # the replica is skipped for a while after a failed connect
+    checkouts = broken.pool.stats()["checkouts"]
+    async with factory() as session:
+        assert session.bind is sqlite_engine
+    assert broken.pool.stats()["checkouts"] == checkouts
+    await broken.dispose()
+
+
+@pytest.mark.asyncio
+async def test_reads_use_replica_when_reachable(sqlite_engine, tmp_path):
+    replica_engine = build_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    factory = ReadSessionFactory(
+        async_sessionmaker(bind=sqlite_engine), async_sessionmaker(bind=replica_engine)
+    )
+
+    async with factory() as session:
+        assert session.bind is replica_engine
+    await replica_engine.dispose()
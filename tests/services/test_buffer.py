@@ -0,0 +1,80 @@
+# tests/services/test_buffer.py
+import asyncio
+import uuid
+
+import pytest
+
+from core.models import Feedback
+from services.buffer import IngestBuffer
+from services.ingest import IngestResult
+from utils.time_utils import utc_now
+
+
+@pytest.fixture
+def flushed(monkeypatch):
+    batches = []
+
+    async def fake_ingest_many(records):
+        batches.append(list(records))
+        return IngestResult()
+
+    monkeypatch.setattr("services.buffer.ingest_many", fake_ingest_many)
+    return batches
+
+
+def make_feedback(i):
+    return Feedback(
+        id=uuid.uuid4(),
+        external_id=f"conv-{i}",
+        source_type="intercom",
+        source_instance="push",
+        tenant_id="t1",
+        created_at=utc_now(),
+        fetched_at=utc_now(),
+        lang=None,
+        body="hi",
+        metadata_={},
+    )
+
+
+@pytest.mark.asyncio
+async def test_flushes_when_batch_is_full(flushed):
+    buffer = IngestBuffer(maxsize=100, batch_size=3, flush_interval=10)
+    buffer.start()
+    for i in range(3):
+        assert buffer.offer(make_feedback(i))
+
+    await asyncio.sleep(0.05)
+    assert [len(b) for b in flushed] == [3]
+    await buffer.stop()
+
+
+@pytest.mark.asyncio
+async def test_flushes_partial_batch_after_interval(flushed):
+    buffer = IngestBuffer(maxsize=100, batch_size=50, flush_interval=0.05)
+    buffer.start()
+    buffer.offer(make_feedback(1))
+
+    await asyncio.sleep(0.15)
+    assert [len(b) for b in flushed] == [1]
+    await buffer.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_queue_and_rejects_new_records(flushed):
+    buffer = IngestBuffer(maxsize=100, batch_size=50, flush_interval=10)
+    buffer.start()
+    for i in range(5):
+        buffer.offer(make_feedback(i))
+
+    await buffer.stop()
+
+    assert sum(len(b) for b in flushed) == 5
+    assert not buffer.offer(make_feedback(99))
+
+
+def test_offer_rejects_when_full():
+    buffer = IngestBuffer(maxsize=2)
+    assert buffer.offer(make_feedback(1))
+    assert buffer.offer(make_feedback(2))
+    assert not buffer.offer(make_feedback(3))
@@ -0,0 +1,136 @@
+# tests/services/test_bulk_load.py
+import gzip
+import json
+import uuid
+from datetime import timezone
+
+import pytest
+
+import services.bulk_load as bulk_load_module
+from core.models import Feedback
+from services.bulk_load import (
+    COPY_COLUMNS,
+    bulk_load,
+    iter_records,
+    read_records,
+    to_copy_row,
+)
+from services.ingest import ingest_many
+from services.seen import seen_keys
+from services.export import csv_chunks, ndjson_chunks
+from utils.time_utils import utc_now
+
+
+def export_rows(n):
+    now = utc_now()
+    return [
+        (
+            uuid.uuid4(),
+            f"ext-{i}",
+            "playstore",
+            "app1",
+            "t1",
+            now,
+            now,
+            "en",
+            f"body {i}, with comma",
+            {"rating": i},
+        )
+        for i in range(n)
+    ]
+
+
+async def dump(formatter, rows):
+    async def batches():
+        yield rows
+
+    return b"".join([chunk async for chunk in formatter(batches())])
+
+
+@pytest.mark.parametrize(
+    "formatter,name", [(ndjson_chunks, "dump.ndjson"), (csv_chunks, "dump.csv.gz")]
+)
+async def test_reads_back_export_formats(tmp_path, formatter, name):
+    rows = export_rows(3)
+    data = await dump(formatter, rows)
+    path = tmp_path / name
+    path.write_bytes(gzip.compress(data) if name.endswith(".gz") else data)
+
+    loaded = [fb async for fb in iter_records(path)]
+
+    assert [fb.id for fb in loaded] == [r[0] for r in rows]
+    assert [fb.body for fb in loaded] == [r[8] for r in rows]
+    assert loaded[2].metadata_ == {"rating": 2}
+    assert loaded[0].created_at == rows[0][5]
+
+
+def test_derives_missing_id_and_rejects_unknown_format(tmp_path):
+    path = tmp_path / "dump.jsonl"
+    record = {
+        "external_id": "abc",
+        "source_type": "twitter",
+        "tenant_id": "t1",
+        "created_at": "2024-01-01T00:00:00+00:00",
+        "body": "hi",
+    }
+    path.write_text(json.dumps(record) + "\n\n")
+
+    (fb,) = list(read_records(path))
+    assert fb.id == uuid.uuid5(uuid.NAMESPACE_URL, "abc")
+    assert fb.metadata_ == {}
+    with pytest.raises(ValueError):
+        read_records(tmp_path / "dump.parquet")
+
+
+def test_copy_row_matches_columns(tmp_path):
+    path = tmp_path / "dump.ndjson"
+    path.write_text(
+        json.dumps(
+            {
+                "external_id": "abc",
+                "source_type": "twitter",
+                "tenant_id": "t1",
+                "created_at": "2024-01-01T00:00:00",
+                "body": "hi",
+                "metadata_": {"k": [1]},
+            }
+        )
+    )
+    (fb,) = list(read_records(path))
+
+    row = dict(zip(COPY_COLUMNS, to_copy_row(fb)))
+    assert len(row) == len(COPY_COLUMNS)
+    assert row["created_at"].tzinfo == timezone.utc
+    assert row["fetched_at"] is None
+    assert row["metadata_"] == '{"k": [1]}'
+
+
+async def test_primary_key_clash_leaves_the_key_free(monkeypatch, pg_session):
+    monkeypatch.setattr(bulk_load_module, "engine", pg_session.kw["bind"])
+    monkeypatch.setattr("services.ingest.AsyncSessionLocal", pg_session)
+    monkeypatch.setattr("services.rollups.AsyncSessionLocal", pg_session)
+    monkeypatch.setattr(seen_keys, "max_keys", 0)
+    now = utc_now()
+
+    def record(external_id, id):
+        return Feedback(
+            id=id,
+            external_id=external_id,
+            source_type="playstore",
+            source_instance=None,
+            tenant_id="t1",
+            created_at=now,
+            fetched_at=None,
+            lang=None,
+            body="hi",
+            metadata_={},
+        )
+
+    clash_id = uuid.uuid4()
+    await bulk_load([record("a", clash_id)], parallelism=1)
+    # new key, but an id that is already taken: skipped
+    result = await bulk_load([record("b", clash_id), record("a", uuid.uuid4())])
+    assert result.inserted == 0 and result.duplicates == 2
+
+    # the skipped record's key wasn't left behind as if it were stored
+    assert (await ingest_many([record("b", uuid.uuid4())])).inserted == 1
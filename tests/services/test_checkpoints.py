@@ -0,0 +1,199 @@
+# tests/services/test_checkpoints.py
+import asyncio
+import uuid
+from datetime import timedelta
+
+import pytest
+
+import workers.scheduler as scheduler
+from adapters.pagination import Page, PaginationTruncated, paginate
+from config.settings import settings
+from core.models import Feedback
+from ports.fetcher import BaseFetcher
+from services.checkpoints import CheckpointAdvance, load_checkpoint, resume_since
+from services.ingest import ingest_many
+from utils.time_utils import as_utc, utc_now
+from workers.scheduler import Source, pull_source
+
+KEY = ("t1", "twitter", "search")
+
+
+@pytest.fixture(autouse=True)
+def use_sqlite(monkeypatch, sqlite_session):
+    monkeypatch.setattr("services.ingest.AsyncSessionLocal", sqlite_session)
+    monkeypatch.setattr("services.checkpoints.AsyncSessionLocal", sqlite_session)
+
+
+def tweet(external_id, created_at):
+    return Feedback(
+        id=uuid.uuid4(),
+        external_id=external_id,
+        source_type="twitter",
+        source_instance="search",
+        tenant_id="t1",
+        created_at=created_at,
+        fetched_at=utc_now(),
+        lang=None,
+        body="hi",
+        metadata_={},
+    )
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_advances_to_newest_record():
+    now = utc_now()
+    records = [tweet(str(i), now - timedelta(minutes=i)) for i in range(5)]
+
+    await ingest_many(records, batch_size=2, checkpoint=CheckpointAdvance(*KEY))
+
+    checkpoint = await load_checkpoint(*KEY)
+    assert as_utc(checkpoint.last_created_at) == now
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_ignores_stubs_and_never_moves_back():
+    now = utc_now()
+    await ingest_many([tweet("1", now)], checkpoint=CheckpointAdvance(*KEY))
+
+    older = [
+        tweet("2", now - timedelta(hours=1)),
+        tweet("stub-twitter", now + timedelta(hours=1)),
+    ]
+    await ingest_many(older, checkpoint=CheckpointAdvance(*KEY))
+
+    checkpoint = await load_checkpoint(*KEY)
+    assert as_utc(checkpoint.last_created_at) == now
+
+
+@pytest.mark.asyncio
+async def test_interrupted_stream_keeps_rows_but_not_checkpoint():
+    now = utc_now()
+
+    async def failing_stream():
+        yield tweet("1", now)
+        yield tweet("2", now)
+        raise RuntimeError("page 2 failed")
+
+    with pytest.raises(RuntimeError):
+        await ingest_many(
+            failing_stream(), batch_size=1, checkpoint=CheckpointAdvance(*KEY)
+        )
+
+    assert await load_checkpoint(*KEY) is None
+    result = await ingest_many([tweet("1", now), tweet("2", now)])
+    assert result.duplicates == 2
+
+
+@pytest.mark.asyncio
+async def test_page_cap_keeps_rows_but_not_checkpoint(monkeypatch):
+    monkeypatch.setattr(settings, "MAX_PAGES_PER_FETCH", 2)
+    start = utc_now() - timedelta(hours=1)
+    await ingest_many([tweet("0", start)], checkpoint=CheckpointAdvance(*KEY))
+
+    def page_record(page):
+        return tweet(f"p{page}", start + timedelta(minutes=30 - page))
+
+    async def newest_first(cursor, size):
+        page = int(cursor or 0)
+        return Page([page_record(page)], str(page + 1))
+
+    with pytest.raises(PaginationTruncated):
+        await ingest_many(
+            paginate(newest_first), batch_size=1, checkpoint=CheckpointAdvance(*KEY)
+        )
+
+    # the older, unfetched part of the window must be fetched again
+    checkpoint = await load_checkpoint(*KEY)
+    assert as_utc(checkpoint.last_created_at) == start
+    result = await ingest_many([page_record(0), page_record(1)])
+    assert result.duplicates == 2
+
+
+class NewestFirst(BaseFetcher):
+    """One tweet per page, newest first, each page pointing at the next."""
+
+    def __init__(self, records, hang_at=None):
+        self.records = records
+        self.hang_at = hang_at
+        self.calls = []
+
+    async def fetch(self, since, until, cursor=None):
+        async def fetch_page(page_cursor, size):
+            self.calls.append((since, until, page_cursor))
+            page = int(page_cursor or 0)
+            if page == self.hang_at:
+                await asyncio.sleep(3600)
+            more = page + 1 < len(self.records)
+            return Page([self.records[page]], str(page + 1) if more else None)
+
+        pages = paginate(fetch_page, on_cursor=self.remember_cursor, cursor=cursor)
+        async for fb in pages:
+            yield fb
+
+
+@pytest.mark.asyncio
+async def test_truncated_pull_resumes_at_its_cursor(monkeypatch):
+    monkeypatch.setattr(settings, "MAX_PAGES_PER_FETCH", 2)
+    source = Source("twitter", *KEY[::2])
+    now = utc_now()
+    records = [tweet(str(i), now - timedelta(minutes=i)) for i in range(5)]
+    fetchers = []
+
+    def build_adapter(_):
+        fetchers.append(NewestFirst(records))
+        return fetchers[-1]
+
+    monkeypatch.setattr(scheduler, "build_adapter", build_adapter)
+
+    for pull in range(2):
+        with pytest.raises(PaginationTruncated):
+            await pull_source(source, now + timedelta(minutes=pull))
+        checkpoint = await load_checkpoint(*KEY)
+        assert checkpoint.last_created_at is None
+        assert checkpoint.last_cursor == str(2 * pull + 2)
+    result = await pull_source(source, now + timedelta(minutes=2))
+
+    # every pull stayed in the first pull's window and went on where it stopped
+    assert {(since, until) for f in fetchers for since, until, _ in f.calls} == {
+        fetchers[0].calls[0][:2]
+    }
+    assert [c for f in fetchers for _, _, c in f.calls] == [None, "1", "2", "3", "4"]
+    assert result.inserted == 1
+    checkpoint = await load_checkpoint(*KEY)
+    assert checkpoint.last_cursor is None
+    assert as_utc(checkpoint.last_created_at) == now
+    assert (await ingest_many(records)).duplicates == 5
+
+
+@pytest.mark.asyncio
+async def test_cancelled_pull_resumes_at_its_cursor(monkeypatch):
+    source = Source("twitter", *KEY[::2])
+    now = utc_now()
+    records = [tweet(str(i), now - timedelta(minutes=i)) for i in range(4)]
+    fetchers = [NewestFirst(records, hang_at=2), NewestFirst(records)]
+    monkeypatch.setattr(scheduler, "build_adapter", lambda _: fetchers.pop(0))
+
+    # the pull timeout cancels it while page 2 hangs
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(pull_source(source, now), timeout=0.2)
+
+    checkpoint = await load_checkpoint(*KEY)
+    assert checkpoint.last_cursor == "2"
+    assert checkpoint.last_created_at is None
+    result = await pull_source(source, now + timedelta(minutes=1))
+    assert result.inserted == 2 and result.duplicates == 0
+    assert as_utc((await load_checkpoint(*KEY)).last_created_at) == now
+
+
+def test_resume_since_uses_checkpoint_with_overlap():
+    now = utc_now()
+
+    class Checkpoint:
+        last_created_at = now - timedelta(minutes=10)
+
+    since = resume_since(Checkpoint(), "twitter", now)
+    overlap = timedelta(seconds=settings.CHECKPOINT_OVERLAP_SEC)
+    assert since == Checkpoint.last_created_at - overlap
+
+    fresh = resume_since(None, "twitter", now)
+    assert fresh == now - timedelta(seconds=settings.POLL_INTERVALS["twitter"])
@@ -1,34 +1,14 @@
 # tests/services/test_ingest.py
 
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import pytest
-from sqlalchemy.dialects.sqlite import JSON as SQLiteJSON
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.dialects import postgresql
 from utils.time_utils import utc_now
 from core.models import Feedback
-from db.models import Base, FeedbackORM
-from services.ingest import ingest
-
-
-@pytest.fixture
-async def sqlite_session():
-    # Use in-memory SQLite
-    url = "sqlite+aiosqlite:///:memory:"
-    engine = create_async_engine(url, echo=False)
-
-    # Monkey-patch JSONB → SQLite JSON
-    FeedbackORM.__table__.c.metadata_.type = SQLiteJSON()
-
-    # Create tables
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-
-    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
-    yield session_factory
-
-    await engine.dispose()
+from services.ingest import _insert_ignoring_duplicates, ingest, ingest_many
+from services.seen import seen_keys
 
 
 @pytest.mark.asyncio
@@ -56,3 +36,122 @@ async def test_ingest_insert_and_duplicate(monkeypatch, sqlite_session):
     # Second (duplicate) insert should return False
     inserted2 = await ingest(fb)
     assert inserted2 is False
+
+
+def make_feedback(external_id: str, tenant_id: str = "t1") -> Feedback:
+    return Feedback(
+        id=uuid.uuid4(),
+        external_id=external_id,
+        source_type="playstore",
+        source_instance="app1",
+        tenant_id=tenant_id,
+        created_at=utc_now(),
+        fetched_at=utc_now(),
+        lang="en",
+        body="hi",
+        metadata_={},
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("max_keys", [None, 0], ids=["seen-filter", "no-seen-filter"])
+async def test_ingest_many_counts_per_batch(monkeypatch, sqlite_session, max_keys):
+    monkeypatch.setattr("services.ingest.AsyncSessionLocal", sqlite_session)
+    if max_keys is not None:
+        monkeypatch.setattr(seen_keys, "max_keys", max_keys)
+
+    first = [make_feedback(f"e{i}") for i in range(5)]
+    result = await ingest_many(first, batch_size=2)
+    assert [b.inserted for b in result.batches] == [2, 2, 1]
+    assert result.inserted == 5
+    assert result.duplicates == 0
+    assert set(result.inserted_ids) == {fb.id for fb in first}
+
+    # overlapping window: 3 already stored, 2 new
+    second = [make_feedback(f"e{i}") for i in range(3, 8)]
+    result = await ingest_many(second, batch_size=10)
+    assert len(result.batches) == 1
+    assert result.inserted == 3
+    assert result.duplicates == 2
+
+
+@pytest.mark.asyncio
+async def test_ingest_many_accepts_async_iterable(monkeypatch, sqlite_session):
+    monkeypatch.setattr("services.ingest.AsyncSessionLocal", sqlite_session)
+
+    async def stream():
+        for i in range(3):
+            yield make_feedback(f"a{i}")
+
+    result = await ingest_many(stream(), batch_size=2)
+    assert len(result.batches) == 2
+    assert result.inserted == 3
+
+
+@pytest.mark.asyncio
+async def test_ingest_many_isolates_primary_key_clash(monkeypatch, sqlite_session):
+    monkeypatch.setattr("services.ingest.AsyncSessionLocal", sqlite_session)
+
+    clash = make_feedback("x1", tenant_id="t1")
+    await ingest_many([clash])
+
+    # a different natural key escapes the dedup constraint but hits the PK
+    other = make_feedback("x1-renamed", tenant_id="t1")
+    other.id, other.created_at = clash.id, clash.created_at
+    fresh = make_feedback("x2")
+    result = await ingest_many([other, fresh])
+    assert result.inserted == 1
+    assert result.duplicates == 1
+    assert result.inserted_ids == [fresh.id]
+
+
+@pytest.mark.asyncio
+async def test_refetch_with_new_timestamp_is_a_duplicate(monkeypatch, sqlite_session):
+    monkeypatch.setattr("services.ingest.AsyncSessionLocal", sqlite_session)
+    # only the database decides
+    monkeypatch.setattr(seen_keys, "max_keys", 0)
+
+    await ingest_many([make_feedback("r1"), make_feedback("r2")])
+
+    # adapters fall back to utc_now() when upstream has no usable timestamp
+    again = [make_feedback("r1"), make_feedback("r2"), make_feedback("r2")]
+    for fb in again:
+        fb.created_at += timedelta(days=40)
+    result = await ingest_many(again)
+    assert result.inserted == 0
+    assert result.duplicates == 3
+
+
+def without_optional_fields(fb: Feedback) -> Feedback:
+    fb.source_instance = fb.fetched_at = fb.lang = None
+    return fb
+
+
+def test_insert_compiles_for_postgres():
+    batch = [without_optional_fields(make_feedback(f"n{i}")) for i in range(2)]
+
+    sql = str(_insert_ignoring_duplicates(batch).compile(dialect=postgresql.dialect()))
+
+    # all-NULL VALUES columns would otherwise be text
+    assert "CAST(incoming.lang AS VARCHAR)" in sql
+    assert "CAST(incoming.fetched_at AS TIMESTAMP WITH TIME ZONE)" in sql
+    assert "NOT (EXISTS (SELECT" in sql
+    assert "stored.source_instance IS NOT DISTINCT FROM incoming.source_instance" in sql
+    assert "ON CONFLICT ON CONSTRAINT uq_feedback_tenant_source_external DO NOTHING" in sql
+
+
+@pytest.mark.asyncio
+async def test_postgres_insert_with_all_null_columns(monkeypatch, pg_session):
+    monkeypatch.setattr("services.ingest.AsyncSessionLocal", pg_session)
+    monkeypatch.setattr("services.rollups.AsyncSessionLocal", pg_session)
+    monkeypatch.setattr(seen_keys, "max_keys", 0)
+
+    batch = [without_optional_fields(make_feedback(f"n{i}")) for i in range(3)]
+    result = await ingest_many(batch)
+    assert result.inserted == 3 and not result.failed
+
+    again = [without_optional_fields(make_feedback(f"n{i}")) for i in range(4)]
+    for fb in again:
+        fb.created_at += timedelta(days=40)
+    result = await ingest_many(again)
+    assert result.inserted == 1 and result.duplicates == 3
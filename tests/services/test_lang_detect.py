@@ -0,0 +1,162 @@
+# tests/services/test_lang_detect.py
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select
+
+import services.lang_detect as lang_detect
+import services.rollups as rollups
+from config.settings import settings
+from core.models import Feedback
+from db.models import FeedbackORM, FeedbackRollupORM
+from services.ingest import ingest_many
+from services.lang_detect import LanguageDetector, backfill_missing_langs, detect_batch
+from services.read_cache import read_cache
+
+T0 = datetime(2024, 3, 1, 12, tzinfo=timezone.utc)
+
+
+# module level: the pool's worker processes import it by name
+def german_or_nothing(texts, min_prob, model_path):
+    return ["de" if " der " in f" {text} " else None for text in texts]
+
+
+def broken(texts, min_prob, model_path):
+    raise RuntimeError("model missing")
+
+
+def make_feedback(external_id, body, lang=None):
+    return Feedback(
+        id=uuid.uuid4(),
+        external_id=external_id,
+        source_type="twitter",
+        source_instance="search",
+        tenant_id="t1",
+        created_at=T0,
+        fetched_at=T0,
+        lang=lang,
+        body=body,
+        metadata_={},
+    )
+
+
+@pytest.fixture(scope="module")
+def detector():
+    # starting worker processes is the slow part: share one pool
+    detector = LanguageDetector(workers=2, batch_size=2, detect=german_or_nothing)
+    yield detector
+    detector.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def detect_db(monkeypatch, sqlite_session):
+    monkeypatch.setattr("services.ingest.AsyncSessionLocal", sqlite_session)
+    monkeypatch.setattr(lang_detect, "AsyncSessionLocal", sqlite_session)
+    monkeypatch.setattr(rollups, "AsyncSessionLocal", sqlite_session)
+
+
+def records():
+    return [
+        make_feedback("kept", "der Akku hält nicht", lang="en"),
+        make_feedback("de1", "der Akku hält nicht"),
+        make_feedback("de2", "Update ist der Hammer"),
+        make_feedback("short", "ok der"),
+        make_feedback("unknown", "no idea what this is"),
+    ]
+
+
+async def stored(session_factory):
+    async with session_factory() as session:
+        feedback = await session.execute(select(FeedbackORM))
+        langs = {fb.external_id: fb.lang for fb in feedback.scalars()}
+        counts = await session.execute(
+            select(FeedbackRollupORM.lang, FeedbackRollupORM.count).where(
+                FeedbackRollupORM.granularity == "day"
+            )
+        )
+        return langs, dict(counts.all())
+
+
+async def test_fills_only_missing_langs_of_long_enough_bodies(detector):
+    batch = records()
+
+    assert await detector.fill_missing(batch) == 2
+
+    assert [fb.lang for fb in batch] == ["en", "de", "de", None, None]
+
+
+async def test_records_without_a_body_are_skipped(detector):
+    empty, missing = make_feedback("empty", ""), make_feedback("missing", "")
+    missing.body = None
+
+    assert await detector.fill_missing([empty, missing]) == 0
+
+    assert empty.lang is None and missing.lang is None
+
+
+async def test_a_failing_detector_leaves_records_alone():
+    detector = LanguageDetector(workers=1, detect=broken)
+    batch = records()
+    try:
+        assert await detector.fill_missing(batch) == 0
+    finally:
+        detector.shutdown()
+
+    assert [fb.lang for fb in batch] == ["en", None, None, None, None]
+
+
+async def test_ingest_detects_before_inserting(monkeypatch, detector, sqlite_session):
+    monkeypatch.setattr("services.ingest.lang_detector", detector)
+
+    await ingest_many(records())
+
+    langs, counts = await stored(sqlite_session)
+    assert langs["de1"] == langs["de2"] == "de" and langs["unknown"] is None
+    assert counts == {"en": 1, "de": 2, "": 2}
+
+
+async def test_ingest_writes_rows_when_detection_raises(monkeypatch, sqlite_session):
+    class Unavailable:
+        async def fill_missing(self, records):
+            raise OSError("cannot start worker processes")
+
+    monkeypatch.setattr("services.ingest.lang_detector", Unavailable())
+
+    result = await ingest_many(records())
+
+    assert result.inserted == 5 and not result.failed
+    langs, _ = await stored(sqlite_session)
+    assert langs["kept"] == "en" and langs["de1"] is None
+
+
+async def test_backfill_updates_rows_and_moves_their_rollups(detector, sqlite_session):
+    await ingest_many(records())
+    generation = read_cache.generation("t1")
+
+    scanned, updated = await backfill_missing_langs(batch_size=2, detector=detector)
+
+    assert (scanned, updated) == (4, 2)
+    # cached /feedback bodies of t1 still show lang=None
+    assert read_cache.generation("t1") > generation
+    langs, counts = await stored(sqlite_session)
+    assert langs["de1"] == langs["de2"] == "de"
+    assert counts == {"en": 1, "de": 2, "": 2}
+
+
+def test_fasttext_model():
+    pytest.importorskip("fasttext")
+    if not lang_detect.model_available():
+        pytest.skip("LANG_DETECT_MODEL does not point at lid.176.ftz")
+
+    langs = detect_batch(
+        [
+            "Die App stürzt ständig ab, seit dem letzten Update geht nichts mehr",
+            "The app keeps crashing since the last update,\nnothing works anymore",
+            "12345 !!! 67890",
+        ],
+        0.5,
+        settings.LANG_DETECT_MODEL,
+    )
+
+    assert langs == ["de", "en", None]
@@ -0,0 +1,89 @@
+# tests/services/test_read_cache.py
+import asyncio
+
+import pytest
+
+import services.read_cache as read_cache_module
+from services.read_cache import ReadCache
+
+
+class Loader:
+    def __init__(self, body=b"page", delay=0.0):
+        self.body = body
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.body
+
+
+async def test_hits_until_the_ttl_runs_out(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(read_cache_module.time, "monotonic", lambda: now[0])
+    cache, load = ReadCache(max_bytes=10_000, ttl=5), Loader()
+
+    assert await cache.get("/feedback", "t1", (1,), load) == b"page"
+    await cache.get("/feedback", "t1", (1,), load)
+    now[0] += 5
+    await cache.get("/feedback", "t1", (1,), load)
+
+    assert load.calls == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+async def test_concurrent_misses_share_one_load():
+    cache, load = ReadCache(max_bytes=10_000, ttl=60), Loader(delay=0.01)
+
+    bodies = await asyncio.gather(
+        *(cache.get("/feedback", "t1", (1,), load) for _ in range(5))
+    )
+
+    assert bodies == [b"page"] * 5 and load.calls == 1
+    assert (cache.misses, cache.coalesced) == (1, 4)
+    assert cache.stats()["hit_ratio"] == 0.8
+
+
+async def test_invalidate_bumps_only_that_tenant():
+    cache, load = ReadCache(max_bytes=10_000, ttl=60), Loader()
+    for tenant in ("t1", "t2"):
+        await cache.get("/feedback", tenant, (), load)
+        await cache.get("/feedback/{feedback_id}", tenant, ("id",), load)
+
+    cache.invalidate({"t1"})
+    for tenant in ("t1", "t2"):
+        await cache.get("/feedback", tenant, (), load)
+        await cache.get("/feedback/{feedback_id}", tenant, ("id",), load)
+
+    # t1's listing and row are loaded again (a row's lang can be backfilled)
+    assert load.calls == 6
+
+
+async def test_evicts_least_recently_used_past_max_bytes():
+    overhead = read_cache_module._ENTRY_OVERHEAD
+    cache = ReadCache(max_bytes=2 * (100 + overhead), ttl=60)
+    load = Loader(body=b"x" * 100)
+
+    await cache.get("/feedback", "t1", ("a",), load)
+    await cache.get("/feedback", "t1", ("b",), load)
+    await cache.get("/feedback", "t1", ("a",), load)  # b is now the oldest
+    await cache.get("/feedback", "t1", ("c",), load)
+    await cache.get("/feedback", "t1", ("a",), load)
+    await cache.get("/feedback", "t1", ("b",), load)
+
+    assert load.calls == 4 and cache.evictions == 2
+    assert cache.size_bytes <= cache.max_bytes
+
+
+async def test_failed_loads_are_not_cached():
+    cache = ReadCache(max_bytes=10_000, ttl=60)
+
+    async def fail():
+        raise LookupError("not found")
+
+    for _ in range(2):
+        with pytest.raises(LookupError):
+            await cache.get("/feedback", "t1", (), fail)
+
+    assert cache.misses == 2 and cache.stats()["entries"] == 0
@@ -0,0 +1,108 @@
+# tests/services/test_rollups.py
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import delete, select, update
+
+import services.rollups as rollups
+from core.models import Feedback
+from db.models import FeedbackORM, FeedbackRollupORM
+from services.ingest import ingest_many
+
+T0 = datetime(2024, 3, 1, 22, 30, tzinfo=timezone.utc)
+
+
+def make_feedback(external_id, created_at, lang="en", tenant_id="t1"):
+    return Feedback(
+        id=uuid.uuid4(),
+        external_id=external_id,
+        source_type="playstore",
+        source_instance="app1",
+        tenant_id=tenant_id,
+        created_at=created_at,
+        fetched_at=created_at,
+        lang=lang,
+        body="hi",
+        metadata_={},
+    )
+
+
+@pytest.fixture(autouse=True)
+def rollup_db(monkeypatch, sqlite_session):
+    monkeypatch.setattr("services.ingest.AsyncSessionLocal", sqlite_session)
+    monkeypatch.setattr(rollups, "AsyncSessionLocal", sqlite_session)
+
+
+async def rollup_counts(session_factory):
+    async with session_factory() as session:
+        rows = await session.execute(select(FeedbackRollupORM))
+        return {
+            (r.tenant_id, r.granularity, r.bucket.replace(tzinfo=None), r.lang): r.count
+            for r in rows.scalars()
+        }
+
+
+def records():
+    # 22:30, 23:10 and 23:50 on March 1st, 00:20 on March 2nd
+    return [
+        make_feedback(f"e{i}", T0 + timedelta(minutes=40 * i), lang)
+        for i, lang in enumerate(["en", "en", None, "en"])
+    ]
+
+
+EXPECTED = {
+    ("t1", "hour", datetime(2024, 3, 1, 22), "en"): 1,
+    ("t1", "hour", datetime(2024, 3, 1, 23), "en"): 1,
+    ("t1", "hour", datetime(2024, 3, 1, 23), ""): 1,
+    ("t1", "hour", datetime(2024, 3, 2, 0), "en"): 1,
+    ("t1", "day", datetime(2024, 3, 1), "en"): 2,
+    ("t1", "day", datetime(2024, 3, 1), ""): 1,
+    ("t1", "day", datetime(2024, 3, 2), "en"): 1,
+}
+
+
+async def test_only_inserted_rows_are_counted(sqlite_session):
+    batch = records()
+    await ingest_many(batch[:3])
+
+    # two duplicates and one new row
+    result = await ingest_many(batch[1:])
+
+    assert result.inserted == 1 and result.duplicates == 2
+    assert await rollup_counts(sqlite_session) == EXPECTED
+
+
+async def test_in_batch_duplicates_are_counted_once(sqlite_session):
+    batch = records()
+    # same record (and id) twice, e.g. on two overlapping pages
+    repeat = batch[0].copy(update={"body": "edited"})
+
+    result = await ingest_many(batch + [repeat])
+
+    assert result.inserted == 4 and result.duplicates == 1
+    assert result.inserted_ids == [fb.id for fb in batch]
+    assert await rollup_counts(sqlite_session) == EXPECTED
+
+
+async def test_rebuild_recounts_a_range_from_feedback(sqlite_session):
+    await ingest_many(records())
+    await ingest_many([make_feedback("other", T0, tenant_id="t2")])
+    async with sqlite_session() as session:
+        # drift: a lost update and a row deleted behind the rollups' back
+        await session.execute(update(FeedbackRollupORM).values(count=99))
+        await session.execute(delete(FeedbackORM).where(FeedbackORM.lang.is_(None)))
+        await session.commit()
+
+    rows = await rollups.rebuild_rollups("t1", since=T0, until=T0 + timedelta(hours=1))
+
+    counts = await rollup_counts(sqlite_session)
+    # March 1st of t1 is recounted; March 2nd and t2 are left alone
+    assert rows == 3
+    assert {k: v for k, v in counts.items() if k[0] == "t1" and k[2].day == 1} == {
+        ("t1", "hour", datetime(2024, 3, 1, 22), "en"): 1,
+        ("t1", "hour", datetime(2024, 3, 1, 23), "en"): 1,
+        ("t1", "day", datetime(2024, 3, 1), "en"): 2,
+    }
+    assert counts[("t1", "day", datetime(2024, 3, 2), "en")] == 99
+    assert counts[("t2", "day", datetime(2024, 3, 1), "en")] == 99
@@ -0,0 +1,90 @@
+# tests/services/test_seen.py
+import uuid
+from datetime import timedelta
+
+import pytest
+
+from core.models import Feedback
+from services.ingest import ingest_many
+from services.seen import SeenKeys, seen_key, seen_keys
+from utils.time_utils import utc_now
+
+
+def make_feedback(external_id, created_at=None):
+    return Feedback(
+        id=uuid.uuid4(),
+        external_id=external_id,
+        source_type="playstore",
+        source_instance="app1",
+        tenant_id="t1",
+        created_at=created_at or utc_now(),
+        fetched_at=utc_now(),
+        lang="en",
+        body="hi",
+        metadata_={},
+    )
+
+
+def test_lru_evicts_oldest_and_counts(monkeypatch):
+    keys = SeenKeys(max_keys=2, ttl=60)
+    keys.add_many([("t", "s", "i", "a"), ("t", "s", "i", "b")])
+    assert ("t", "s", "i", "a") in keys  # refreshes "a"
+    keys.add_many([("t", "s", "i", "c")])
+
+    assert ("t", "s", "i", "b") not in keys
+    assert ("t", "s", "i", "a") in keys
+    assert keys.stats() == {"size": 2, "hits": 2, "misses": 1, "evictions": 1}
+
+
+def test_expired_keys_are_rechecked(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("services.seen.time.monotonic", lambda: clock[0])
+    keys = SeenKeys(max_keys=10, ttl=5)
+    keys.add_many([("t", "s", "i", "a")])
+
+    clock[0] += 6
+    assert ("t", "s", "i", "a") not in keys
+    assert len(keys) == 0
+
+
+@pytest.mark.asyncio
+async def test_known_keys_skip_the_database(monkeypatch, sqlite_session):
+    monkeypatch.setattr("services.ingest.AsyncSessionLocal", sqlite_session)
+    records = [make_feedback(f"e{i}") for i in range(3)]
+    await ingest_many(records)
+
+    def fail():
+        raise AssertionError("database touched for a known key")
+
+    monkeypatch.setattr("services.ingest.AsyncSessionLocal", fail)
+    result = await ingest_many(records)
+
+    assert (result.inserted, result.duplicates) == (0, 3)
+    assert seen_keys.hits == 3
+
+
+@pytest.mark.asyncio
+async def test_forgotten_keys_still_dedup_in_database(monkeypatch, sqlite_session):
+    monkeypatch.setattr("services.ingest.AsyncSessionLocal", sqlite_session)
+    records = [make_feedback(f"e{i}") for i in range(3)]
+    await ingest_many(records)
+    seen_keys.clear()
+
+    result = await ingest_many(records + [make_feedback("new")])
+
+    assert (result.inserted, result.duplicates) == (1, 3)
+    assert all(seen_key(fb) in seen_keys for fb in records)
+
+
+@pytest.mark.asyncio
+async def test_warm_loads_recent_rows(monkeypatch, sqlite_session):
+    monkeypatch.setattr("services.ingest.AsyncSessionLocal", sqlite_session)
+    monkeypatch.setattr("services.seen.AsyncSessionLocal", sqlite_session)
+    recent = make_feedback("recent")
+    old = make_feedback("old", created_at=utc_now() - timedelta(days=30))
+    await ingest_many([recent, old])
+    seen_keys.clear()
+
+    assert await seen_keys.warm() == 1
+    assert seen_key(recent) in seen_keys
+    assert seen_key(old) not in seen_keys
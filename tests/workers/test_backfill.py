@@ -0,0 +1,182 @@
+# tests/workers/test_backfill.py
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select
+
+import services.ingest as ingest_module
+import workers.backfill as backfill
+from adapters.pagination import PaginationTruncated
+from core.exceptions import AdapterError
+from core.models import Feedback
+from db.models import BackfillWindowORM, FeedbackORM
+from services.seen import seen_keys
+from workers.backfill import backfill_source, plan_windows
+from workers.scheduler import Source
+
+SOURCE = Source("twitter", "t1", "search")
+SINCE = datetime(2024, 1, 1, 6, tzinfo=timezone.utc)
+UNTIL = datetime(2024, 1, 4, tzinfo=timezone.utc)
+JAN_2 = datetime(2024, 1, 2, tzinfo=timezone.utc)
+JAN_3 = datetime(2024, 1, 3, tzinfo=timezone.utc)
+
+
+class FakeAdapter:
+    """One record per hour of the requested window."""
+
+    honours_until = True
+    fail_on = set()
+    truncate_on = set()
+    calls = []
+    cursors = []
+    running = peak = 0
+
+    last_cursor = None
+
+    async def fetch(self, since, until, cursor=None):
+        FakeAdapter.calls.append((since, until))
+        FakeAdapter.cursors.append(cursor)
+        FakeAdapter.running += 1
+        FakeAdapter.peak = max(FakeAdapter.peak, FakeAdapter.running)
+        try:
+            await asyncio.sleep(0.01)
+            if since in FakeAdapter.fail_on:
+                raise AdapterError("upstream down")
+            # one record per page; the cursor is the next page's offset in hours
+            at = since + timedelta(hours=int(cursor or 0))
+            while at < until:
+                yield Feedback(
+                    id=uuid.uuid4(),
+                    external_id=f"tw-{at.isoformat()}",
+                    source_type="twitter",
+                    source_instance="search",
+                    tenant_id="t1",
+                    created_at=at,
+                    fetched_at=at,
+                    lang="en",
+                    body="old tweet",
+                    metadata_={},
+                )
+                at += timedelta(hours=1)
+                self.last_cursor = str(int((at - since) / timedelta(hours=1)))
+                if since in FakeAdapter.truncate_on and cursor is None:
+                    raise PaginationTruncated("Stopped after 1 pages")
+        finally:
+            FakeAdapter.running -= 1
+
+
+@pytest.fixture(autouse=True)
+def fake_backfill(monkeypatch, sqlite_session):
+    FakeAdapter.fail_on = set()
+    FakeAdapter.truncate_on = set()
+    FakeAdapter.calls = []
+    FakeAdapter.cursors = []
+    FakeAdapter.peak = 0
+    monkeypatch.setattr(backfill, "build_adapter", lambda source: FakeAdapter())
+    monkeypatch.setattr(backfill, "AsyncSessionLocal", sqlite_session)
+    monkeypatch.setattr(ingest_module, "AsyncSessionLocal", sqlite_session)
+
+
+def test_windows_follow_a_fixed_grid():
+    windows = plan_windows(SINCE, UNTIL, 24 * 3600)
+
+    assert windows == [(SINCE, JAN_2), (JAN_2, JAN_3), (JAN_3, UNTIL)]
+    # naive datetimes are UTC
+    assert plan_windows(SINCE.replace(tzinfo=None), UNTIL, 24 * 3600) == windows
+
+
+async def test_windows_run_concurrently_and_write_everything(sqlite_session):
+    report = await backfill_source(SOURCE, SINCE, UNTIL, window_sec=6 * 3600)
+
+    assert report.windows == 11 and len(report.completed) == 11
+    assert report.inserted == 66 and not report.failed
+    assert 1 < FakeAdapter.peak <= 4
+    # history stays out of the live seen-key filter
+    assert seen_keys.stats()["size"] == 0
+    async with sqlite_session() as session:
+        count = await session.scalar(select(func.count()).select_from(FeedbackORM))
+    assert count == 66
+
+
+async def test_interrupted_backfill_resumes_missing_windows(sqlite_session):
+    FakeAdapter.fail_on = {JAN_2}
+
+    first = await backfill_source(SOURCE, SINCE, UNTIL)
+    assert len(first.completed) == 2 and list(first.failed) == [(JAN_2, JAN_3)]
+
+    FakeAdapter.fail_on = set()
+    FakeAdapter.calls = []
+    second = await backfill_source(SOURCE, SINCE, UNTIL)
+
+    assert second.skipped == 2 and len(second.completed) == 1
+    assert FakeAdapter.calls == list(first.failed)
+    assert second.inserted == 24
+    async with sqlite_session() as session:
+        rows = await session.scalar(
+            select(func.count()).select_from(BackfillWindowORM)
+        )
+    assert rows == 3
+
+
+async def test_truncated_window_resumes_at_its_cursor(sqlite_session):
+    FakeAdapter.truncate_on = {JAN_2}
+
+    first = await backfill_source(SOURCE, SINCE, UNTIL)
+
+    assert len(first.completed) == 2
+    assert "resumes at cursor 1" in first.failed[(JAN_2, JAN_3)]
+    async with sqlite_session() as session:
+        rows = await session.scalar(select(func.count()).select_from(FeedbackORM))
+    # what was fetched before the cap is kept
+    assert rows == 18 + 24 + 1
+
+    FakeAdapter.calls, FakeAdapter.cursors = [], []
+    second = await backfill_source(SOURCE, SINCE, UNTIL)
+
+    assert second.completed == [(JAN_2, JAN_3)] and not second.failed
+    assert FakeAdapter.cursors == ["1"]
+    assert second.inserted == 23 and second.duplicates == 0
+    async with sqlite_session() as session:
+        key = ("t1", "twitter", "search", JAN_2, JAN_3)
+        window = await session.get(BackfillWindowORM, key)
+    assert window.records == 24 and window.cursor is None
+
+
+async def test_unbounded_window_resumes_under_a_later_until(monkeypatch):
+    monkeypatch.setattr(FakeAdapter, "honours_until", False)
+    FakeAdapter.truncate_on = {SINCE}
+
+    first = await backfill_source(SOURCE, SINCE, JAN_3)
+    assert list(first.failed) == [(SINCE, JAN_3)]
+
+    # the rerun's `until` defaults to a later now; the stopped window is kept
+    second = await backfill_source(SOURCE, SINCE, UNTIL)
+
+    assert second.completed == [(SINCE, JAN_3)]
+    assert FakeAdapter.cursors == [None, "1"]
+    assert second.inserted == 41
+
+
+async def test_partitions_are_created_for_the_range(monkeypatch):
+    starts = []
+
+    async def ensure_partitions(conn, start=None):
+        starts.append(start)
+        return []
+
+    monkeypatch.setattr(backfill, "ensure_partitions", ensure_partitions)
+
+    await backfill_source(SOURCE, SINCE, UNTIL)
+
+    assert starts == [SINCE.date().replace(day=1)]
+
+
+async def test_unbounded_adapters_get_one_window(monkeypatch):
+    monkeypatch.setattr(FakeAdapter, "honours_until", False)
+
+    report = await backfill_source(SOURCE, SINCE, UNTIL)
+
+    assert report.windows == 1
+    assert FakeAdapter.calls == [(SINCE, UNTIL)]
@@ -0,0 +1,100 @@
+# tests/workers/test_leader.py
+import asyncio
+
+from workers.leader import LeaderElection
+
+RENEW = 0.01
+
+
+class FakeLock:
+    """Stands in for the advisory lock: one holder, like one Postgres session."""
+
+    def __init__(self):
+        self.holder = None
+
+
+class FakeElection(LeaderElection):
+    def __init__(self, lock, name):
+        super().__init__(key=1, renew_sec=RENEW, lease_sec=1)
+        self.lock = lock
+        self.identity = name
+        self.session_alive = True
+
+    @property
+    def coordinated(self):
+        return True
+
+    async def _try_acquire(self):
+        if self.lock.holder is None:
+            self.lock.holder = self
+        return self.lock.holder is self
+
+    async def _renew(self):
+        if not self.session_alive:
+            raise ConnectionError("connection is closed")
+
+    async def _disconnect(self):
+        if self.lock.holder is self:
+            self.lock.holder = None
+        self.session_alive = True
+
+    def begin(self, log):
+        # the handle on_elected returns is what on_deposed gets
+        self.start(
+            on_elected=lambda: log.append(f"{self.identity} elected") or self.identity,
+            on_deposed=lambda handle: log.append(f"{handle} deposed"),
+        )
+
+
+async def wait_for(condition):
+    for _ in range(200):
+        if condition():
+            return
+        await asyncio.sleep(RENEW)
+    raise AssertionError("condition never held")
+
+
+async def test_one_leader_and_failover_on_stop():
+    lock, log = FakeLock(), []
+    a, b = FakeElection(lock, "a"), FakeElection(lock, "b")
+    a.begin(log)
+    await wait_for(lambda: a.is_leader)
+    b.begin(log)
+    await asyncio.sleep(5 * RENEW)
+    assert not b.is_leader
+
+    await a.stop()
+    await wait_for(lambda: b.is_leader)
+    await b.stop()
+
+    assert log == ["a elected", "a deposed", "b elected", "b deposed"]
+
+
+async def test_leader_steps_down_before_a_successor_starts():
+    lock, log = FakeLock(), []
+    a, b = FakeElection(lock, "a"), FakeElection(lock, "b")
+    a.begin(log)
+    await wait_for(lambda: a.is_leader)
+    b.begin(log)
+
+    # Postgres cuts a's session: the lock is free before a finds out
+    a.session_alive = False
+    lock.holder = None
+    await wait_for(lambda: b.is_leader)
+    await asyncio.gather(a.stop(), b.stop())
+
+    assert log == ["a elected", "a deposed", "b elected", "b deposed"]
+
+
+async def test_leads_alone_outside_postgres(monkeypatch):
+    election = LeaderElection(renew_sec=RENEW)
+    monkeypatch.setattr(LeaderElection, "coordinated", property(lambda self: False))
+    elected = []
+    election.start(on_elected=lambda: elected.append(True), on_deposed=lambda h: None)
+
+    await wait_for(lambda: election.is_leader)
+    status = await election.status()
+    await election.stop()
+
+    assert elected == [True]
+    assert status["leader"] == status["process"] == election.identity
@@ -0,0 +1,145 @@
+# tests/workers/test_queue.py
+import asyncio
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select
+
+import workers.queue as queue
+import workers.scheduler as scheduler
+from config.settings import settings
+from db.models import PullJobORM
+from services.ingest import IngestResult
+from utils.time_utils import as_utc, utc_now
+from workers.queue import (
+    PullWorker,
+    enqueue_sources,
+    finish_job,
+    lease_jobs,
+    renew_leases,
+)
+from workers.scheduler import Source, poll_cadence
+
+SOURCES = [
+    Source("twitter", "tenant1", "search"),
+    Source("twitter", "tenant2", "search"),
+    Source("intercom", "tenant1", "pull"),
+]
+
+
+@pytest.fixture(autouse=True)
+def queue_db(monkeypatch, sqlite_session):
+    monkeypatch.setattr(queue, "AsyncSessionLocal", sqlite_session)
+    monkeypatch.setattr(queue, "iter_sources", lambda: list(SOURCES))
+    return sqlite_session
+
+
+async def job_row(session_factory, source):
+    async with session_factory() as session:
+        return await session.get(
+            PullJobORM, (source.tenant_id, source.platform, source.instance)
+        )
+
+
+def all_due(now):
+    # enqueued jobs are first due somewhere within their poll interval
+    return now + timedelta(seconds=settings.POLL_INTERVAL_MAX_SEC)
+
+
+async def test_enqueue_spreads_new_jobs_and_never_queues_twice(queue_db):
+    now = utc_now()
+    assert await enqueue_sources(now) == 3
+    rows = [await job_row(queue_db, s) for s in SOURCES]
+    assert len({r.due_at for r in rows}) == 3
+
+    leased = await lease_jobs("w1", 1, all_due(now))
+    # one job is running, two are still scheduled: nothing to (re)queue
+    assert await enqueue_sources(now) == 0
+    await finish_job("w1", leased[0], now=all_due(now))
+    assert await enqueue_sources(now) == 0
+
+
+async def test_leases_are_exclusive_until_they_expire():
+    now = all_due(utc_now())
+    await enqueue_sources(now - timedelta(seconds=settings.POLL_INTERVAL_MAX_SEC))
+
+    first = await lease_jobs("w1", 10, now)
+    assert {j.source for j in first} == set(SOURCES)
+    assert all(j.attempts == 1 for j in first)
+    assert await lease_jobs("w2", 10, now) == []
+
+    # w1 died: after the visibility timeout the jobs go to w2
+    later = now + timedelta(seconds=settings.PULL_LEASE_SEC + 1)
+    second = await lease_jobs("w2", 10, later)
+    assert {j.source for j in second} == set(SOURCES)
+    assert all(j.attempts == 2 for j in second)
+    assert await renew_leases("w1", later) == set()
+    assert await renew_leases("w2", later) == set(SOURCES)
+
+
+async def test_success_reschedules_at_the_adapted_interval(monkeypatch, queue_db):
+    monkeypatch.setattr(settings, "POLL_JITTER_FRACTION", 0)
+    now = all_due(utc_now())
+    await enqueue_sources(utc_now())
+    (job, *_) = await lease_jobs("w1", 1, now)
+    poll_cadence.set_interval(job.source, 240)
+
+    await finish_job("w1", job, now=now)
+
+    row = await job_row(queue_db, job.source)
+    assert row.interval_sec == 240 and row.attempts == 0
+    assert as_utc(row.due_at) == now + timedelta(seconds=240)
+
+
+async def test_failures_retry_with_backoff_then_wait_for_enqueue(
+    monkeypatch, queue_db
+):
+    monkeypatch.setattr(settings, "PULL_JOB_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr(queue, "iter_sources", lambda: SOURCES[:1])
+    await enqueue_sources(utc_now())
+    now = all_due(utc_now())
+
+    (job,) = await lease_jobs("w1", 10, now)
+    await finish_job("w1", job, "boom", now=now)
+    row = await job_row(queue_db, SOURCES[0])
+    assert row.leased_by is None and row.last_error == "boom"
+    assert await lease_jobs("w1", 10, now) == []
+
+    retry_at = now + timedelta(seconds=settings.PULL_RETRY_BASE_SEC)
+    (job,) = await lease_jobs("w1", 10, retry_at)
+    assert job.attempts == 2
+    await finish_job("w1", job, "boom again", now=retry_at)
+    row = await job_row(queue_db, SOURCES[0])
+    assert row.due_at is None and row.attempts == 0
+
+    assert await enqueue_sources(retry_at) == 1
+
+
+async def test_workers_split_jobs_and_reschedule_them(monkeypatch, queue_db):
+    monkeypatch.setattr(settings, "PULL_WORKER_POLL_SEC", 0.01)
+    monkeypatch.setattr(settings, "POLL_INTERVALS", {"twitter": 0, "intercom": 0})
+    monkeypatch.setattr(settings, "POLL_INTERVAL_MIN_SEC", 0)
+    ran = []
+
+    async def fake_pull(source, now):
+        ran.append(source)
+        await asyncio.sleep(0.02)
+        return IngestResult()
+
+    monkeypatch.setattr(scheduler, "pull_source", fake_pull)
+    await enqueue_sources()
+    # everything ran once, then goes back to sleep for an hour
+    monkeypatch.setattr(settings, "POLL_INTERVAL_MIN_SEC", 3600)
+    monkeypatch.setattr(settings, "POLL_INTERVAL_MAX_SEC", 3600)
+    workers = [PullWorker("w1", 2), PullWorker("w2", 2)]
+    runs = [asyncio.create_task(w.run()) for w in workers]
+    await asyncio.sleep(0.2)
+    for w in workers:
+        w.stop()
+    await asyncio.gather(*runs)
+
+    assert sorted(ran, key=str) == sorted(SOURCES, key=str)
+    async with queue_db() as session:
+        rows = (await session.scalars(select(PullJobORM))).all()
+    assert all(r.leased_by is None and r.interval_sec == 3600 for r in rows)
+    assert all(as_utc(r.due_at) > utc_now() for r in rows)
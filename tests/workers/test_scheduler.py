@@ -0,0 +1,147 @@
+# tests/workers/test_scheduler.py
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+import workers.scheduler as scheduler
+from config.settings import settings
+from services.ingest import IngestResult
+from workers.scheduler import Source, dispatch_all
+
+SOURCES = [
+    Source("twitter", "tenant1", "search"),
+    Source("twitter", "tenant2", "search"),
+    Source("discourse", "tenant1", "https://discourse.example.com"),
+    Source("intercom", "tenant1", "pull"),
+]
+
+
+@pytest.fixture(autouse=True)
+def fixed_sources(monkeypatch):
+    monkeypatch.setattr(scheduler, "iter_sources", lambda: list(SOURCES))
+
+
+def track_concurrency(monkeypatch, delay=0.05, hang=()):
+    """Replace pull_source with a fake that records peak parallelism."""
+    state = {"running": 0, "peak": 0, "per_tenant": {}, "peak_tenant": 0}
+
+    async def fake_pull(source, now):
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        t = state["per_tenant"]
+        t[source.tenant_id] = t.get(source.tenant_id, 0) + 1
+        state["peak_tenant"] = max(state["peak_tenant"], t[source.tenant_id])
+        try:
+            await asyncio.sleep(10 if source in hang else delay)
+        finally:
+            state["running"] -= 1
+            t[source.tenant_id] -= 1
+        return IngestResult()
+
+    monkeypatch.setattr(scheduler, "pull_source", fake_pull)
+    return state
+
+
+@pytest.mark.asyncio
+async def test_sources_run_concurrently(monkeypatch):
+    state = track_concurrency(monkeypatch, delay=0.1)
+
+    report = await dispatch_all()
+
+    assert set(report.results) == set(SOURCES)
+    assert state["peak"] > 1
+    # four 100ms pulls in parallel, not 400ms in series
+    assert report.duration_sec < 0.3
+
+
+@pytest.mark.asyncio
+async def test_limits_bound_parallelism(monkeypatch):
+    monkeypatch.setattr(settings, "DISPATCH_MAX_CONCURRENCY", 2)
+    monkeypatch.setattr(settings, "DISPATCH_TENANT_CONCURRENCY", 1)
+    state = track_concurrency(monkeypatch)
+
+    report = await dispatch_all()
+
+    assert len(report.results) == len(SOURCES)
+    assert state["peak"] <= 2
+    assert state["peak_tenant"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hung_source_times_out_without_blocking_others(monkeypatch):
+    monkeypatch.setattr(settings, "DISPATCH_TASK_TIMEOUT_SEC", 0.1)
+    hung = SOURCES[0]
+    track_concurrency(monkeypatch, hang=(hung,))
+
+    report = await dispatch_all()
+
+    assert report.timed_out == [hung]
+    assert set(report.results) == set(SOURCES) - {hung}
+
+
+@pytest.mark.asyncio
+async def test_failing_source_is_reported(monkeypatch):
+    async def fake_pull(source, now):
+        if source.platform == "intercom":
+            raise RuntimeError("boom")
+        return IngestResult()
+
+    monkeypatch.setattr(scheduler, "pull_source", fake_pull)
+
+    report = await dispatch_all()
+
+    assert list(report.failed) == [Source("intercom", "tenant1", "pull")]
+    assert len(report.results) == len(SOURCES) - 1
+
+
+def test_poll_interval_follows_volume_within_bounds(monkeypatch):
+    monkeypatch.setattr(settings, "POLL_INTERVALS", {"twitter": 60})
+    monkeypatch.setattr(settings, "POLL_INTERVAL_MIN_SEC", 20)
+    monkeypatch.setattr(settings, "POLL_INTERVAL_MAX_SEC", 120)
+    monkeypatch.setattr(settings, "POLL_BACKOFF_FACTOR", 1.5)
+    cadence = scheduler.PollCadence()
+    busy, quiet = SOURCES[0], SOURCES[1]
+
+    assert cadence.observe(busy, full_page=True, new_records=100) == 30
+    assert cadence.observe(busy, full_page=True, new_records=100) == 20
+    assert cadence.observe(busy, full_page=False, new_records=5) == 20
+    assert [cadence.observe(quiet, False, 0) for _ in range(3)] == [90, 120, 120]
+
+
+@pytest.mark.asyncio
+async def test_each_source_gets_its_own_jittered_schedule(monkeypatch):
+    monkeypatch.setattr(scheduler, "maintain_partitions", lambda: None)
+    before = scheduler.utc_now()
+    sched = scheduler.schedule_jobs()
+    try:
+        jobs = {j.id: j for j in sched.get_jobs()}
+        polls = [jobs[f"poll:{s}"] for s in SOURCES]
+        assert "dispatch_all" not in jobs
+        for job in polls:
+            interval = settings.POLL_INTERVALS[job.args[1].platform]
+            assert before <= job.next_run_time <= before + timedelta(seconds=interval)
+            assert job.trigger.jitter == interval * settings.POLL_JITTER_FRACTION
+        assert len({j.next_run_time for j in polls}) == len(polls)
+    finally:
+        sched.shutdown(wait=False)
+
+
+@pytest.mark.asyncio
+async def test_poll_job_reschedules_when_interval_changes(monkeypatch):
+    source = SOURCES[0]
+
+    async def full_page_pull(src, now):
+        scheduler.poll_cadence.observe(src, full_page=True, new_records=50)
+        return IngestResult()
+
+    monkeypatch.setattr(scheduler, "pull_source", full_page_pull)
+    monkeypatch.setattr(scheduler, "maintain_partitions", lambda: None)
+    sched = scheduler.schedule_jobs()
+    try:
+        before = settings.POLL_INTERVALS["twitter"]
+        await scheduler.poll_source_job(sched, source, scheduler._DispatchLimits())
+        job = sched.get_job(f"poll:{source}")
+        assert job.trigger.interval == timedelta(seconds=before / 2)
+    finally:
+        sched.shutdown(wait=False)